@@ -1,47 +1,92 @@
 import streamlit as st
-from core.bingo_engine import BingoEngine
-from core.ai_assistant import AIAssistant 
+from core.artifact_cache import artifact_key, get_default_artifact_cache
+from core.qa_parser import parse_deck
+from core.fonts import available_fonts
+from core.imposition import CARDS_PER_PAGE_OPTIONS, DEFAULT_PAGE_SIZE, PAGE_SIZES
+from core.models import CARD_POOL_SIZE
+from core.jobs import CANCELLED, FAILED, QUEUED, Job, JobRejected, get_default_job_queue
+from core import metrics
 from dotenv import load_dotenv 
 import os 
-import pandas as pd
-from typing import List, Tuple, Any
-# 💡 NEW IMPORTS: เพิ่ม io และ zipfile สำหรับการสร้าง ZIP
-import io
-import zipfile 
+from typing import Dict, List, Tuple, Any
 
-# --- สำคัญมาก: โหลด .env ก่อนรันโค้ดส่วนอื่น ---
-load_dotenv() 
+# 💡 PERF: Streamlit รันสคริปต์นี้ใหม่ทุกครั้งที่ผู้ใช้แตะ Widget จึง import เฉพาะโมดูลเบา ๆ ที่หน้าแรกต้องใช้
+# โมดูลหนัก (reportlab/pypdf/numpy ใน Engine, groq ใน AIAssistant, pandas) import ตอนใช้งานครั้งแรกในฟังก์ชันด้านล่าง
+# และอ็อบเจกต์ที่สร้างแพง (Engine, AIAssistant) เก็บเป็น Resource ระดับ Process ใช้ร่วมกันทุก Session และทุก Rerun
+
+
+# --- สำคัญมาก: โหลด .env ก่อนรันโค้ดส่วนอื่น (อ่านไฟล์ครั้งเดียวต่อ Process) ---
+@st.cache_resource(show_spinner=False)
+def load_environment() -> bool:
+    return load_dotenv()
+
+
+load_environment()
 
 # 💡 CONSTANT: กำหนดจำนวน Q&A ที่ต้องการทั้งหมด (หลัก 25 + สำรอง 10 = 35)
 TOTAL_QA_COUNT = 35
 
+# 💡 CONSTANT: จำนวนการ์ดสูงสุดต่อชุด (ชุดใหญ่เรนเดอร์แบบขนานหลาย Process)
+MAX_CARDS = 2000
+# จำนวนเกมจำลองสำหรับประเมินความยาวเกม (ลดลงอัตโนมัติเมื่อการ์ดเยอะ ให้จำลองเสร็จในไม่ถึงวินาที)
+SIMULATION_GAMES = 20_000
+SIMULATION_CELL_BUDGET = 50_000_000
+# เวลาสูงสุด (วินาที) ที่ใช้ค้นหาลำดับคำถามใน Caller Sheet
+CALL_ORDER_TIME_BUDGET = 1.0
+# ความถี่ (วินาที) ที่หน้าเว็บดึงความคืบหน้าของงานสร้างชุดบิงโกที่รันอยู่เบื้องหลัง
+JOB_POLL_SECONDS = 0.5
+# 💡 Seed เริ่มต้น: ข้อมูลเดิม + Seed เดิม = การ์ดชุดเดิม จึงดึงไฟล์ที่เคยสร้างจากแคชได้ทันที
+DEFAULT_SEED = 1
+
+@st.cache_resource(show_spinner=False)
+def get_engine(font: str) -> Any:
+    """BingoEngine ต่อฟอนต์ ใช้ร่วมกันทั้ง Process (import reportlab และอ่านไฟล์ฟอนต์ครั้งแรกเท่านั้น)"""
+    from core.bingo_engine import BingoEngine
+    return BingoEngine(font)
+
+
+@st.cache_resource(show_spinner=False)
+def get_assistant() -> Any:
+    """AIAssistant ที่ใช้ร่วมกันทั้ง Process (ถ้าไม่มี GROQ_API_KEY จะ Error และไม่ถูกแคช จึงลองใหม่ได้หลังตั้งค่า)"""
+    from core.ai_assistant import AIAssistant
+    return AIAssistant()
+
+
+def grid_table(cells: List[str], grid_size: int) -> Any:
+    """จัดข้อความ 1 การ์ดเป็นตาราง (DataFrame) สำหรับ st.table (import pandas ตอนแสดงตารางครั้งแรก)"""
+    import pandas as pd
+    return pd.DataFrame([cells[i:i + grid_size] for i in range(0, len(cells), grid_size)])
+
+
 # --- Initialize session state ---
 if 'words_area_key' not in st.session_state:
     st.session_state.words_area_key = ""
 
-# 💡 HELPER FUNCTION: สร้าง ZIP File ในหน่วยความจำ (Unchanged)
-def create_zip_of_pdfs(pdf1_bytes: bytes, pdf1_name: str, pdf2_bytes: bytes, pdf2_name: str) -> bytes:
-    """สร้าง ZIP File ในหน่วยความจำที่มี 2 ไฟล์ PDF อยู่ภายใน"""
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        zip_file.writestr(pdf1_name, pdf1_bytes)
-        zip_file.writestr(pdf2_name, pdf2_bytes)
-    zip_buffer.seek(0)
-    return zip_buffer.read()
-
-# 💡 FIX: ฟังก์ชัน Callback สำหรับปุ่ม AI (ปรับการแสดงสถานะ)
-def generate_ai_words_callback(topic):
+# 💡 FIX: ฟังก์ชัน Callback สำหรับปุ่ม AI (บันทึกคำขอไว้ แล้วไปสร้างแบบ Streaming ในรอบรันถัดไป)
+def generate_ai_words_callback(topic, force_refresh=False):
+    """
+    Callback function บันทึกคำขอสร้างคู่คำถาม:คำตอบลง Session State
+    *** การสร้างจริงทำใน stream_ai_words() ก่อนวาด Text Area เพื่อเติมคู่ที่ได้ทีละคู่ ***
+    """
+    st.session_state.ai_pending_request = (topic, force_refresh)
+
+
+# 💡 STREAMING: แสดงคู่คำถาม:คำตอบที่ AI ส่งมาทีละคู่ แล้วเติมลง Text Area เมื่อครบ
+def stream_ai_words(topic, force_refresh=False):
     """
-    Callback function เพื่อสร้างคู่คำถาม:คำตอบ และอัปเดต Session State
-    *** ใช้ st.spinner เพื่อแสดงสถานะแบบมีอนิเมชันระหว่างรัน ***
+    สร้างคู่คำถาม:คำตอบแบบ Streaming และอัปเดต Session State
+    *** ต้องเรียกก่อนสร้าง Text Area (key=words_area_key) ในรอบรันเดียวกัน ***
     """
+    qa_pairs_list = []
+    progress_caption = st.empty()
+    preview = st.empty()
     try:
-        status_message = f"กำลังให้ AI คิดคำถาม-คำตอบ {TOTAL_QA_COUNT} คู่สำหรับหัวข้อ '{topic}'..."
-        
-        # 💡 ใช้ st.spinner แทน st.session_state.ai_status ในระหว่างการทำงาน
-        with st.spinner(status_message):
-            assistant = AIAssistant() 
-            qa_pairs_list = assistant.generate_bingo_qa_pairs(topic, TOTAL_QA_COUNT)
+        progress_caption.caption(f"กำลังให้ AI คิดคำถาม-คำตอบ {TOTAL_QA_COUNT} คู่สำหรับหัวข้อ '{topic}'...")
+        assistant = get_assistant()
+        for pair in assistant.stream_bingo_qa_pairs(topic, TOTAL_QA_COUNT, force_refresh=force_refresh):
+            qa_pairs_list.append(pair)
+            progress_caption.caption(f"ได้แล้ว {len(qa_pairs_list)}/{TOTAL_QA_COUNT} คู่...")
+            preview.code("\n".join(qa_pairs_list), language=None)
         
         if qa_pairs_list:
             st.session_state.words_area_key = "\n".join(qa_pairs_list) 
@@ -55,6 +100,199 @@ def generate_ai_words_callback(topic):
     except Exception as e:
         st.session_state.ai_status = f"เกิดข้อผิดพลาดจาก AI: {e}"
         st.session_state.ai_status_type = "error"
+    finally:
+        progress_caption.empty()
+        preview.empty()
+
+
+# ⏱️ แปลงสถิติ (Span/Counter) ของการสร้าง 1 รอบเป็นตารางสำหรับแสดงใน st.status
+def metrics_dataframe(run_metrics: metrics.Metrics) -> Any:
+    import pandas as pd
+    snapshot = run_metrics.snapshot()
+    rows = [
+        {"ขั้นตอน": name, "ครั้ง": stats["count"], "รวม (ms)": round(stats["total_seconds"] * 1000, 1),
+         "นานสุด (ms)": round(stats["max_seconds"] * 1000, 1)}
+        for name, stats in sorted(snapshot["spans"].items(), key=lambda item: -item[1]["total_seconds"])
+    ]
+    rows += [{"ขั้นตอน": name, "ครั้ง": value} for name, value in sorted(snapshot["counters"].items())]
+    return pd.DataFrame(rows)
+
+
+# 🚀 งานสร้างชุดบิงโก: รันใน Thread ของคิวงานเบื้องหลัง (core.jobs) ห้ามเรียกคำสั่ง st.* ในฟังก์ชันนี้
+def build_bingo_set(job: Job, engine: Any, request: Dict[str, Any]) -> Dict[str, Any]:
+    """สร้างการ์ด ลำดับคำถาม ZIP ในแคช เกมพิธีกร และผลจำลองเกม แล้วคืนผลสำหรับแสดงในรอบ Rerun ถัดไป"""
+    from core.call_order import optimize_call_order
+    from core.export import cached_bingo_set_zip
+    from core.game_session import create_session
+    from core.simulator import CardSet, simulate_games
+
+    qa_deck = request["qa_deck"]
+    num_cards, grid_size, card_seed = request["num_cards"], request["grid_size"], request["seed"]
+    first_winner_window = request["first_winner_window"]
+    messages: List[Tuple[str, str]] = []
+
+    job.report("1/3: กำลังเตรียมข้อมูลการ์ด (ดึงคำตอบ)...")
+    artifact_cache = get_default_artifact_cache()
+    card_batch = engine.generate_card_batch(qa_deck, num_cards, grid_size, seed=card_seed, unique=request["unique"],
+                                            pool_size=request["pool_size"])
+    cards_data = card_batch.cards
+    card_set = CardSet(cards_data, qa_deck, grid_size)
+
+    if request["optimize_call_order"]:
+        # ลำดับที่ค้นหาได้ถูกเก็บในแคชด้วย (การค้นหามีเวลาจำกัด จึงอาจได้ผลต่างกันเล็กน้อยถ้าค้นหาใหม่)
+        # "v2": ลำดับรุ่นก่อนสุ่มคำถามสำรองปนกับคำถามหลัก ห้ามนำกลับมาใช้
+        order_key = artifact_key("call_order", "v2", [(pair.question, pair.answer) for pair in qa_deck], cards_data,
+                                 first_winner_window, card_seed)
+        call_order_result = artifact_cache.get_json(order_key, "call_order.json")
+        if call_order_result is None:
+            job.report("1/3: กำลังค้นหาลำดับคำถามที่ทำให้เกมยาวพอดี...")
+            call_order_result = optimize_call_order(card_set, first_winner_window, seed=card_seed,
+                                                    time_budget=CALL_ORDER_TIME_BUDGET)._asdict()
+            artifact_cache.put_json(order_key, "call_order.json", call_order_result)
+        call_order, main_count = call_order_result["order"], call_order_result["main_count"]
+        first_line_call = call_order_result["first_line_call"]
+        if not first_winner_window[0] <= first_line_call <= first_winner_window[1]:
+            messages.append(("warning", f"⚠️ หาลำดับที่ผู้ชนะคนแรกอยู่ในช่วงข้อ {first_winner_window[0]}-{first_winner_window[1]} ไม่ได้ "
+                                        f"(ดีที่สุดคือข้อ {first_line_call})"))
+        else:
+            messages.append(("write", f"🎯 ผู้ชนะคนแรกจะเกิดที่คำถามข้อ {first_line_call} "
+                                      f"({call_order_result['first_line_winners']} คน) ตามลำดับใน Caller Sheet"))
+    else:
+        # คำถามที่คำตอบอยู่บนการ์ดมาก่อน ตามด้วยคำถามสำรอง (สุ่มลำดับด้วย Seed เดียวกับการ์ด)
+        call_order, main_count = card_batch.call_order, card_batch.main_count
+
+    job.report("2/3: กำลังสร้างไฟล์ PDF ผู้เล่นและชุดดำเนินเกม (Caller Sheet) ลง ZIP...")
+    # เขียน PDF ชุดผู้เล่นและชุดดำเนินเกมลง ZIP ในแคชบนดิสก์ (ถ้าเคยสร้างด้วยข้อมูลเดียวกันแล้ว จะได้ไฟล์เดิมทันที)
+    # แต่ละไฟล์ที่ต้องเรนเดอร์ใหม่รายงานความคืบหน้า (และเป็นจุดที่ยกเลิกงานได้) ผ่าน job.report
+    zip_path = cached_bingo_set_zip(
+        artifact_cache,
+        engine,
+        cards_data,
+        qa_deck,
+        title=request["title"],
+        grid_size=grid_size,
+        bg_color=request["bg_color"],
+        text_color=request["text_color"],
+        free_space_color=request["free_space_color"],
+        call_order=call_order,
+        logo_file=request["logo_bytes"],
+        cards_per_page=request["cards_per_page"],
+        page_size=request["page_size"],
+        main_count=main_count,
+        progress=job.report
+    )
+
+    # 🎤 เตรียมเกมสำหรับโหมดพิธีกร (ลำดับการเรียกเดียวกับ Caller Sheet)
+    game_session = create_session(cards_data, qa_deck, grid_size, call_order)
+
+    # 📊 จำลองเกมจากการ์ดชุดนี้จริง ๆ เพื่อประเมินว่าต้องเรียกกี่ข้อจึงจะมีผู้ชนะคนแรก
+    job.report("3/3: กำลังจำลองเกมเพื่อประเมินความยาวเกม...")
+    num_games = max(1_000, min(SIMULATION_GAMES, SIMULATION_CELL_BUDGET // (num_cards * grid_size * grid_size)))
+    return {
+        "zip_path": zip_path,
+        "zip_file_name": f"{request['title'].replace(' ', '_')}_Bingo_Set.zip",
+        "first_card": cards_data[0],
+        "grid_size": grid_size,
+        "num_cards": num_cards,
+        "messages": messages,
+        "game_session_id": game_session.session_id,
+        "simulation": simulate_games(card_set, num_games).summary(),
+    }
+
+
+# ⏳ แสดงความคืบหน้าของงานที่รออยู่ (Fragment รันซ้ำเองทุก JOB_POLL_SECONDS โดยไม่ต้อง Rerun ทั้งหน้า)
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def show_job_progress(job_id: str) -> None:
+    job = get_default_job_queue().get(job_id)
+    if job is None:
+        return
+    if job.finished:
+        # งานเสร็จ: Rerun ทั้งหน้าเพื่อแสดงผลลัพธ์และโหมดพิธีกร
+        st.rerun()
+
+    queue_position = get_default_job_queue().queue_position(job)
+    if job.state == QUEUED:
+        label = f"⏳ รอคิวสร้างชุดบิงโก (มีงานรออยู่ก่อน {queue_position} งาน)..."
+    else:
+        label = job.last_event.message if job.last_event else "กำลังสร้างชุดบิงโกและไฟล์ ZIP..."
+    with st.status(label, expanded=True, state="running"):
+        for event in job.events:
+            st.write(f"{event.message} ({event.elapsed:.1f} วินาที)")
+    st.button("⏹️ ยกเลิก", on_click=job.cancel, disabled=job.cancel_requested, key="cancel_generate_job")
+
+
+def show_generate_result(job: Job) -> None:
+    """แสดงผลของงานสร้างชุดบิงโกที่จบแล้ว (สำเร็จ/ล้มเหลว/ยกเลิก)"""
+    if job.state == CANCELLED:
+        st.info("ยกเลิกการสร้างชุดบิงโกแล้ว")
+        return
+    if job.state == FAILED:
+        st.error(f"เกิดข้อผิดพลาด: {job.error}")
+        st.warning("คำแนะนำ: อย่าลืมเอาไฟล์ฟอนต์ TH Niramit AS.ttf ไปใส่ในโฟลเดอร์ assets/fonts/ นะครับ")
+        return
+
+    result = job.result
+    # ผูกโหมดพิธีกรกับเกมของงานนี้ครั้งเดียว (รอบถัดไปผู้ใช้อาจเรียกคำถามไปแล้ว)
+    if st.session_state.get("result_job_id") != job.job_id:
+        st.session_state.result_job_id = job.job_id
+        st.session_state.game_session_id = result["game_session_id"]
+
+    with st.status(f"✅ สร้างชุดบิงโกสำเร็จ! จำนวน {result['num_cards']} ใบ พร้อมชุดดำเนินเกม", state="complete"):
+        for kind, message in result["messages"]:
+            if kind == "warning":
+                st.warning(message)
+            else:
+                st.write(message)
+        # ⏱️ เวลาแต่ละขั้นตอนของงานนี้ (ดูว่าขั้นไหนช้าเมื่อเครื่องมีภาระมาก)
+        if show_stage_metrics:
+            st.dataframe(metrics_dataframe(job.metrics), hide_index=True, use_container_width=True)
+
+    # 5. ปุ่มดาวน์โหลด ZIP File ปุ่มเดียว (ดีไซน์สะอาดตา)
+    if os.path.exists(result["zip_path"]):
+        with open(result["zip_path"], "rb") as zip_file:
+            st.download_button(
+                label=f"ดาวน์โหลดชุดบิงโกทั้งหมด (.ZIP)",
+                data=zip_file,
+                file_name=result["zip_file_name"],
+                mime="application/zip",
+                key='dl_bingo_set_zip',
+                type="secondary",
+                use_container_width=True
+            )
+    else:
+        st.warning("ไฟล์ ZIP ถูกลบออกจากแคชแล้ว กรุณากดสร้างใหม่อีกครั้ง")
+
+    # แสดงตัวอย่าง
+    with st.expander("👀 ดูตัวอย่างคำตอบในการ์ดใบที่ 1 (Answers Only)"):
+        st.table(grid_table(result["first_card"], result["grid_size"]))
+
+    with st.expander("📊 ประเมินความยาวเกม (จำลองเกมแบบสุ่ม)"):
+        summary = result["simulation"]
+        if summary["finished"]:
+            st.write(
+                f"จาก {summary['games']:,} เกมจำลอง: ผู้ชนะคนแรกมักเกิดหลังเรียก **{summary['median_first_line']:.0f}** ข้อ "
+                f"(80% ของเกมอยู่ระหว่าง {summary['p10_first_line']:.0f}-{summary['p90_first_line']:.0f} ข้อ) "
+                f"และมีผู้ชนะพร้อมกันหลายคน {summary['multi_winner_rate']:.0%} ของเกม"
+            )
+        else:
+            st.write("การ์ดชุดนี้ไม่มีผู้ชนะในเกมจำลอง (ตรวจสอบจำนวนคำตอบ)")
+
+
+# 🖼️ ภาพตัวอย่างการ์ดจากการตั้งค่าปัจจุบัน (วาดภาพ PNG ไม่กี่ใบ ไม่ต้องเรนเดอร์ PDF ทั้งชุด)
+def show_card_preview() -> None:
+    from core.preview import PREVIEW_CARDS, cards_preview_png
+
+    qa_deck = parse_deck(st.session_state.get("words_area_key", ""))
+    if len(qa_deck) < grid_size * grid_size:
+        st.info(f"ป้อนคู่คำถาม-คำตอบอย่างน้อย {grid_size * grid_size} คู่เพื่อดูภาพตัวอย่าง")
+        return
+    engine = get_engine(font_choice)
+    # Seed และตัวเลือกเดียวกับปุ่ม Generate (สุ่มเฉพาะไม่กี่ใบแรก ใช้เวลาไม่กี่มิลลิวินาที)
+    preview_cards = engine.generate_cards_data(qa_deck, min(num_cards, PREVIEW_CARDS), grid_size, seed=card_seed,
+                                               unique=unique_cards, pool_size=None if use_full_pool else CARD_POOL_SIZE)
+    images = cards_preview_png(engine, preview_cards, bingo_title, grid_size, bg_color, text_color, free_space_color,
+                               logo_bytes=uploaded_file.getvalue() if uploaded_file is not None else None)
+    st.image(images, caption=[f"ตัวอย่างการ์ดใบที่ {number}" for number in range(1, len(images) + 1)], width=420)
 
 
 # --- ตั้งค่าหน้าเว็บ ---
@@ -67,10 +305,31 @@ with st.sidebar:
     # Grid Settings
     grid_size = st.selectbox("ขนาดตาราง (Grid Size)", [3, 4, 5], index=2)
     min_words_required_for_card_data = grid_size * grid_size
-    num_cards = st.number_input("จำนวนใบที่ต้องการ (Cards)", min_value=1, max_value=50, value=5)
+    num_cards = st.number_input("จำนวนใบที่ต้องการ (Cards)", min_value=1, max_value=MAX_CARDS, value=5)
+    card_seed = st.number_input("Seed (เลขสุ่ม)", min_value=0, max_value=2**31 - 1, value=DEFAULT_SEED,
+                                help="ใช้ Seed เดิมกับข้อมูลเดิมจะได้การ์ดและ Caller Sheet ชุดเดิมทุกครั้ง (เปลี่ยนเลขเพื่อสุ่มชุดใหม่)")
+    unique_cards = st.checkbox("ไม่ให้มีการ์ดซ้ำกัน (Unique Cards)", value=True,
+                               help="ป้องกันการ์ด 2 ใบที่เหมือนกันทุกช่อง ซึ่งทำให้มีผู้ชนะพร้อมกัน")
+    use_full_pool = st.checkbox("สุ่มการ์ดจากคำตอบทั้งหมด (คลังคำใหญ่)", value=False,
+                                help=f"ปกติการ์ดใช้เฉพาะ {CARD_POOL_SIZE} คู่แรก (ที่เหลือเป็นคำถามสำรอง) "
+                                     "เปิดเพื่อสุ่มการ์ดจากทุกคู่ โดยแต่ละคำตอบอยู่บนการ์ดจำนวนใบใกล้เคียงกัน")
+    optimize_call_order_enabled = st.checkbox("จัดลำดับคำถามใน Caller Sheet ให้เกมยาวพอดี", value=True)
+    first_winner_window = st.slider(
+        "ให้มีผู้ชนะคนแรกในช่วงคำถามข้อที่", min_value=1, max_value=TOTAL_QA_COUNT, value=(12, 20),
+        disabled=not optimize_call_order_enabled,
+        help="ระบบจะค้นหาลำดับการเรียกที่ผู้ชนะคนแรกเกิดในช่วงนี้ และผู้ชนะแต่ละคนไม่ชนะพร้อมกัน"
+    )
+    
+    # 🖨️ พิมพ์หลายใบต่อแผ่น: ชุดใหญ่ใช้กระดาษและเวลาพิมพ์น้อยลงมาก (มีเส้นตัดให้)
+    cards_per_page = st.selectbox("จำนวนการ์ดต่อหน้า", CARDS_PER_PAGE_OPTIONS, index=0)
+    page_size = st.selectbox("ขนาดกระดาษ", list(PAGE_SIZES), index=list(PAGE_SIZES).index(DEFAULT_PAGE_SIZE))
+    
+    show_stage_metrics = st.checkbox("แสดงเวลาแต่ละขั้นตอน (สำหรับตรวจสอบประสิทธิภาพ)", value=False)
     
     st.markdown("---")
     st.header("🎨 การปรับแต่งสี")
+    # PDF ฝังเฉพาะตัวอักษรที่ใช้จริงของฟอนต์ที่เลือก (Subset) ไฟล์จึงเล็กไม่ว่าจะเลือกฟอนต์ไหน
+    font_choice = st.selectbox("ฟอนต์ (Font)", available_fonts() or ["Helvetica"])
     bg_color = st.color_picker("สีพื้นหลังการ์ด", "#FFFFFF")
     text_color = st.color_picker("สีตัวอักษร", "#000000")
     free_space_color = st.color_picker("สีช่อง FREE (ถ้ามี)", "#F0F8FF")
@@ -99,6 +358,10 @@ col_input, col_ai = st.columns([0.65, 0.35])
 
 with col_input:
     st.subheader("1. รายการคำถาม-คำตอบ (Q:A)")
+    # 💡 มีคำขอ AI ค้างอยู่: สร้างแบบ Streaming ก่อนวาด Text Area
+    if st.session_state.get('ai_pending_request'):
+        pending_topic, pending_force_refresh = st.session_state.pop('ai_pending_request')
+        stream_ai_words(pending_topic, pending_force_refresh)
     st.text_area(
         "ป้อน Q:A ที่นี่ (คั่นด้วย : เช่น 'คำถาม:คำตอบ' และขึ้นบรรทัดใหม่)",
         height=300,
@@ -111,11 +374,13 @@ with col_input:
 with col_ai:
     st.subheader("2. สร้างด้วย AI (แนะนำ)")
     ai_topic = st.text_input("หัวข้อสำหรับ AI (เช่น ภูมิศาสตร์, ภาษาไทย ม.3)", value="ภูมิศาสตร์โลก")
+    # 💡 หัวข้อที่เคยสร้างแล้วจะดึงจากแคชทันที ติ๊กช่องนี้เพื่อให้ AI สร้างชุดใหม่
+    ai_force_refresh = st.checkbox("สร้างใหม่ (ไม่ใช้ผลลัพธ์เดิมจากแคช)", value=False)
     
     st.button(
         f"✨ ให้ AI สร้าง Q&A ({TOTAL_QA_COUNT} คู่)",
         on_click=generate_ai_words_callback, 
-        args=(ai_topic,),
+        args=(ai_topic, ai_force_refresh),
         disabled=(not os.environ.get("GROQ_API_KEY")),
         use_container_width=True
     )
@@ -131,72 +396,80 @@ with col_ai:
             st.info(st.session_state.ai_status)
 
 
+# --- 🖼️ ภาพตัวอย่าง: ปรับสี/ฟอนต์/โลโก้แล้วเห็นผลทันที (ภาพแคชตามการตั้งค่า) ---
+st.markdown("---")
+if st.toggle("🖼️ แสดงภาพตัวอย่างการ์ด (อัปเดตทันทีเมื่อปรับการตั้งค่า)", value=False):
+    show_card_preview()
+
 # --- ปุ่มสร้าง ---
 st.markdown("---")
 if st.button("🚀 สร้างชุดบิงโกทั้งหมด (Generate)", type="primary", use_container_width=True):
     
     words_input = st.session_state.get("words_area_key", "") 
-    # กรอง Q:A ที่ถูกต้อง
-    qa_pairs_list = [pair.strip() for pair in words_input.split('\n') if pair.strip() and ':' in pair]
+    # กรอง Q:A ที่ถูกต้อง (แยกเป็น Deck ของ QAPair ครั้งเดียว แล้วส่งต่อให้ Engine/PDF/Caller Sheet)
+    qa_deck = parse_deck(words_input)
     
-    if len(qa_pairs_list) < min_words_required_for_card_data:
-        st.error(f"❌ คู่คำถาม-คำตอบไม่พอครับ! ต้องการอย่างน้อย {min_words_required_for_card_data} คู่ (ตอนนี้มี {len(qa_pairs_list)} คู่) และต้องมีเครื่องหมาย ':'")
+    if len(qa_deck) < min_words_required_for_card_data:
+        st.error(f"❌ คู่คำถาม-คำตอบไม่พอครับ! ต้องการอย่างน้อย {min_words_required_for_card_data} คู่ (ตอนนี้มี {len(qa_deck)} คู่) และต้องมีเครื่องหมาย ':'")
     else:
+        # 💡 ค่าทั้งหมดอ่านจาก Widget ตอนนี้ (งานรันใน Thread อื่น อ่าน Widget/Session State เองไม่ได้)
+        generate_request = dict(
+            qa_deck=qa_deck, num_cards=num_cards, grid_size=grid_size, seed=card_seed,
+            unique=unique_cards, pool_size=None if use_full_pool else CARD_POOL_SIZE,
+            optimize_call_order=optimize_call_order_enabled, first_winner_window=first_winner_window,
+            title=bingo_title, bg_color=bg_color, text_color=text_color, free_space_color=free_space_color,
+            logo_bytes=uploaded_file.getvalue() if uploaded_file is not None else None,
+            cards_per_page=cards_per_page, page_size=page_size,
+        )
+        job_queue = get_default_job_queue()
+        # กด Generate ซ้ำระหว่างรอ: ยกเลิกงานเดิมของผู้ใช้คนนี้ก่อน
+        job_queue.cancel(st.session_state.get("generate_job_id"))
         try:
-            # 💡 NEW DEBUG/ANIMATION: ใช้ st.status เพื่อแสดงสถานะแบบรวม
-            with st.status("กำลังสร้างชุดบิงโกและไฟล์ ZIP...", expanded=True) as status:
-                
-                status.update(label="1/3: กำลังเตรียมข้อมูลการ์ด (ดึงคำตอบ)...", state="running")
-                engine = BingoEngine() 
-                cards_data = engine.generate_cards_data(qa_pairs_list, num_cards, grid_size)
-                
-                status.update(label="2/3: กำลังสร้างไฟล์ PDF สำหรับผู้เล่น...", state="running")
-                # 2. สร้าง PDF ชุดผู้เล่น (Player Cards)
-                pdf_cards_bytes = engine.create_pdf_bytes(
-                    cards_data, 
-                    title=bingo_title, 
-                    grid_size=grid_size,
-                    bg_color=bg_color, 
-                    text_color=text_color,
-                    free_space_color=free_space_color,
-                    logo_file=uploaded_file
-                )
-                
-                status.update(label="2/3: กำลังสร้างไฟล์ PDF สำหรับชุดดำเนินเกม (Caller Sheet)...", state="running")
-                # 3. สร้าง PDF ชุดดำเนินเกม (Caller Sheet)
-                pdf_caller_bytes = engine.create_caller_sheet_pdf_bytes(qa_pairs_list, bingo_title)
-
-                status.update(label="3/3: กำลังรวมไฟล์เป็น ZIP...", state="running")
-                # 4. สร้าง ZIP File รวม 2 ไฟล์
-                zip_file_name = f"{bingo_title.replace(' ', '_')}_Bingo_Set.zip"
-                player_pdf_name = f"Player_Cards_{num_cards}p.pdf"
-                caller_pdf_name = "Caller_Sheet_QnA.pdf"
-
-                # 💡 Note: ถ้าไม่พบไฟล์ zipfile.writestr ต้องใช้ .writestr(filename, data)
-                zip_bytes = create_zip_of_pdfs(
-                    pdf_cards_bytes, player_pdf_name, 
-                    pdf_caller_bytes, caller_pdf_name
-                )
-                
-                # 💡 FINAL STATUS: แสดงสถานะสุดท้ายที่สำเร็จ
-                status.update(label=f"✅ สร้างชุดบิงโกสำเร็จ! จำนวน {num_cards} ใบ พร้อมชุดดำเนินเกม", state="complete")
-
-            # 5. ปุ่มดาวน์โหลด ZIP File ปุ่มเดียว (ดีไซน์สะอาดตา)
-            st.download_button(
-                label=f"ดาวน์โหลดชุดบิงโกทั้งหมด (.ZIP)",
-                data=zip_bytes,
-                file_name=zip_file_name,
-                mime="application/zip",
-                key='dl_bingo_set_zip',
-                type="secondary",
-                use_container_width=True
-            )
-            
-            # แสดงตัวอย่าง
-            with st.expander("👀 ดูตัวอย่างคำตอบในการ์ดใบที่ 1 (Answers Only)"):
-                df = pd.DataFrame([cards_data[0][i:i + grid_size] for i in range(0, len(cards_data[0]), grid_size)])
-                st.table(df)
-                
-        except Exception as e:
-            st.error(f"เกิดข้อผิดพลาด: {e}")
-            st.warning("คำแนะนำ: อย่าลืมเอาไฟล์ฟอนต์ TH Niramit AS.ttf ไปใส่ในโฟลเดอร์ assets/fonts/ นะครับ")
\ No newline at end of file
+            st.session_state.generate_job_id = job_queue.submit("generate", build_bingo_set, get_engine(font_choice),
+                                                                generate_request).job_id
+        except JobRejected as e:
+            st.warning(f"⏳ ระบบกำลังสร้างชุดบิงโกให้ผู้ใช้คนอื่นเต็มคิวแล้ว กรุณาลองใหม่อีกครั้งในอีกสักครู่ ({e})")
+
+# 💡 ผลของงานผูกกับ job_id ใน Session State จึงยังแสดงอยู่ทุกรอบ Rerun (เช่น ตอนกดโหมดพิธีกร)
+generate_job = get_default_job_queue().get(st.session_state.get("generate_job_id"))
+if generate_job is not None and not generate_job.finished:
+    show_job_progress(generate_job.job_id)
+elif generate_job is not None:
+    show_generate_result(generate_job)
+
+
+# --- 🎤 โหมดพิธีกร: เรียกคำถามทีละข้อ และตรวจผู้ชนะอัตโนมัติจากการ์ดที่แจกจริง ---
+game_session = None
+if st.session_state.get("game_session_id"):
+    from core.game_session import get_session
+    game_session = get_session(st.session_state.game_session_id)
+if game_session is not None:
+    st.markdown("---")
+    st.subheader("🎤 โหมดพิธีกร (Host Mode)")
+    col_call, col_winners = st.columns([0.5, 0.5])
+
+    with col_call:
+        st.button(
+            "📣 เรียกคำถามข้อถัดไป",
+            on_click=game_session.call_next,
+            disabled=game_session.next_pair_index is None,
+            use_container_width=True
+        )
+        st.caption(f"เรียกแล้ว {len(game_session.called)}/{len(game_session.deck)} ข้อ | การ์ดในเกม {game_session.num_cards} ใบ")
+        if game_session.called:
+            last_pair = game_session.deck[game_session.called[-1]]
+            st.info(f"**ข้อที่ {len(game_session.called)}:** {last_pair.question}\n\n**คำตอบ:** {last_pair.answer}")
+
+    with col_winners:
+        if game_session.line_winners:
+            for result in game_session.line_winners:
+                card_numbers = ", ".join(str(card_index + 1) for card_index in result.line_winners)
+                st.success(f"🎉 บิงโก! ข้อที่ {result.call_number}: การ์ดใบที่ {card_numbers}")
+        else:
+            st.write("ยังไม่มีผู้ชนะ")
+
+        check_card_number = st.number_input("ตรวจการ์ดใบที่", min_value=1, max_value=game_session.num_cards, value=1)
+        marks = game_session.card_marks(check_card_number - 1)
+        check_card = game_session.cards_data[check_card_number - 1]
+        cells = [f"✅ {text}" if marked else text for text, marked in zip(check_card, marks)]
+        st.table(grid_table(cells, game_session.grid_size))
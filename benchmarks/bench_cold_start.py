@@ -0,0 +1,112 @@
+"""
+Benchmark เวลาเปิดแอปครั้งแรก (Cold Start) และเวลารันสคริปต์ซ้ำ (Rerun) ของ app_web.py
+ทุกรอบวัดใน Process ใหม่ (เหมือน Container ที่เพิ่งถูกปลุกจาก Scale-to-zero) ด้วย Streamlit AppTest
+
+วิธีรัน (จากโฟลเดอร์หลักของโปรเจกต์):
+    python -m benchmarks.bench_cold_start              # วัด 3 Process แล้วรายงานค่าที่ดีที่สุด
+    python -m benchmarks.bench_cold_start --runs 5 --json
+ไม่ต้องใช้ GROQ_API_KEY หรืออินเทอร์เน็ต (ไม่กดปุ่ม AI)
+first_generate_ms นับตั้งแต่กดปุ่ม Generate จนงานเบื้องหลังเสร็จและหน้าเว็บแสดงปุ่มดาวน์โหลด
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app_web.py")
+
+# โมดูลหนักที่หน้าแรกของแอปไม่ควรต้อง import
+HEAVY_MODULES = ["pandas", "groq", "reportlab.pdfgen", "pypdf", "numpy"]
+
+# จำนวน Rerun ต่อ Process (ใช้ค่ามัธยฐาน)
+RERUNS = 5
+
+# สคริปต์ที่รันใน Process ลูก: พิมพ์ผลเป็น JSON บรรทัดสุดท้าย
+_CHILD_SCRIPT = """
+import contextlib, io, json, statistics, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+import_ms = (time.perf_counter() - started) * 1000
+streamlit_modules = set(sys.modules)
+
+def timed(func):
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    return (time.perf_counter() - started) * 1000
+
+at = AppTest.from_file({app_path!r}, default_timeout=300)
+first_run_ms = timed(at.run)
+loaded = [name for name in {heavy!r} if name in sys.modules and name not in streamlit_modules]
+rerun_ms = statistics.median(timed(at.run) for _ in range({reruns}))
+
+at.text_area[0].input("\\n".join(f"คำถาม{{i}}:คำตอบ{{i}}" for i in range(35)))
+generate = next(button for button in at.button if "Generate" in button.label)
+
+def generate_and_wait():
+    # งานสร้างรันในคิวเบื้องหลัง: Rerun จนปุ่มดาวน์โหลดปรากฏ (งานเสร็จ)
+    generate.click().run()
+    while not len(at.get("download_button")) and not len(at.exception):
+        time.sleep(0.02)
+        at.run()
+
+first_generate_ms = timed(generate_and_wait)
+rerun_after_generate_ms = statistics.median(timed(at.run) for _ in range({reruns}))
+print(json.dumps({{
+    "import_streamlit_ms": import_ms,
+    "first_run_ms": first_run_ms,
+    "rerun_ms": rerun_ms,
+    "first_generate_ms": first_generate_ms,
+    "rerun_after_generate_ms": rerun_after_generate_ms,
+    "heavy_modules_on_first_run": loaded,
+    "exceptions": len(at.exception),
+}}))
+"""
+
+
+def measure_once(app_path: str = APP_PATH, reruns: int = RERUNS) -> Dict[str, object]:
+    """วัด 1 รอบใน Process ใหม่ (แคชไฟล์ PDF/ZIP ชี้ไปโฟลเดอร์ชั่วคราว จึงไม่มีผลจากรอบก่อน)"""
+    script = _CHILD_SCRIPT.format(app_path=app_path, heavy=HEAVY_MODULES, reruns=reruns)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, BINGO_ARTIFACT_CACHE_DIR=cache_dir, BINGO_QA_CACHE_PATH=os.path.join(cache_dir, "qa.sqlite3"))
+        env.pop("GROQ_API_KEY", None)
+        output = subprocess.run([sys.executable, "-c", script], cwd=os.path.dirname(app_path), env=env,
+                                capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def best_of(results: List[Dict[str, object]]) -> Dict[str, object]:
+    """ค่าเวลาที่ดีที่สุดของแต่ละตัวชี้วัด (ลด Noise จากเครื่อง) ส่วนรายชื่อโมดูลใช้จากรอบแรก"""
+    best = dict(results[0])
+    for key, value in results[0].items():
+        if isinstance(value, float):
+            best[key] = min(result[key] for result in results)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="วัดเวลา Cold Start และ Rerun ของ app_web.py")
+    parser.add_argument("--runs", type=int, default=3, help="จำนวน Process ที่วัด (รายงานค่าที่ดีที่สุด)")
+    parser.add_argument("--json", action="store_true", help="พิมพ์ผลเป็น JSON")
+    args = parser.parse_args(argv)
+
+    result = best_of([measure_once() for _ in range(args.runs)])
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"{'ขั้นตอน':<28} {'เวลา (ms)':>10}")
+    for key in ["import_streamlit_ms", "first_run_ms", "rerun_ms", "first_generate_ms", "rerun_after_generate_ms"]:
+        print(f"{key:<28} {result[key]:>10.1f}")
+    print(f"โมดูลหนักที่ถูก import ตอนเปิดหน้าแรก: {', '.join(result['heavy_modules_on_first_run']) or '-'}")
+    if result["exceptions"]:
+        print(f"⚠️ แอปแสดง Exception {result['exceptions']} รายการระหว่างวัด")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
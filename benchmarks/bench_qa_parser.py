@@ -0,0 +1,89 @@
+"""
+Micro-benchmark: Parser คำตอบจาก AI แบบเดิม (replace/re.sub หลายรอบ) เทียบกับ core.qa_parser (สแกนรอบเดียว)
+
+วิธีรัน (จากโฟลเดอร์หลักของโปรเจกต์):
+    python -m benchmarks.bench_qa_parser
+"""
+import re
+import random
+import timeit
+from typing import List
+
+from core.qa_parser import parse_ai_response
+
+# ขนาดข้อความจำลอง (จำนวนคู่ต่อคำตอบ) ที่ใช้วัด
+PAIR_COUNTS = [35, 1_000, 20_000]
+
+_THAI_WORDS = ["ประเทศ", "เมืองหลวง", "แม่น้ำ", "ภูเขา", "ทวีป", "มหาสมุทร", "ประชากร", "ภาษา", "สกุลเงิน", "ธงชาติ"]
+
+
+def make_synthetic_response(num_pairs: int, seed: int = 0) -> str:
+    """สร้างข้อความจำลองคล้ายคำตอบจริงของ LLM (มีเลขลำดับ, Emoji, ขึ้นบรรทัดใหม่ปนคอมม่า, ช่องว่างแปลก ๆ)"""
+    rng = random.Random(seed)
+    parts = []
+    for i in range(num_pairs):
+        question = " ".join(rng.choice(_THAI_WORDS) for _ in range(rng.randint(3, 8)))
+        answer = " ".join(rng.choice(_THAI_WORDS) for _ in range(rng.randint(1, 4)))
+        decoration = rng.choice(["", "✨ ", "**", " "])
+        parts.append(f"{i + 1}. {decoration}{question}? : {answer}{decoration}")
+        parts.append(rng.choice([", ", "\n", " ,", ",,"]))
+    return "".join(parts)
+
+
+def legacy_clean_response(raw_response: str, count: int) -> List[str]:
+    """สำเนาขั้นตอนทำความสะอาดเดิมจาก AIAssistant (ก่อนใช้ core.qa_parser) ไว้เป็นค่าอ้างอิง"""
+    current_qa_pairs = []
+    cleaned_response = raw_response.strip()
+    cleaned_response = cleaned_response.replace('\n', ',')
+    cleaned_response = re.sub(r'\s*\d+\.\s*', '', cleaned_response)
+    cleaned_response = re.sub(r'[^ก-๙a-zA-Z0-9\s:?,.\'"-]', '', cleaned_response)
+    cleaned_response = re.sub(r'[\s\t\r\xa0\ufeff\u2000-\u200A\u202F\u205F\u3000]+', ' ', cleaned_response).strip()
+    cleaned_response = cleaned_response.replace(' ,', ',').replace(', ', ',')
+    cleaned_response = re.sub(r',+', ',', cleaned_response)
+    qa_pairs = [pair.strip() for pair in cleaned_response.split(',') if pair.strip()]
+    for pair in qa_pairs:
+        pair_cleaned = pair.replace(' : ', ':').replace(':', ':', 1)
+        if ':' in pair_cleaned:
+            q, _, a = pair_cleaned.partition(':')
+            if q.strip() and a.strip():
+                current_qa_pairs.append(pair_cleaned.strip())
+    return current_qa_pairs[:count]
+
+
+def single_pass_clean_response(raw_response: str, count: int) -> List[str]:
+    """เส้นทางปัจจุบันของ AIAssistant._clean_response"""
+    return [str(record) for record in parse_ai_response(raw_response, limit=count)]
+
+
+def _best_of(func, *args, repeat: int = 5) -> float:
+    """เวลาที่ดีที่สุด (วินาที/ครั้ง) จากการรันซ้ำ"""
+    number = max(1, 2000 // max(1, len(args[0]) // 1000))
+    return min(timeit.repeat(lambda: func(*args), number=number, repeat=repeat)) / number
+
+
+def run() -> List[dict]:
+    results = []
+    for num_pairs in PAIR_COUNTS:
+        response = make_synthetic_response(num_pairs)
+        legacy = legacy_clean_response(response, num_pairs)
+        current = single_pass_clean_response(response, num_pairs)
+
+        legacy_seconds = _best_of(legacy_clean_response, response, num_pairs)
+        current_seconds = _best_of(single_pass_clean_response, response, num_pairs)
+        results.append({
+            "pairs": num_pairs,
+            "chars": len(response),
+            "legacy_ms": legacy_seconds * 1000,
+            "single_pass_ms": current_seconds * 1000,
+            "speedup": legacy_seconds / current_seconds if current_seconds else float("inf"),
+            "legacy_pairs": len(legacy),
+            "single_pass_pairs": len(current),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    print(f"{'pairs':>8} {'chars':>10} {'legacy ms':>11} {'1-pass ms':>11} {'speedup':>8} {'parsed (old/new)':>17}")
+    for row in run():
+        print(f"{row['pairs']:>8} {row['chars']:>10} {row['legacy_ms']:>11.3f} {row['single_pass_ms']:>11.3f} "
+              f"{row['speedup']:>7.2f}x {row['legacy_pairs']:>8}/{row['single_pass_pairs']}")
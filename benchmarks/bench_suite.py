@@ -0,0 +1,291 @@
+"""
+ชุด Benchmark ของเส้นทางหลัก (สุ่มการ์ด, PDF ผู้เล่น, Caller Sheet, ZIP และการทำความสะอาดคำตอบจาก AI)
+วัดเวลา (ดีที่สุดจากการรันซ้ำ) และหน่วยความจำสูงสุด (tracemalloc) แล้วเทียบกับ Baseline ที่บันทึกไว้
+
+วิธีรัน (จากโฟลเดอร์หลักของโปรเจกต์):
+    python -m benchmarks.bench_suite                  # เทียบกับ benchmarks/baseline.json (ช้ากว่าเกินเกณฑ์ = exit code 1)
+    python -m benchmarks.bench_suite --quick          # ข้ามเคสใหญ่ (PDF 5,000 ใบ)
+    python -m benchmarks.bench_suite --save-baseline  # บันทึกผลรอบนี้เป็น Baseline ใหม่
+ไม่ต้องใช้ GROQ_API_KEY หรืออินเทอร์เน็ต (ใช้ Groq Client จำลอง)
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.bench_qa_parser import make_synthetic_response
+from core.ai_assistant import AIAssistant
+from core.bingo_engine import BingoEngine
+from core.export import write_bingo_set_zip
+from core.models import Deck
+from core.preview import PREVIEW_CARDS, cards_preview_png, clear_preview_cache
+from core.qa_cache import QACache
+from core.rate_limit import RateLimiter
+from core.text_layout import clear_layout_caches, fit_text
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# 💡 เกณฑ์ถือว่าช้าลง/ใช้หน่วยความจำเพิ่มขึ้นผิดปกติ (เท่าของ Baseline) และส่วนต่างขั้นต่ำที่ไม่นับเป็น Noise
+DEFAULT_TIME_TOLERANCE = 1.5
+DEFAULT_MEMORY_TOLERANCE = 1.5
+MIN_TIME_DELTA_MS = 2.0
+MIN_MEMORY_DELTA_KB = 256.0
+# เคสที่รอบ Warm-up นานกว่านี้ (วินาที) จับเวลารอบเดียว
+SLOW_CASE_SECONDS = 1.0
+
+DECK_SIZES = [1, 50, 500, 5_000]
+GRID_SIZES = [3, 4, 5]
+LLM_RESPONSE_PAIRS = [35, 1_000, 20_000]
+BATCH_TOPICS = 40
+QUICK_SKIP = {"pdf/5000x5", "zip/5000x5"}
+
+# คำตอบภาษาไทยยาว ๆ ที่ต้องตัดบรรทัดในช่องการ์ด (มีทั้งแบบเว้นวรรคและแบบติดกันทั้งวลี)
+_LONG_THAI_ANSWERS = [
+    "การสังเคราะห์ด้วยแสงของพืชใบเขียว",
+    "สาธารณรัฐประชาธิปไตยประชาชนลาว",
+    "แม่น้ำเจ้าพระยา ไหลผ่าน กรุงเทพมหานคร",
+    "ระบบสุริยะ มีดาวเคราะห์ แปดดวง",
+    "พระบาทสมเด็จพระจุลจอมเกล้าเจ้าอยู่หัว",
+    "คลื่นแม่เหล็กไฟฟ้า",
+    "ทวีปแอนตาร์กติกา",
+    "ปฏิกิริยาเคมี แบบดูดความร้อน",
+]
+
+
+class _StubCompletions:
+    """จำลอง client.chat.completions ของ Groq: คืนข้อความที่กำหนดไว้ทันที (ไม่เรียกเครือข่าย)"""
+
+    def __init__(self, response_text: str):
+        self._response = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=response_text))])
+
+    def create(self, **kwargs):
+        return self._response
+
+
+class StubGroqClient:
+    def __init__(self, response_text: str):
+        self.chat = SimpleNamespace(completions=_StubCompletions(response_text))
+
+
+class _AsyncStubCompletions(_StubCompletions):
+    async def create(self, **kwargs):
+        return self._response
+
+
+class AsyncStubGroqClient:
+    """จำลอง AsyncGroq สำหรับ AIAssistant.agenerate_batch"""
+
+    def __init__(self, response_text: str):
+        self.chat = SimpleNamespace(completions=_AsyncStubCompletions(response_text))
+
+    async def close(self):
+        pass
+
+
+def make_long_thai_deck(num_pairs: int = 35) -> Deck:
+    """Deck ที่คำตอบยาวพอจะบังคับให้ตัดบรรทัด/ลดขนาดฟอนต์ในช่องการ์ด"""
+    return Deck(
+        (f"คำถามข้อที่ {i + 1} เกี่ยวกับ {_LONG_THAI_ANSWERS[i % len(_LONG_THAI_ANSWERS)]} คืออะไร",
+         f"{_LONG_THAI_ANSWERS[i % len(_LONG_THAI_ANSWERS)]} {i + 1}")
+        for i in range(num_pairs)
+    )
+
+
+def build_cases(quick: bool = False) -> List[Tuple[str, Callable[[], object]]]:
+    """รายการเคส (ชื่อ, ฟังก์ชันที่วัด) ข้อมูลตั้งต้นเตรียมไว้ล่วงหน้าจึงไม่ถูกนับเวลา"""
+    engine = BingoEngine()
+    deck = make_long_thai_deck()
+    style = dict(title="Benchmark บิงโก", bg_color="#FFFFFF", text_color="#000000", free_space_color="#F0F8FF")
+    cases = []
+
+    for num_cards in DECK_SIZES:
+        for grid_size in GRID_SIZES:
+            cases.append((f"cards/{num_cards}x{grid_size}",
+                          lambda n=num_cards, g=grid_size: engine.generate_cards_data(deck, n, g, seed=0, unique=True)))
+
+    # คลังคำใหญ่: สุ่มการ์ดจากทุกคู่ (กระจายคำตอบเท่า ๆ กัน) พร้อมลำดับการเรียกที่เข้ากับการ์ด
+    pool_deck = Deck((f"คำถาม {i}", f"คำตอบ {i}") for i in range(10_000))
+    cases.append(("cards/pool10000x5000", lambda: engine.generate_card_batch(pool_deck, 5_000, 5, seed=0, unique=True, pool_size=None)))
+
+    for num_cards in DECK_SIZES:
+        for grid_size in GRID_SIZES if num_cards == 50 else [5]:
+            cards = engine.generate_cards_data(deck, num_cards, grid_size, seed=0)
+            cases.append((f"pdf/{num_cards}x{grid_size}",
+                          lambda c=cards, g=grid_size: engine.create_pdf_bytes(c, grid_size=g, **style)))
+
+    # Layout แบบไม่มีแคช: ตัดบรรทัด + เลือกขนาดฟอนต์ของคำตอบ 500 ข้อที่ไม่ซ้ำกัน
+    layout_texts = [pair.answer for pair in make_long_thai_deck(500)]
+    cases.append(("layout/500", lambda: (clear_layout_caches(),
+                                         [fit_text(text, engine.font_name, 97, 12, 8) for text in layout_texts])))
+
+    # ภาพตัวอย่างการ์ดแบบไม่มีแคช (เวลาที่ผู้ใช้รอหลังเปลี่ยนสี/ฟอนต์)
+    preview_cards = engine.generate_cards_data(deck, PREVIEW_CARDS, 5, seed=0)
+    cases.append((f"preview/{PREVIEW_CARDS}x5", lambda: (clear_preview_cache(),
+                                                         cards_preview_png(engine, preview_cards, grid_size=5, **style))))
+
+    for num_pairs in [35, 500]:
+        caller_deck = make_long_thai_deck(num_pairs)
+        cases.append((f"caller_sheet/{num_pairs}", lambda d=caller_deck: engine.create_caller_sheet_pdf_bytes(d, style["title"])))
+
+    for num_cards in [50, 5_000]:
+        cards = engine.generate_cards_data(deck, num_cards, 5, seed=0)
+        cases.append((f"zip/{num_cards}x5",
+                      lambda c=cards: write_bingo_set_zip(io.BytesIO(), engine, c, deck, grid_size=5, workers=1, **style)))
+
+    for num_pairs in LLM_RESPONSE_PAIRS:
+        assistant = AIAssistant(client=StubGroqClient(make_synthetic_response(num_pairs)), cache=QACache(":memory:"))
+        cases.append((f"ai_cleanup/{num_pairs}",
+                      lambda a=assistant, n=num_pairs: a.generate_bingo_qa_pairs("ภูมิศาสตร์", n, force_refresh=True)))
+
+    # หลายหัวข้อพร้อมกัน (โควตาไม่จำกัด จึงวัดเฉพาะงานของเราเอง: จัดคิว, ตรวจ/ตัดคู่ซ้ำ, สถิติ)
+    batch_assistant = AIAssistant(async_client=AsyncStubGroqClient(make_synthetic_response(35)), cache=QACache(":memory:"))
+    batch_topics = [f"หัวข้อที่ {i}" for i in range(BATCH_TOPICS)]
+    cases.append((f"ai_batch/{BATCH_TOPICS}", lambda: batch_assistant.generate_batch(
+        batch_topics, 35, force_refresh=True, limiter=RateLimiter(1e9, 1e12))))
+
+    if quick:
+        cases = [(name, func) for name, func in cases if name not in QUICK_SKIP]
+    return cases
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """เวลาที่ดีที่สุด (ms) จาก repeat รอบ และหน่วยความจำสูงสุด (KB) จากอีก 1 รอบภายใต้ tracemalloc"""
+    # AIAssistant พิมพ์ DEBUG ทุกครั้งที่เรียก: เก็บทิ้งไม่ให้ปนกับตารางผล
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        func()  # Warm-up (แคชตัดบรรทัด, ฟอนต์, import ภายใน)
+        if time.perf_counter() - started > SLOW_CASE_SECONDS:
+            repeat = 1
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {"time_ms": min(timings) * 1000, "peak_kb": peak / 1024}
+
+
+def calibrate(repeat: int = 5) -> float:
+    """
+    เวลา (ms) ของงาน Python ล้วนที่คงที่ ใช้ปรับ Baseline ตามความเร็วเครื่อง/ภาระเครื่องขณะรัน
+    (ถ้าเครื่องช้าลงทั้งเครื่อง ทุกเคสจะช้าลงพอ ๆ กันและไม่ควรถูกนับเป็น Regression)
+    """
+    def workload():
+        values = [(i * 7919) % 10007 for i in range(200_000)]
+        values.sort()
+        return sum(value % 13 for value in values)
+    return min(_time_once(workload) for _ in range(repeat)) * 1000
+
+
+def _time_once(func: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            time_tolerance: float, memory_tolerance: float, machine_factor: float = 1.0) -> List[str]:
+    """
+    คืนรายการข้อความของเคสที่ช้าลง/ใช้หน่วยความจำเพิ่มเกินเกณฑ์เมื่อเทียบกับ Baseline
+    machine_factor = เวลา Calibration รอบนี้ / ของ Baseline (ใช้ปรับเวลาอ้างอิงเท่านั้น ไม่ปรับหน่วยความจำ)
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        expected_ms = reference["time_ms"] * machine_factor
+        if result["time_ms"] > expected_ms * time_tolerance and result["time_ms"] - expected_ms > MIN_TIME_DELTA_MS:
+            regressions.append(f"{name}: เวลา {expected_ms:.2f}ms -> {result['time_ms']:.2f}ms "
+                               f"({result['time_ms'] / expected_ms:.2f}x, ปรับตามเครื่องแล้ว)")
+        if result["peak_kb"] > reference["peak_kb"] * memory_tolerance and result["peak_kb"] - reference["peak_kb"] > MIN_MEMORY_DELTA_KB:
+            regressions.append(f"{name}: หน่วยความจำ {reference['peak_kb']:.0f}KB -> {result['peak_kb']:.0f}KB "
+                               f"({result['peak_kb'] / reference['peak_kb']:.2f}x)")
+    return regressions
+
+
+def load_baseline(path: str) -> Optional[Dict[str, object]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]], calibration_ms: float) -> None:
+    payload = {
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPU)",
+        "calibration_ms": calibration_ms,
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_suite", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="ข้ามเคสใหญ่")
+    parser.add_argument("--filter", default="", help="รันเฉพาะเคสที่ชื่อมีข้อความนี้ เช่น pdf/")
+    parser.add_argument("--repeat", type=int, default=3, help="จำนวนรอบที่จับเวลา (ใช้ค่าที่ดีที่สุด)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="ไฟล์ Baseline (JSON)")
+    parser.add_argument("--save-baseline", action="store_true", help="บันทึกผลรอบนี้เป็น Baseline")
+    parser.add_argument("--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    stored = load_baseline(args.baseline)
+    baseline = {} if args.save_baseline or stored is None else stored["results"]
+    calibration_before = calibrate()
+    results = {}
+    print(f"{'case':<22} {'time ms':>11} {'peak KB':>11} {'vs baseline':>12}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        cases = build_cases(args.quick)
+    for name, func in cases:
+        if args.filter not in name:
+            continue
+        results[name] = measure(func, args.repeat)
+        reference = baseline.get(name)
+        ratio = f"{results[name]['time_ms'] / reference['time_ms']:.2f}x" if reference else "-"
+        print(f"{name:<22} {results[name]['time_ms']:>11.2f} {results[name]['peak_kb']:>11.0f} {ratio:>12}")
+    # Calibrate ทั้งก่อนและหลัง เพราะภาระเครื่องอาจเปลี่ยนระหว่างรัน
+    calibration_ms = (calibration_before + calibrate()) / 2
+
+    if args.save_baseline:
+        # เก็บผลเคสที่ไม่ได้รันรอบนี้ (--quick/--filter) จาก Baseline เดิมไว้ด้วย
+        merged = dict(stored["results"]) if stored else {}
+        merged.update(results)
+        save_baseline(args.baseline, merged, calibration_ms)
+        print(f"บันทึก Baseline {len(results)} เคส -> {args.baseline} (calibration {calibration_ms:.2f}ms)")
+        return 0
+
+    if stored is None:
+        print(f"ไม่พบ Baseline ที่ {args.baseline} (รันด้วย --save-baseline เพื่อสร้าง)")
+        return 0
+
+    machine_factor = calibration_ms / stored["calibration_ms"]
+    print(f"\nความเร็วเครื่องเทียบกับตอนบันทึก Baseline: x{machine_factor:.2f} (calibration {calibration_ms:.2f}ms)")
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance, machine_factor)
+    if regressions:
+        print("\n❌ PERFORMANCE REGRESSION: ช้าลงหรือใช้หน่วยความจำเพิ่มเกินเกณฑ์", file=sys.stderr)
+        for line in regressions:
+            print(f"  - {line}", file=sys.stderr)
+        return 1
+    print("\n✅ ไม่พบ Regression เมื่อเทียบกับ Baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,100 @@
 import os
-from groq import Groq
-from typing import List, Tuple
+import asyncio
+import logging
+import threading
+import weakref
+from typing import List, Any, Dict, NamedTuple, Optional, Iterator, Sequence
 import time 
 import re
 from dotenv import load_dotenv 
+from core import metrics
+from core.qa_cache import QACache, get_default_cache, normalize_topic
+from core.qa_parser import parse_ai_response, parse_record
+from core.rate_limit import RateLimiter, backoff_seconds, get_default_rate_limiter, is_rate_limited, retry_after_seconds
 
 # โหลด .env สำหรับการรันบนเครื่องตัวเอง
 load_dotenv()
 
+# ข้อความวินิจฉัยผ่าน logging (เปิดดูด้วย logging.basicConfig(level=logging.DEBUG)) ส่วนตัวเลขสถิติอยู่ใน core.metrics
+logger = logging.getLogger(__name__)
+
+# 💡 HEDGING: ถ้าคำขอแรกยังไม่ตอบภายในเวลานี้ (วินาที) ให้ยิงคำขอสำรองขนานไปอีกตัว
+HEDGE_AFTER_SECONDS = 4.0
+
+# 💡 BATCH: จำนวนหัวข้อที่สร้างพร้อมกันสูงสุด (ยังถูกจำกัดด้วย RateLimiter อีกชั้น)
+DEFAULT_BATCH_CONCURRENCY = 4
+# Token ที่ประมาณไว้ต่อ 1 คำขอ (Prompt + คำตอบ) ใช้จองโควตาก่อนรู้ค่าจริงจาก usage ของคำตอบ
+ESTIMATED_PROMPT_TOKENS = 200
+ESTIMATED_TOKENS_PER_PAIR = 40
+# จำนวนครั้งที่ยอมรอแล้วลองใหม่เมื่อโดน Rate Limit (ไม่นับรวมใน MAX_REQUESTS)
+MAX_RATE_LIMIT_RETRIES = 5
+
+# 💡 STREAMING: ตัวคั่นระหว่างคู่ในข้อความที่ AI ส่งมา (คอมม่าหรือขึ้นบรรทัดใหม่)
+_PAIR_SEPARATOR_REGEX = re.compile(r'[,\n]')
+
+# 💡 PERF: Groq Client ระดับ Process (ต่อ API Key) ใช้ซ้ำข้ามการกดปุ่ม ไม่ต้องสร้าง Connection ใหม่ทุกครั้ง
+_CLIENTS: Dict[str, Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+# 💡 PERF: import groq (~200ms) ตอนสร้าง Client ครั้งแรกเท่านั้น ไม่ใช่ตอน import โมดูลนี้ (แอปเปิดได้เร็วขึ้น)
+def get_shared_client(api_key: str) -> Any:
+    """คืน Groq Client ที่ใช้ร่วมกันสำหรับ API Key นี้ (สร้างครั้งแรกเท่านั้น)"""
+    with _CLIENTS_LOCK:
+        if api_key not in _CLIENTS:
+            from groq import Groq
+            _CLIENTS[api_key] = Groq(api_key=api_key)
+        return _CLIENTS[api_key]
+
+
+# AsyncGroq ผูก Connection Pool กับ Event Loop ที่สร้าง จึงแชร์ต่อ (Event Loop, API Key) และหายไปพร้อม Loop ที่ปิดแล้ว
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
+def get_shared_async_client(api_key: str) -> Any:
+    """คืน AsyncGroq Client ที่ใช้ร่วมกันสำหรับ API Key นี้ใน Event Loop ปัจจุบัน (เรียกจากใน Coroutine เท่านั้น)"""
+    loop = asyncio.get_running_loop()
+    with _CLIENTS_LOCK:
+        clients = _ASYNC_CLIENTS.setdefault(loop, {})
+        if api_key not in clients:
+            from groq import AsyncGroq
+            clients[api_key] = AsyncGroq(api_key=api_key)
+        return clients[api_key]
+
+
+class TopicResult(NamedTuple):
+    """ผลของ 1 หัวข้อใน Batch: คู่ที่ได้ (ตัดซ้ำแล้ว) และสถิติเวลา (วินาที) error เป็น None เมื่อได้คู่พอ"""
+    topic: str
+    pairs: List[str]
+    cached: bool
+    requests: int
+    rate_limit_wait: float
+    seconds: float
+    error: Optional[str] = None
+
+
 class AIAssistant:
-    def __init__(self):
+    MIN_REQUIRED_PAIRS = 25 # ขั้นต่ำที่ยอมรับได้สำหรับตาราง 5x5
+
+    MAX_REQUESTS = 3 # จำนวนคำขอสูงสุดต่อหัวข้อ (รวมคำขอสำรอง/ลองใหม่)
+
+    def __init__(self, client: Any = None, cache: Optional[QACache] = None, async_client: Any = None):
+        """
+        client: Client ที่มี chat.completions.create (ค่าเริ่มต้นคือ Groq Client ที่ใช้ร่วมกัน) ใส่ Fake Client เพื่อทดสอบได้
+        cache: แคช Q&A (ค่าเริ่มต้นคือแคช SQLite ระดับ Process)
+        async_client: Client แบบ async สำหรับ agenerate_bingo_qa_pairs / agenerate_batch (ค่าเริ่มต้นคือ AsyncGroq ที่ใช้ร่วมกันใน Event Loop เดียวกัน)
+        """
         # ดึง API Key จาก Environment Variable
         self.api_key = os.environ.get("GROQ_API_KEY")
-        print(f"DEBUG: API Key loaded status: {'Success' if self.api_key else 'Failed'}")
+        logger.debug("API Key loaded status: %s", "Success" if self.api_key else "Failed")
         
-        if not self.api_key:
+        if client is None and async_client is None and not self.api_key:
             raise ValueError("GROQ_API_KEY is not set in environment variables or .env file.")
         
         # ตั้งค่า Groq Client
-        self.client = Groq(api_key=self.api_key)
+        self.client = client if client is not None else (get_shared_client(self.api_key) if self.api_key else None)
+        self.async_client = async_client
+        self.cache = cache if cache is not None else get_default_cache()
         self.model = "llama-3.1-8b-instant" # โมเดลเร็วที่เราเลือก
         
         # 💡 SYSTEM PROMPT: เน้นย้ำว่าต้องสร้าง 35 คู่ 
@@ -31,96 +107,370 @@ class AIAssistant:
             "Example of correct output: 'Who painted the Mona Lisa?:Leonardo da Vinci, What is the largest planet?:Jupiter, ...' (35 pairs)"\
         )
 
-    def generate_bingo_qa_pairs(self, topic: str, count: int) -> List[str]:
+    def generate_bingo_qa_pairs(self, topic: str, count: int, force_refresh: bool = False) -> List[str]:
         """
         เรียกใช้ AI เพื่อสร้างคู่คำถาม:คำตอบตามหัวข้อที่กำหนด พร้อมเงื่อนไขการลองใหม่ (Retry)
+        หัวข้อที่เคยสร้างแล้วจะคืนผลจากแคชทันที เว้นแต่ force_refresh=True (สร้างใหม่และเขียนทับแคช)
         """
-        MAX_RETRIES = 3 # จำนวนครั้งสูงสุดที่อนุญาตให้ลองใหม่
-        MIN_REQUIRED_PAIRS = 25 # ขั้นต่ำที่ยอมรับได้สำหรับตาราง 5x5
+        if not force_refresh:
+            cached_pairs = self.cache.get(topic, count)
+            if cached_pairs:
+                logger.debug("Q&A cache hit for topic %r (%d pairs)", topic, len(cached_pairs))
+                return cached_pairs
+
+        qa_pairs = self._generate_uncached(topic, count)
+
+        # เก็บเฉพาะผลลัพธ์ที่ผ่านเกณฑ์ขั้นต่ำ เพื่อไม่ให้ผลที่ไม่สมบูรณ์ติดอยู่ในแคช
+        if len(qa_pairs) >= self.MIN_REQUIRED_PAIRS:
+            self.cache.put(topic, count, qa_pairs)
+        return qa_pairs
+
+    def _build_messages(self, topic: str, count: int) -> List[Dict[str, str]]:
+        """สร้างข้อความ (System + User Prompt) สำหรับขอคู่คำถาม:คำตอบตามหัวข้อ"""
+        user_prompt = f"Generate {count} pairs of 'Question:Answer' about the topic: {topic}. Output in Thai if possible, otherwise use English."
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def _clean_response(self, raw_response: str, count: int) -> List[str]:
+        """ทำความสะอาดข้อความจาก AI แล้วคืนเฉพาะคู่ 'คำถาม:คำตอบ' ที่ถูกต้อง (ไม่เกิน count คู่)"""
+        # 💡 PERF: ใช้ Parser ที่คอมไพล์ไว้ล่วงหน้า สแกนข้อความรอบเดียว (แทน replace/re.sub หลายรอบ)
+        with metrics.span("llm.parse"):
+            return [str(record) for record in parse_ai_response(raw_response, limit=count)]
+
+    def _generate_uncached(self, topic: str, count: int) -> List[str]:
+        """เรียก AI จริง (ไม่ผ่านแคช) พร้อมเงื่อนไขการลองใหม่ (Retry)"""
+        MAX_RETRIES = self.MAX_REQUESTS # จำนวนครั้งสูงสุดที่อนุญาตให้ลองใหม่
+        MIN_REQUIRED_PAIRS = self.MIN_REQUIRED_PAIRS
         
         # เก็บค่าล่าสุดหากล้มเหลว
         final_qa_pairs = []
 
         for attempt in range(MAX_RETRIES):
             start_time = time.time()
-            user_prompt = f"Generate {count} pairs of 'Question:Answer' about the topic: {topic}. Output in Thai if possible, otherwise use English."
             
             # ต้องรีเซ็ต final_qa_pairs ก่อนเริ่ม attempt ใหม่
             current_qa_pairs = []
 
             try:
-                chat_completion = self.client.chat.completions.create(
-                    messages=[
-                        {"role": "system", "content": self.system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    model=self.model,
-                    temperature=0.7,
-                )
+                metrics.incr("llm.requests")
+                if attempt > 0:
+                    metrics.incr("llm.retries")
+                with metrics.span("llm.request"):
+                    chat_completion = self.client.chat.completions.create(
+                        messages=self._build_messages(topic, count),
+                        model=self.model,
+                        temperature=0.7,
+                    )
                 
                 raw_response = chat_completion.choices[0].message.content
                 
-                # FINAL FIX LOGIC: ทำความสะอาดข้อความแบบเข้มงวด (Aggressive Filtering)
-                cleaned_response = raw_response.strip()
-                
-                # 1. แทนที่ Newline ด้วยคอมม่า (,) และลบเลขนำหน้า (e.g., 1., 2.)
-                cleaned_response = cleaned_response.replace('\n', ',')
-                cleaned_response = re.sub(r'\s*\d+\.\s*', '', cleaned_response)
-                
-                # 2. 💡 CRITICAL: กรองอักขระที่ไม่ใช่ภาษาไทย/อังกฤษ/ตัวเลข/เครื่องหมายที่จำเป็น
-                allowed_chars_regex = r'[^ก-๙a-zA-Z0-9\s:?,.\'"-]' 
-                cleaned_response = re.sub(allowed_chars_regex, '', cleaned_response)
-                
-                # 3. จัดการช่องว่างแปลกปลอม (รวม \t, \xa0, \ufeff และช่องว่างหลายตัว) ด้วยช่องว่างเดี่ยว ' '
-                cleaned_response = re.sub(r'[\s\t\r\xa0\ufeff\u2000-\u200A\u202F\u205F\u3000]+', ' ', cleaned_response).strip()
-                
-                # 4. จัดการช่องว่างรอบคอมม่าและคอมม่าซ้ำซ้อน
-                cleaned_response = cleaned_response.replace(' ,', ',').replace(', ', ',')
-                cleaned_response = re.sub(r',+', ',', cleaned_response)
-                
-                # 5. ประมวลผลข้อความ: แยกด้วยจุลภาค (,)
-                qa_pairs = [pair.strip() for pair in cleaned_response.split(',') if pair.strip()]
-                
-                # 6. ตรวจสอบความถูกต้อง (ต้องมีเครื่องหมาย ':') และตัดให้เหลือแค่ 'count' คู่แรก
-                for pair in qa_pairs:
-                    # นำช่องว่างรอบเครื่องหมาย ':' ออกก่อนเช็ค
-                    pair_cleaned = pair.replace(' : ', ':').replace(':', ':', 1)
-                    
-                    if ':' in pair_cleaned:
-                        q, _, a = pair_cleaned.partition(':')
-                        
-                        # 💡 NEW: เช็คว่าทั้งคำถามและคำตอบไม่เป็นค่าว่าง
-                        if q.strip() and a.strip():
-                            current_qa_pairs.append(pair_cleaned.strip())
-                
-                if len(current_qa_pairs) > count:
-                    current_qa_pairs = current_qa_pairs[:count]
+                current_qa_pairs = self._clean_response(raw_response, count)
                 
                 final_qa_pairs = current_qa_pairs # เก็บผลลัพธ์ที่ดีที่สุด
                 current_count = len(final_qa_pairs)
                 
                 elapsed_time = time.time() - start_time
-                print(f"DEBUG: AI Response Time: {elapsed_time:.2f}s (Attempt {attempt + 1}/{MAX_RETRIES})")
-                print(f"DEBUG: Final Q&A pairs count: {current_count}")
-                print(f"DEBUG: Final Q&A pairs (Sample): {final_qa_pairs[:5]}")
+                logger.debug("AI response in %.2fs (attempt %d/%d): %d pairs, sample %s",
+                             elapsed_time, attempt + 1, MAX_RETRIES, current_count, final_qa_pairs[:5])
                 
                 # 💡 NEW: เงื่อนไขการตรวจสอบและลองใหม่ (Retry Check)
                 if current_count >= MIN_REQUIRED_PAIRS:
                     # ถ้าจำนวนถึงขั้นต่ำที่จำเป็น (25 คู่) ถือว่าใช้ได้
-                    print(f"DEBUG: Pair count ({current_count}) is sufficient (>= {MIN_REQUIRED_PAIRS}). Done.")
                     return final_qa_pairs
                 else:
-                    print(f"DEBUG: Pair count ({current_count}) is too low (< {MIN_REQUIRED_PAIRS}). Retrying...")
+                    logger.debug("Pair count (%d) is too low (< %d), retrying", current_count, MIN_REQUIRED_PAIRS)
             
             except Exception as e:
-                print(f"ERROR: AI generation failed (Attempt {attempt + 1}/{MAX_RETRIES}): {e}")
+                metrics.incr("llm.errors")
+                logger.warning("AI generation failed (attempt %d/%d): %s", attempt + 1, MAX_RETRIES, e)
                 # ถ้าเกิดข้อผิดพลาดในการเรียก API
                 if attempt < MAX_RETRIES - 1:
-                    time.sleep(1) # พัก 1 วิ ก่อนลองใหม่
+                    # พักตาม retry-after ของผู้ให้บริการ (ถ้ามี) ไม่เช่นนั้นพักนานขึ้นเป็นเท่าตัวทุกครั้ง
+                    time.sleep(backoff_seconds(attempt, retry_after_seconds(e)))
                 else:
-                    print("ERROR: Maximum retries reached due to error. Returning best effort result.")
+                    logger.error("Maximum retries reached, returning best effort result (%d pairs)", len(final_qa_pairs))
                     # จบการทำงานด้วยการคืนค่าล่าสุดที่มี
                     break 
 
         # คืนค่าสุดท้ายที่ได้มา (ถึงแม้จะน้อยกว่า 25)
-        return final_qa_pairs
\ No newline at end of file
+        return final_qa_pairs
+
+    def _async_client(self) -> Any:
+        """Client แบบ async ที่กำหนดไว้ตอนสร้าง หรือ AsyncGroq ที่ใช้ร่วมกัน (ไม่ปิดหลังใช้ คำขอถัดไปใช้ Connection เดิมได้)"""
+        return self.async_client if self.async_client is not None else get_shared_async_client(self.api_key)
+
+    # 💡 ASYNC: ยิงคำขอพร้อมกัน/คำขอสำรอง (Hedged Requests) แทนการลองใหม่ทีละครั้ง
+    async def agenerate_bingo_qa_pairs(self, topic: str, count: int, force_refresh: bool = False, parallel: int = 1,
+                                       hedge_after: Optional[float] = HEDGE_AFTER_SECONDS, max_requests: Optional[int] = None) -> List[str]:
+        """
+        สร้างคู่คำถาม:คำตอบแบบ async โดยเริ่มยิง parallel คำขอพร้อมกัน และยิงคำขอสำรองเพิ่มเมื่อ
+        ไม่มีคำตอบภายใน hedge_after วินาที (None = ไม่ Hedge) หรือเมื่อคำตอบที่ได้ยังไม่พอ
+        รวมคู่ที่ถูกต้องจากทุกคำตอบ (ตัดคำถาม/คำตอบซ้ำ) จนครบ count แล้วยกเลิกคำขอที่เหลือทันที
+        """
+        if not force_refresh:
+            cached_pairs = self.cache.get(topic, count)
+            if cached_pairs:
+                logger.debug("Q&A cache hit for topic %r (%d pairs)", topic, len(cached_pairs))
+                return cached_pairs
+
+        max_requests = max_requests or self.MAX_REQUESTS
+        client = self._async_client()
+
+        merged_pairs: List[str] = []
+        seen_keys: set = set()
+        pending: set = set()
+        launched = 0
+        start_time = time.time()
+
+        async def timed_request():
+            started = time.perf_counter()
+            try:
+                return await client.chat.completions.create(
+                    messages=self._build_messages(topic, count),
+                    model=self.model,
+                    temperature=0.7,
+                )
+            finally:
+                metrics.record_span("llm.request", time.perf_counter() - started)
+
+        def launch() -> None:
+            nonlocal launched
+            launched += 1
+            metrics.incr("llm.requests")
+            pending.add(asyncio.ensure_future(timed_request()))
+
+        try:
+            for _ in range(min(max(parallel, 1), max_requests)):
+                launch()
+
+            while pending and len(merged_pairs) < count:
+                # รอจนกว่าจะมีคำตอบแรก หรือครบเวลา Hedge (ถ้ายังยิงคำขอเพิ่มได้)
+                timeout = hedge_after if launched < max_requests else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    logger.debug("No AI response after %.1fs, sending hedged request (%d/%d)", hedge_after, launched + 1, max_requests)
+                    metrics.incr("llm.hedged_requests")
+                    launch()
+                    continue
+
+                for task in done:
+                    try:
+                        raw_response = task.result().choices[0].message.content
+                    except Exception as e:
+                        metrics.incr("llm.errors")
+                        logger.warning("AI generation failed (%d/%d requests sent): %s", launched, max_requests, e)
+                        continue
+                    self._merge_unique_pairs(merged_pairs, seen_keys, self._clean_response(raw_response, count), count)
+
+                logger.debug("AI response after %.2fs (merged %d/%d pairs)", time.time() - start_time, len(merged_pairs), count)
+
+                # คำตอบที่ได้ยังไม่พอและไม่มีคำขอค้างอยู่: ยิงคำขอใหม่ทันที (ไม่ต้องพัก)
+                if len(merged_pairs) < count and not pending and launched < max_requests:
+                    metrics.incr("llm.retries")
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if len(merged_pairs) >= self.MIN_REQUIRED_PAIRS:
+            self.cache.put(topic, count, merged_pairs)
+        return merged_pairs
+
+    @staticmethod
+    def _merge_unique_pairs(merged_pairs: List[str], seen_keys: set, new_pairs: List[str], count: int) -> None:
+        """เพิ่มคู่ใหม่เข้า merged_pairs โดยข้ามคู่ที่คำถามหรือคำตอบซ้ำกับที่มีอยู่ (ไม่เกิน count คู่)"""
+        for pair in new_pairs:
+            if len(merged_pairs) >= count:
+                return
+            question, _, answer = pair.partition(':')
+            question_key = ("q", question.strip().casefold())
+            answer_key = ("a", answer.strip().casefold())
+            if question_key in seen_keys or answer_key in seen_keys:
+                continue
+            seen_keys.update((question_key, answer_key))
+            merged_pairs.append(pair)
+
+    # 💡 BATCH: สร้างหลายหัวข้อในครั้งเดียว (เช่น หัวข้อทั้งเทอม) ภายใต้ขีดจำกัดคำขอ/Token ของผู้ให้บริการ
+    def generate_batch(self, topics: Sequence[str], count: int, force_refresh: bool = False, limiter: Optional[RateLimiter] = None,
+                       concurrency: int = DEFAULT_BATCH_CONCURRENCY) -> List[TopicResult]:
+        """เวอร์ชัน Sync ของ agenerate_batch (สำหรับ CLI/สคริปต์ที่ไม่มี Event Loop)"""
+        return asyncio.run(self.agenerate_batch(topics, count, force_refresh, limiter, concurrency))
+
+    async def agenerate_batch(self, topics: Sequence[str], count: int, force_refresh: bool = False, limiter: Optional[RateLimiter] = None,
+                              concurrency: int = DEFAULT_BATCH_CONCURRENCY) -> List[TopicResult]:
+        """
+        สร้างคู่คำถาม:คำตอบหลายหัวข้อพร้อมกัน (ไม่เกิน concurrency หัวข้อ) โดยทุกคำขอผ่าน limiter (ค่าเริ่มต้นคือโควตาระดับ Process)
+        หัวข้อซ้ำ (ตาม normalize_topic) สร้างครั้งเดียว คืนผล 1 รายการต่อหัวข้อที่ไม่ซ้ำ ตามลำดับเดิม
+        """
+        unique_topics: Dict[str, str] = {}
+        for topic in topics:
+            if topic.strip():
+                unique_topics.setdefault(normalize_topic(topic), topic.strip())
+
+        results: Dict[str, TopicResult] = {}
+        for key, topic in unique_topics.items():
+            cached_pairs = None if force_refresh else self.cache.get(topic, count)
+            if cached_pairs:
+                results[key] = TopicResult(topic, cached_pairs, True, 0, 0.0, 0.0)
+        pending = [(key, topic) for key, topic in unique_topics.items() if key not in results]
+        logger.debug("Batch Q&A for %d topics (%d cached, %d to generate)", len(unique_topics), len(results), len(pending))
+
+        if pending:
+            limiter = limiter or get_default_rate_limiter()
+            client = self._async_client()
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+
+            async def run(topic: str) -> TopicResult:
+                async with semaphore:
+                    return await self._agenerate_topic(client, topic, count, limiter)
+
+            generated = await asyncio.gather(*(run(topic) for _, topic in pending))
+            results.update(zip((key for key, _ in pending), generated))
+        return [results[key] for key in unique_topics]
+
+    async def _agenerate_topic(self, client: Any, topic: str, count: int, limiter: RateLimiter) -> TopicResult:
+        """สร้าง 1 หัวข้อใน Batch: ลองใหม่ด้วย Backoff เมื่อผิดพลาด และหยุดทุกหัวข้อตาม retry-after เมื่อโดน Rate Limit"""
+        started = time.perf_counter()
+        estimated_tokens = ESTIMATED_PROMPT_TOKENS + ESTIMATED_TOKENS_PER_PAIR * count
+        enough = min(count, self.MIN_REQUIRED_PAIRS)
+        merged_pairs: List[str] = []
+        seen_keys: set = set()
+        requests = attempts = rate_limited = 0
+        waited = 0.0
+        error: Optional[str] = None
+
+        while attempts < self.MAX_REQUESTS and len(merged_pairs) < enough:
+            waited += await limiter.acquire(estimated_tokens)
+            requests += 1
+            metrics.incr("llm.requests")
+            request_started = time.perf_counter()
+            try:
+                chat_completion = await client.chat.completions.create(
+                    messages=self._build_messages(topic, count - len(merged_pairs)),
+                    model=self.model,
+                    temperature=0.7,
+                )
+            except Exception as e:
+                metrics.incr("llm.errors")
+                error = str(e)
+                retry_after = retry_after_seconds(e)
+                if is_rate_limited(e) and rate_limited < MAX_RATE_LIMIT_RETRIES:
+                    # เกินโควตาของผู้ให้บริการ: หยุดทุกหัวข้อพร้อมกัน แล้วลองใหม่โดยไม่นับเป็นความพยายามที่ล้มเหลว
+                    delay = backoff_seconds(rate_limited, retry_after)
+                    rate_limited += 1
+                    logger.info("Rate limited on topic %r, pausing all requests for %.1fs", topic, delay)
+                    limiter.pause(delay)
+                    continue
+                attempts += 1
+                logger.warning("AI generation failed for topic %r (attempt %d/%d): %s", topic, attempts, self.MAX_REQUESTS, e)
+                if attempts < self.MAX_REQUESTS:
+                    delay = backoff_seconds(attempts - 1, retry_after)
+                    waited += delay
+                    await asyncio.sleep(delay)
+                continue
+            finally:
+                metrics.record_span("llm.request", time.perf_counter() - request_started)
+
+            attempts += 1
+            actual_tokens = getattr(getattr(chat_completion, "usage", None), "total_tokens", None)
+            if actual_tokens:
+                limiter.record_usage(estimated_tokens, actual_tokens)
+            raw_response = chat_completion.choices[0].message.content or ""
+            self._merge_unique_pairs(merged_pairs, seen_keys, self._clean_response(raw_response, count), count)
+            error = None if len(merged_pairs) >= enough else f"ได้คู่ที่ถูกต้องเพียง {len(merged_pairs)}/{count} คู่"
+            if error is not None and attempts < self.MAX_REQUESTS:
+                metrics.incr("llm.retries")
+
+        if len(merged_pairs) >= self.MIN_REQUIRED_PAIRS:
+            self.cache.put(topic, count, merged_pairs)
+        seconds = time.perf_counter() - started
+        logger.debug("Batch topic %r: %d/%d pairs, %d requests, waited %.2fs, total %.2fs",
+                     topic, len(merged_pairs), count, requests, waited, seconds)
+        return TopicResult(topic, merged_pairs, False, requests, waited, seconds, error)
+
+    # 💡 STREAMING: อ่านคำตอบของ AI ทีละ Token แล้วส่งคู่ที่สมบูรณ์ออกไปทันที
+    def stream_bingo_qa_pairs(self, topic: str, count: int, force_refresh: bool = False) -> Iterator[str]:
+        """
+        สร้างคู่คำถาม:คำตอบแบบ Streaming: yield แต่ละคู่ที่ผ่านการตรวจสอบทันทีที่ AI พิมพ์ครบคู่
+        หยุดอ่าน (และปิด Stream เพื่อไม่เสีย Token) เมื่อได้ครบ count คู่ ถ้าได้ไม่ถึงขั้นต่ำจะเปิด Stream ใหม่ต่อ
+        """
+        if not force_refresh:
+            cached_pairs = self.cache.get(topic, count)
+            if cached_pairs:
+                logger.debug("Q&A cache hit for topic %r (%d pairs)", topic, len(cached_pairs))
+                yield from cached_pairs
+                return
+
+        merged_pairs: List[str] = []
+        seen_keys: set = set()
+
+        for attempt in range(self.MAX_REQUESTS):
+            start_time = time.time()
+            metrics.incr("llm.requests")
+            if attempt > 0:
+                metrics.incr("llm.retries")
+            pairs_stream = self._stream_single_response(topic, count - len(merged_pairs))
+            try:
+                for pair in pairs_stream:
+                    before = len(merged_pairs)
+                    self._merge_unique_pairs(merged_pairs, seen_keys, [pair], count)
+                    if len(merged_pairs) > before:
+                        yield pair
+                    if len(merged_pairs) >= count:
+                        break
+            except Exception as e:
+                metrics.incr("llm.errors")
+                logger.warning("AI streaming failed (attempt %d/%d): %s", attempt + 1, self.MAX_REQUESTS, e)
+            finally:
+                # ปิด Stream ทันทีเมื่อได้ครบแล้ว (หยุดจ่ายค่า Token ส่วนที่เหลือ)
+                pairs_stream.close()
+                metrics.record_span("llm.stream", time.time() - start_time)
+
+            logger.debug("AI stream finished in %.2fs (attempt %d/%d, %d/%d pairs)",
+                         time.time() - start_time, attempt + 1, self.MAX_REQUESTS, len(merged_pairs), count)
+            if len(merged_pairs) >= self.MIN_REQUIRED_PAIRS:
+                break
+
+        if len(merged_pairs) >= self.MIN_REQUIRED_PAIRS:
+            self.cache.put(topic, count, merged_pairs)
+
+    def _stream_single_response(self, topic: str, count: int) -> Iterator[str]:
+        """เปิด Stream 1 คำขอ แล้ว yield คู่ที่ถูกต้องทันทีที่เจอตัวคั่น (ปิด Stream เมื่อผู้เรียกหยุดอ่าน)"""
+        stream = self.client.chat.completions.create(
+            messages=self._build_messages(topic, count),
+            model=self.model,
+            temperature=0.7,
+            stream=True,
+        )
+        pending_text = ""
+        started = time.perf_counter()
+        first_token = True
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                if first_token:
+                    # เวลาจนถึง Token แรก: บอกได้ว่าช้าที่คิว/เครือข่าย หรือช้าที่การพิมพ์ของโมเดล
+                    metrics.record_span("llm.first_token", time.perf_counter() - started)
+                    first_token = False
+                pending_text += chunk.choices[0].delta.content or ""
+
+                # ทุกส่วนก่อนตัวคั่นตัวสุดท้ายคือคู่ที่พิมพ์เสร็จแล้ว ส่วนที่เหลือรอ Token ถัดไป
+                *complete_parts, pending_text = _PAIR_SEPARATOR_REGEX.split(pending_text)
+                for part in complete_parts:
+                    record = parse_record(part)
+                    if record is not None:
+                        yield str(record)
+
+            record = parse_record(pending_text)
+            if record is not None:
+                yield str(record)
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
@@ -0,0 +1,167 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+from core import metrics
+
+# 💡 CONFIG: ที่เก็บไฟล์ที่เรนเดอร์เสร็จแล้ว (PDF/ZIP) และขนาดรวมสูงสุด (ปรับผ่าน Environment Variable ได้)
+DEFAULT_ARTIFACT_DIR = os.environ.get("BINGO_ARTIFACT_CACHE_DIR", ".cache/artifacts")
+DEFAULT_MAX_BYTES = int(os.environ.get("BINGO_ARTIFACT_CACHE_MAX_MB", 512)) * 1024 * 1024
+
+_TEMP_PREFIX = ".tmp-"
+
+
+def _canonical(value: Any) -> Any:
+    """แปลงค่าให้อยู่ในรูปที่ json.dumps ได้และให้ผลเดิมทุกครั้ง (bytes ถูกแทนด้วย SHA-256 ของเนื้อหา)"""
+    if isinstance(value, (bytes, bytearray)):
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if hasattr(value, "_asdict"):
+        return _canonical(list(value))
+    return value
+
+
+def artifact_key(*parts: Any) -> str:
+    """Key แบบ Content-addressed: SHA-256 ของทุกอย่างที่มีผลต่อไฟล์ผลลัพธ์ (ลำดับของ parts มีผล)"""
+    payload = json.dumps(_canonical(list(parts)), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=16)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: str) -> str:
+    """SHA-256 ของไฟล์ (เช่น ฟอนต์) แคชไว้ตามขนาด/เวลาแก้ไข จึงไม่ต้องอ่านไฟล์ใหม่ทุกครั้ง"""
+    stat = os.stat(path)
+    return _file_digest(os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+class ArtifactCache:
+    """
+    แคชไฟล์ผลลัพธ์ (PDF ผู้เล่น, Caller Sheet, ZIP) บนดิสก์ เก็บเป็นไฟล์ชื่อ <key>-<name>
+    เขียนแบบ Atomic (ไฟล์ชั่วคราว + os.replace) และลบไฟล์ที่ไม่ได้ใช้นานที่สุดเมื่อขนาดรวมเกิน max_bytes (LRU)
+    """
+
+    def __init__(self, root: str = DEFAULT_ARTIFACT_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key: str, name: str) -> str:
+        return os.path.join(self.root, f"{key}-{name}")
+
+    def get(self, key: str, name: str) -> Optional[str]:
+        """คืน path ของไฟล์ในแคช (None ถ้าไม่มี) และอัปเดตเวลาใช้งานล่าสุดสำหรับ LRU"""
+        path = self.path(key, name)
+        try:
+            os.utime(path)
+        except OSError:
+            metrics.incr("artifact_cache.misses")
+            return None
+        metrics.incr("artifact_cache.hits")
+        return path
+
+    @contextmanager
+    def writer(self, key: str, name: str) -> Iterator[BinaryIO]:
+        """
+        เปิดไฟล์สำหรับเขียนลงแคช: ไฟล์จะปรากฏใน get() ก็ต่อเมื่อบล็อก with จบโดยไม่มี Exception
+        (ถ้าเกิด Exception ไฟล์ที่เขียนไม่ครบจะถูกลบทิ้ง)
+        """
+        path = self.path(key, name)
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=_TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                yield f
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        metrics.incr("artifact_cache.bytes_written", os.path.getsize(path))
+        self.evict(keep=path)
+
+    def get_json(self, key: str, name: str) -> Optional[Dict[str, Any]]:
+        path = self.get(key, name)
+        if path is None:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put_json(self, key: str, name: str, data: Dict[str, Any]) -> None:
+        with self.writer(key, name) as f:
+            f.write(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+    def _entries(self) -> list:
+        entries = []
+        with os.scandir(self.root) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.startswith(_TEMP_PREFIX):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def total_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """ลบไฟล์ที่ใช้ล่าสุดนานที่สุดจนขนาดรวมไม่เกิน max_bytes (ไม่ลบไฟล์ keep ที่เพิ่งเขียน)"""
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    # ไฟล์ที่กำลังถูกเปิดอ่านอยู่ (บน Windows) ลบไม่ได้ ข้ามไปก่อน
+                    continue
+                total -= size
+                metrics.incr("artifact_cache.evictions")
+
+    def clear(self) -> None:
+        """ล้างแคชทั้งหมด"""
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+_DEFAULT_CACHE: Optional[ArtifactCache] = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_default_artifact_cache() -> ArtifactCache:
+    """แคชไฟล์ผลลัพธ์ระดับ Process ที่ใช้ร่วมกันทุก Session ของ Streamlit"""
+    global _DEFAULT_CACHE
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = ArtifactCache()
+        return _DEFAULT_CACHE
@@ -1,107 +1,227 @@
 import random
 import io
+import logging
+import threading
+import time
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.colors import black, white, lightgrey, HexColor 
+from reportlab.lib.colors import black, HexColor
 from reportlab.lib.utils import ImageReader 
-from typing import List, Tuple, Any
+from typing import List, Tuple, Any, Dict, Union, Sequence, Optional
+from core import metrics
+from core.models import Deck, QAPair, CARD_POOL_SIZE
+from core.card_generator import AnswerIndex, CardBatch, generate_card_indices, cards_to_text, matching_call_order
+from core.fonts import DEFAULT_FONT, deck_glyphs, install_subset_cache, prime_glyph_subset, resolve_font_path
+from core.imposition import DEFAULT_PAGE_SIZE, PAGE_SIZES, draw_cut_marks, plan_slots
+from core.text_layout import fit_text, wrap_lines
+
+logger = logging.getLogger(__name__)
+
+# 💡 PERF: ทะเบียนฟอนต์ระดับ Process (font_path -> ชื่อฟอนต์ที่ลงทะเบียนแล้ว)
+# อ่านไฟล์ TTF เพียงครั้งเดียว แล้วใช้ร่วมกันทุก BingoEngine และทุก Session ของ Streamlit
+_FONT_REGISTRY: Dict[str, str] = {}
+_FONT_LOCK = threading.Lock()
+
+# 💡 ระยะบนพื้นที่ออกแบบการ์ด (A4, หน่วย pt) ใช้ร่วมกับภาพตัวอย่างใน core.preview ให้ได้ Layout เดียวกัน
+CARD_MARGIN = 30
+# ระยะจากขอบบนของการ์ดถึงขอบบนของตาราง (พื้นที่ Title และโลโก้)
+CARD_GRID_TOP = 100
+# ขนาดฟอนต์ในช่อง: เริ่มที่ขนาดใหญ่สุด แล้วลดได้ถึงขนาดเล็กสุดถ้าเกิน MAX_CELL_LINES บรรทัด
+CELL_MAX_FONT_SIZE = 12
+CELL_MIN_FONT_SIZE = 8
+CELL_PADDING = 10
+
+
+def register_font_once(font_path: str, font_name: str = "CustomFont") -> str:
+    """ลงทะเบียนฟอนต์ครั้งเดียวต่อ Process แล้วคืนชื่อฟอนต์ที่ใช้ได้ (Fallback เป็น Helvetica)"""
+    with _FONT_LOCK:
+        if font_path in _FONT_REGISTRY:
+            metrics.incr("font.cache_hits")
+            return _FONT_REGISTRY[font_path]
+
+        # ป้องกันชื่อซ้ำกรณีมีหลายไฟล์ฟอนต์ (ชื่อเดียวกันจะทับฟอนต์เดิมใน reportlab)
+        if font_name in _FONT_REGISTRY.values():
+            font_name = f"{font_name}-{len(_FONT_REGISTRY)}"
+
+        try:
+            with metrics.span("font.load"):
+                font = TTFont(font_name, font_path)
+                install_subset_cache(font)
+                pdfmetrics.registerFont(font)
+        except Exception:
+            font_name = "Helvetica" # Fallback
+
+        _FONT_REGISTRY[font_path] = font_name
+        return font_name
+
 
 class BingoEngine:
-    def __init__(self, font_path="assets/fonts/TH Niramit AS.ttf"):
-        self.font_path = font_path
+    def __init__(self, font_path=DEFAULT_FONT):
+        # รับได้ทั้งชื่อฟอนต์ใน FONT_CATALOG (เช่น "TH Sarabun") หรือ path ของไฟล์ .ttf
+        self.font_path = resolve_font_path(font_path)
         self.font_name = "CustomFont"
         self.register_font()
 
     def register_font(self):
-        """ลงทะเบียนฟอนต์ภาษาไทยเพื่อให้ PDF อ่านออก"""
-        try:
-            pdfmetrics.registerFont(TTFont(self.font_name, self.font_path))
-        except:
-            self.font_name = "Helvetica" # Fallback
+        """ลงทะเบียนฟอนต์ภาษาไทยเพื่อให้ PDF อ่านออก (โหลดจริงเพียงครั้งเดียวต่อ Process)"""
+        self.font_name = register_font_once(self.font_path, self.font_name)
 
     # 💡 FIX 1: ดึง 'คำตอบ' มาใช้ในการ์ดแทน 'คำถาม' 
-    def generate_cards_data(self, qa_pairs: List[str], num_cards: int = 1, grid_size: int = 5) -> List[List[str]]:
+    def generate_cards_data(self, qa_pairs: Union[Deck, Sequence[Union[str, QAPair]]], num_cards: int = 1, grid_size: int = 5,
+                            seed: Optional[int] = None, unique: bool = False, pool_size: Optional[int] = CARD_POOL_SIZE) -> List[List[str]]:
         """
-        สุ่มคำตอบลงตารางสำหรับผู้เล่น โดยใช้เพียง 25 คู่แรกจากรายการ Q&A
+        สุ่มคำตอบลงตารางสำหรับผู้เล่น จากคลังคำ pool_size คู่แรกของรายการ Q&A (None = ทุกคู่ รองรับได้หลักหมื่นคู่)
+        seed กำหนดผลสุ่มให้ทำซ้ำได้ และ unique=True รับประกันว่าไม่มีการ์ดซ้ำกันทั้งใบ
         """
-        cards = []
-        total_cells = grid_size * grid_size
-        center_index = total_cells // 2
-        
-        # 1. ใช้ Q&A สำหรับทำตารางแค่ 25 คู่แรกเท่านั้น
-        qa_for_cards = qa_pairs[:25]
-        
-        # 2. ดึงเฉพาะ 'คำตอบ' (ส่วนหลังเครื่องหมาย ':') มาใช้ในการ์ด
-        answers = []
-        for pair in qa_for_cards: 
-            _, _, a = pair.partition(':')
-            
-            # ใช้คำตอบ แต่ถ้าไม่มีคำตอบ (Input ผิดพลาด) ให้ใช้คำถามแทน
-            answer_to_use = a.strip()
-            if not answer_to_use:
-                q, _, _ = pair.partition(':')
-                answer_to_use = q.strip()
+        answers, card_indices = self._generate_card_indices(qa_pairs, num_cards, grid_size, seed, unique, pool_size)
+        return cards_to_text(card_indices, answers)
 
-            answers.append(answer_to_use)
+    def generate_card_batch(self, qa_pairs: Union[Deck, Sequence[Union[str, QAPair]]], num_cards: int = 1, grid_size: int = 5,
+                            seed: Optional[int] = None, unique: bool = False, pool_size: Optional[int] = CARD_POOL_SIZE) -> CardBatch:
+        """เหมือน generate_cards_data แต่คืนลำดับการเรียกที่เข้ากับการ์ดด้วย (คู่ที่อยู่บนการ์ดก่อน ตามด้วยคำถามสำรอง)"""
+        deck = Deck.coerce(qa_pairs)
+        answers, card_indices = self._generate_card_indices(deck, num_cards, grid_size, seed, unique, pool_size)
+        index = AnswerIndex(card_indices, len(answers))
+        call_order = matching_call_order(index, len(deck), seed=seed)
+        return CardBatch(cards_to_text(card_indices, answers), call_order, index.num_used())
 
-        # 3. เตรียมคำศัพท์สำหรับการ์ด
-        words_for_card = answers + [""] * max(0, total_cells - len(answers))
+    def _generate_card_indices(self, qa_pairs: Union[Deck, Sequence[Union[str, QAPair]]], num_cards: int, grid_size: int,
+                               seed: Optional[int], unique: bool, pool_size: Optional[int]) -> Tuple[Sequence[str], Any]:
+        # 1-2. ใช้ 'คำตอบ' ของคู่ในคลังคำ (Deck คำนวณข้อความบนการ์ดไว้แล้วตอนรับ Input)
+        answers = Deck.coerce(qa_pairs).card_pool(pool_size)
 
-        for _ in range(num_cards):
-            card = random.sample(words_for_card, total_cells)
-            
-            if grid_size % 2 != 0:
-                card[center_index] = "FREE"
-                
-            cards.append(card)
-        return cards
+        # 3. 💡 PERF: สุ่มการ์ดทั้งชุดพร้อมกันด้วย NumPy (ช่องที่คำไม่พอเป็นช่องว่าง, กลางตารางขนาดคี่เป็น FREE)
+        with metrics.span("cards.generate"):
+            card_indices = generate_card_indices(answers, num_cards, grid_size, seed=seed, unique=unique)
+        metrics.incr("cards.generated", num_cards)
+        return answers, card_indices
     
     # 💡 FIX 2.1: Text Wrapping Helper สำหรับช่องบิงโก
-    def _wrap_text_to_lines_fixed(self, c, text, font_name, max_width, font_size=12, min_font_size=8):
-        """Helper function สำหรับตัดข้อความในช่องบิงโก (ใช้ขนาด 12pt คงที่)"""
-        
-        # ต้องลงทะเบียนฟอนต์ทุกครั้ง (ป้องกันปัญหาของ reportlab)
-        pdfmetrics.registerFont(TTFont(font_name, self.font_path))
-        
-        words = text.split()
-        lines = []
-        current_line = ""
-        
-        # ลองใช้ Font Size 12pt ก่อน
-        c.setFont(font_name, font_size)
-        
-        for word in words:
-            test_line = (current_line + " " + word).strip()
-            
-            # ตรวจสอบความยาวของบรรทัด
-            if pdfmetrics.stringWidth(test_line, font_name, font_size) < max_width - 10: # -10 คือ padding
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-        
-        if current_line:
-            lines.append(current_line)
-            
-        # ถ้าข้อความยาวเกินไป (เกิน 4 บรรทัด) อาจต้องลดขนาดฟอนต์
-        if len(lines) > 4 and font_size > min_font_size:
-            # 💡 FIX: แก้ไขการเรียกตัวเองซ้ำ (Recursive Call) โดยเพิ่ม 'c' (canvas)
-            # ใช้ขนาดเล็กสุด (8pt) แล้วลองตัดใหม่
-            return self._wrap_text_to_lines_fixed(c, text, font_name, max_width, min_font_size, min_font_size)
-            
-        return lines, font_size 
+    def _wrap_text_to_lines_fixed(self, c, text, font_name, max_width, font_size=CELL_MAX_FONT_SIZE, min_font_size=CELL_MIN_FONT_SIZE):
+        """Helper function สำหรับตัดข้อความในช่องบิงโก (ขนาดใหญ่สุด 12pt และลดลงได้ถึง 8pt ถ้าเกิน 4 บรรทัด)"""
+        # 💡 PERF: Layout ของแต่ละคำตอบคำนวณครั้งเดียว (แคชใน core.text_layout) แล้วใช้ร่วมกันทุกการ์ด
+        lines, used_font_size = fit_text(text, font_name, max_width - CELL_PADDING, font_size, min_font_size)
+        c.setFont(font_name, used_font_size)
+        return list(lines), used_font_size
 
 
-    # 💡 MODIFIED: ใช้ Text Wrapping ในช่อง
-    def create_pdf_bytes(self, cards_data: List[List[str]], title: str, grid_size: int, bg_color: str, text_color: str, free_space_color: str, logo_file: Any = None) -> bytes:
-        
+    def _load_logo(self, logo_file: Any) -> Any:
+        """ถอดรหัสรูปโลโก้เพียงครั้งเดียวต่อชุดการ์ด (คืน None ถ้าไม่มีหรืออ่านไม่ได้)"""
+        if logo_file is None:
+            return None
+        try:
+            if isinstance(logo_file, (bytes, bytearray)):
+                logo_file = io.BytesIO(logo_file)
+            if hasattr(logo_file, "seek"):
+                logo_file.seek(0)
+            return ImageReader(logo_file)
+        except Exception as e:
+            logger.warning("Error drawing logo: %s", e)
+            return None
+
+    # 💡 PERF: วาดส่วนคงที่ของการ์ด (Title, Logo, ตาราง, ช่อง FREE) ครั้งเดียวเป็น Form XObject
+    def _draw_card_template(self, c, form_name: str, title: str, grid_size: int, width: float, height: float, margin: float, cell_size: float,
+                            bg_color: Any, text_color: Any, free_color: Any, logo_image: Any = None):
+        """สร้าง Form XObject ของกรอบการ์ดที่ทุกหน้าอ้างอิงร่วมกัน (ฝังรูปโลโก้เพียงครั้งเดียว)"""
+        # ขอบเขตของ Form คือพื้นที่ออกแบบการ์ด (A4) ไม่ใช่ขนาดกระดาษ ซึ่งอาจเล็กกว่าเมื่อวางหลายใบต่อหน้า
+        c.beginForm(form_name, 0, 0, width, height)
+
+        c.setFillColor(text_color)
+        c.setFont(self.font_name, 30)
+        c.drawCentredString(width / 2, height - 40, title)
+
+        if logo_image is not None:
+            logo_size = 50
+            c.drawImage(logo_image, margin, height - 60, width=logo_size, height=logo_size)
+
+        start_y = height - CARD_GRID_TOP
+        center_index = (grid_size * grid_size) // 2 if grid_size % 2 != 0 else None
+
+        for row in range(grid_size):
+            for col in range(grid_size):
+                x = margin + (col * cell_size)
+                y = start_y - (row * cell_size)
+                is_free = (row * grid_size) + col == center_index
+
+                # 1. วาดช่องพื้นหลัง และ 2. วาดกรอบสี่เหลี่ยม
+                c.setFillColor(free_color if is_free else bg_color)
+                c.setStrokeColor(text_color)
+                c.rect(x, y - cell_size, cell_size, cell_size, fill=1, stroke=1)
+
+                if is_free:
+                    # Draw FREE space text (fixed size)
+                    c.setFillColor(text_color)
+                    c.setFont(self.font_name, 16)
+                    c.drawCentredString(x + (cell_size / 2), y - (cell_size / 2) - 5, "FREE")
+
+        c.endForm()
+
+    # 💡 MODIFIED: ใช้ Text Wrapping ในช่อง และอ้างอิงกรอบการ์ดจาก Template เดียว
+    def create_pdf_bytes(self, cards_data: List[List[str]], title: str, grid_size: int, bg_color: str, text_color: str, free_space_color: str, logo_file: Any = None, start_index: int = 0,
+                         glyphs: Optional[str] = None, cards_per_page: int = 1, page_size: str = DEFAULT_PAGE_SIZE) -> bytes:
+        """
+        สร้าง PDF การ์ดผู้เล่น (cards_per_page ใบต่อหน้า บนกระดาษ page_size) โดย start_index ใช้กำหนดเลขการ์ดเริ่มต้นเมื่อแบ่งเรนเดอร์เป็นช่วง
+        glyphs คือตัวอักษรของทั้งชุด (ดู deck_glyphs) ให้ทุกช่วงได้ Subset ฟอนต์เดียวกัน
+        """
         buffer = io.BytesIO()
-        c = canvas.Canvas(buffer, pagesize=A4)
+        self.write_pdf(buffer, cards_data, title, grid_size, bg_color, text_color, free_space_color, logo_file, start_index, glyphs,
+                       cards_per_page, page_size)
+        metrics.incr("pdf.bytes", buffer.tell())
+        return buffer.getvalue()
+
+    def _draw_card(self, c, template_name: str, card: List[str], card_number: int, grid_size: int, width: float, height: float,
+                   margin: float, cell_size: float, text_color: Any):
+        """วาดการ์ด 1 ใบในพื้นที่ออกแบบ A4: กรอบจาก Template + เลขการ์ด + ข้อความในช่อง"""
+        c.doForm(template_name)
+
+        c.setFillColor(text_color)
+        c.setFont(self.font_name, 12)
+        c.drawString(width - margin - 50, height - 55, f"Card {card_number}")
+
+        # วาดเฉพาะข้อความในช่อง (พร้อม Text Wrapping)
+        start_y = height - CARD_GRID_TOP
+        center_index = (grid_size * grid_size) // 2 if grid_size % 2 != 0 else None
+
+        for row in range(grid_size):
+            for col in range(grid_size):
+                word_idx = (row * grid_size) + col
+                word = str(card[word_idx])
+                if word_idx == center_index or not word:
+                    continue
+
+                x = margin + (col * cell_size)
+                y = start_y - (row * cell_size)
+
+                lines, font_size = self._wrap_text_to_lines_fixed(c, word, self.font_name, cell_size)
+
+                line_spacing = font_size + 2
+                total_text_height = len(lines) * line_spacing
+
+                # คำนวณตำแหน่ง Y เพื่อจัดกึ่งกลางแนวตั้ง
+                start_text_y = y - (cell_size / 2) + (total_text_height / 2) - font_size
+
+                for line in lines:
+                    # drawCentredString สำหรับจัดกึ่งกลางแนวนอน
+                    c.drawCentredString(x + (cell_size / 2), start_text_y, line)
+                    start_text_y -= line_spacing # เลื่อนลงสำหรับบรรทัดถัดไป
+
+    # 💡 STREAMING: เขียน PDF ลง Stream ปลายทางโดยตรง (ไฟล์, Entry ใน ZIP) ไม่ต้องคัดลอกเป็น bytes
+    def write_pdf(self, stream: Any, cards_data: List[List[str]], title: str, grid_size: int, bg_color: str, text_color: str, free_space_color: str, logo_file: Any = None, start_index: int = 0,
+                  glyphs: Optional[str] = None, cards_per_page: int = 1, page_size: str = DEFAULT_PAGE_SIZE) -> None:
+        """
+        เขียน PDF การ์ดผู้เล่นลง stream (อ็อบเจกต์ที่มีเมธอด write)
+        cards_per_page > 1 หรือกระดาษที่ไม่ใช่ A4 จะย่อการ์ดทั้งใบลงช่องบนแผ่นพร้อมเส้นตัด (ดู core.imposition)
+        """
+        # การ์ดออกแบบบนพื้นที่ A4 เสมอ (1 ใบต่อหน้า A4 = วาดตรง ๆ ไม่ต้องย่อ)
         width, height = A4
-        margin = 30
+        margin = CARD_MARGIN
+        imposed = cards_per_page > 1 or page_size != DEFAULT_PAGE_SIZE
+        c = canvas.Canvas(stream, pagesize=PAGE_SIZES[page_size])
+        if glyphs is None:
+            glyphs = deck_glyphs([title, *(cell for card in cards_data for cell in card)])
+        prime_glyph_subset(c, pdfmetrics.getFont(self.font_name), glyphs)
         
         canvas_bg_color = HexColor(bg_color)
         canvas_text_color = HexColor(text_color)
@@ -109,77 +229,48 @@ class BingoEngine:
         
         card_width = (width - margin * 2) 
         cell_size = card_width / grid_size 
-        
-        for card_index, card in enumerate(cards_data):
-            # ... (Title, Logo, Card Index Drawing Unchanged) ...
-            c.setFillColor(canvas_text_color)
-            c.setFont(self.font_name, 30)
-            c.drawCentredString(width / 2, height - 40, title)
-            
-            if logo_file is not None:
-                try:
-                    logo_image = ImageReader(logo_file)
-                    logo_size = 50
-                    c.drawImage(logo_image, margin, height - 60, width=logo_size, height=logo_size)
-                except Exception as e:
-                    print(f"Error drawing logo: {e}")
-            
-            c.setFont(self.font_name, 12)
-            c.drawString(width - margin - 50, height - 55, f"Card {card_index + 1}")
 
-            # เริ่มวาดตาราง
-            start_y = height - 100
-            
-            for row in range(grid_size):
-                for col in range(grid_size):
-                    x = margin + (col * cell_size)
-                    y = start_y - (row * cell_size)
-                    
-                    word_idx = (row * grid_size) + col
-                    word = card[word_idx]
-                    
-                    # 1. วาดช่องพื้นหลัง
-                    cell_fill_color = canvas_bg_color
-                    if word == "FREE":
-                        cell_fill_color = canvas_free_color
-                        
-                    c.setFillColor(cell_fill_color)
-                    c.rect(x, y - cell_size, cell_size, cell_size, fill=1)
-                    
-                    # 2. วาดกรอบสี่เหลี่ยม
-                    c.setStrokeColor(canvas_text_color) 
-                    c.rect(x, y - cell_size, cell_size, cell_size, fill=0) 
-                    
-                    # 3. วาดข้อความ (พร้อม Text Wrapping)
-                    c.setFillColor(canvas_text_color)
-
-                    if str(word) != "FREE":
-                        # 💡 FIX: แก้ไขการเรียกฟังก์ชัน โดยเพิ่ม 'c' (canvas) เป็น Argument ตัวที่ 1
-                        lines, font_size = self._wrap_text_to_lines_fixed(c, str(word), self.font_name, cell_size)
-                        
-                        line_spacing = font_size + 2 
-                        total_text_height = len(lines) * line_spacing
-                        
-                        # คำนวณตำแหน่ง Y เพื่อจัดกึ่งกลางแนวตั้ง
-                        start_text_y = y - (cell_size / 2) + (total_text_height / 2) - font_size
-                        
-                        c.setFont(self.font_name, font_size)
-                        for line in lines:
-                            # drawCentredString สำหรับจัดกึ่งกลางแนวนอน
-                            c.drawCentredString(x + (cell_size / 2), start_text_y, line)
-                            start_text_y -= line_spacing # เลื่อนลงสำหรับบรรทัดถัดไป
-                    else:
-                        # Draw FREE space text (fixed size)
-                        c.setFont(self.font_name, 16)
-                        text_y = y - (cell_size / 2) - 5 
-                        c.setFillColor(canvas_text_color)
-                        c.drawCentredString(x + (cell_size / 2), text_y, str(word))
+        # ส่วนคงที่ของทุกหน้า: วาดครั้งเดียว แล้วเรียกใช้ด้วย doForm
+        template_name = "CardTemplate"
+        with metrics.span("pdf.template"):
+            self._draw_card_template(
+                c, template_name, title, grid_size, width, height, margin, cell_size,
+                canvas_bg_color, canvas_text_color, canvas_free_color,
+                logo_image=self._load_logo(logo_file),
+            )
+
+        if imposed:
+            # พื้นที่ที่ใช้จริงของการ์ด: ตั้งแต่ขอบล่างของตาราง (+ margin) ถึงขอบบนของหน้า A4
+            card_bottom = height - CARD_GRID_TOP - card_width - margin
+            slots = plan_slots((width, height - card_bottom), cards_per_page, page_size)
+            # เส้นตัดเหมือนกันทุกหน้า: เก็บเป็น Form เดียวเช่นกัน
+            c.beginForm("CutMarks")
+            c.setStrokeColor(black)
+            draw_cut_marks(c, slots)
+            c.endForm()
+        
+        for page_start in range(0, len(cards_data), cards_per_page):
+            page_started = time.perf_counter()
+            if imposed:
+                c.doForm("CutMarks")
+                for slot, card_index in zip(slots, range(page_start, min(page_start + cards_per_page, len(cards_data)))):
+                    c.saveState()
+                    c.translate(slot.x, slot.y)
+                    c.scale(slot.scale, slot.scale)
+                    c.translate(0, -card_bottom)
+                    self._draw_card(c, template_name, cards_data[card_index], start_index + card_index + 1, grid_size,
+                                    width, height, margin, cell_size, canvas_text_color)
+                    c.restoreState()
+            else:
+                self._draw_card(c, template_name, cards_data[page_start], start_index + page_start + 1, grid_size,
+                                width, height, margin, cell_size, canvas_text_color)
             
             c.showPage()
+            metrics.record_span("pdf.page", time.perf_counter() - page_started)
             
-        c.save()
-        buffer.seek(0)
-        return buffer.read()
+        metrics.incr("pdf.pages", -(-len(cards_data) // cards_per_page))
+        with metrics.span("pdf.save"):
+            c.save()
 
 
     # 💡 FIX 3: Text Wrapping Helper และปรับ spacing สำหรับ Caller Sheet
@@ -187,22 +278,8 @@ class BingoEngine:
         """Helper function สำหรับตัดข้อความใน Caller Sheet"""
         c.setFont(font_name, font_size)
         
-        words = text.split()
-        lines = []
-        current_line = ""
-        
-        # ต้องลงทะเบียนฟอนต์ทุกครั้ง (ป้องกันปัญหาของ reportlab)
-        pdfmetrics.registerFont(TTFont(font_name, self.font_path)) 
-        
-        for word in words:
-            test_line = (current_line + " " + word).strip()
-            if pdfmetrics.stringWidth(test_line, font_name, font_size) < max_width:
-                current_line = test_line
-            else:
-                lines.append(current_line)
-                current_line = word
-        if current_line:
-            lines.append(current_line)
+        # 💡 PERF: ใช้ Layout เดียวกับช่องบนการ์ด (ตัดคำไทยได้แม้ไม่มีช่องว่าง และดึงจากแคช)
+        lines = wrap_lines(text, font_name, font_size, max_width)
             
         line_spacing = font_size + 2
         current_y = y
@@ -214,17 +291,35 @@ class BingoEngine:
         return len(lines) * line_spacing # Return total height used
 
     # 💡 MODIFIED: ปรับปรุง Caller Sheet เพื่อป้องกันข้อความซ้อนทับและเพิ่ม Text Wrapping
-    def create_caller_sheet_pdf_bytes(self, qa_pairs: List[str], title: str) -> bytes:
+    def create_caller_sheet_pdf_bytes(self, qa_pairs: Union[Deck, Sequence[Union[str, QAPair]]], title: str,
+                                      call_order: Optional[Sequence[int]] = None, main_count: int = CARD_POOL_SIZE) -> bytes:
         """
-        สร้าง PDF ที่มีรายการคำถามและคำตอบทั้งหมด (จัดเรียงแบบสุ่ม) สำหรับผู้ดำเนินเกม 
+        สร้าง PDF ที่มีรายการคำถามและคำตอบทั้งหมด (จัดเรียงแบบสุ่ม หรือตาม call_order) สำหรับผู้ดำเนินเกม 
         """
         buffer = io.BytesIO()
-        c = canvas.Canvas(buffer, pagesize=A4)
+        self.write_caller_sheet_pdf(buffer, qa_pairs, title, call_order, main_count)
+        return buffer.getvalue()
+
+    def write_caller_sheet_pdf(self, stream: Any, qa_pairs: Union[Deck, Sequence[Union[str, QAPair]]], title: str,
+                               call_order: Optional[Sequence[int]] = None, main_count: int = CARD_POOL_SIZE) -> None:
+        """
+        เขียน PDF ชุดดำเนินเกมลง stream (อ็อบเจกต์ที่มีเมธอด write) call_order คือดัชนีคู่ใน Deck ตามลำดับที่จะเรียก
+        main_count รายการแรกคือคำถามหลัก (คำตอบอยู่บนการ์ด) ที่เหลือเป็นคำถามสำรอง
+        """
+        started = time.perf_counter()
+        c = canvas.Canvas(stream, pagesize=A4)
         width, height = A4
         margin = 72
         
-        caller_qa_pairs = qa_pairs.copy()
-        random.shuffle(caller_qa_pairs)
+        deck = Deck.coerce(qa_pairs)
+        if call_order is not None:
+            caller_qa_pairs = [deck[index] for index in call_order]
+        else:
+            caller_qa_pairs = list(deck)
+            random.shuffle(caller_qa_pairs)
+        # Subset ฟอนต์ขึ้นกับชุดตัวอักษรเท่านั้น ไม่ขึ้นกับลำดับคำถาม (ใช้แคช Subset ซ้ำได้)
+        prime_glyph_subset(c, pdfmetrics.getFont(self.font_name),
+                           deck_glyphs([title, *(pair.question for pair in deck), *(pair.answer for pair in deck)]))
 
         # --- ตั้งค่า Title ---
         c.setFillColor(black)
@@ -234,7 +329,11 @@ class BingoEngine:
         
         # เพิ่ม Note
         c.setFillColor(HexColor("#FF4500")) # Orange Red
-        c.drawString(margin, height - 100, f"รายการที่ 1-25 คือคำถามหลัก | รายการที่ 26-{len(qa_pairs)} คือคำถามสำรอง (สำหรับเกมยืดเยื้อ)")
+        main_count = min(main_count, len(caller_qa_pairs))
+        note = f"รายการที่ 1-{main_count} คือคำถามหลัก"
+        if main_count < len(caller_qa_pairs):
+            note += f" | รายการที่ {main_count + 1}-{len(caller_qa_pairs)} คือคำถามสำรอง (สำหรับเกมยืดเยื้อ)"
+        c.drawString(margin, height - 100, note)
         c.setFillColor(black) # รีเซ็ตสี
 
         # 💡 FIX: กำหนดความสูงที่ใช้สำหรับ 1 รายการ (item block) ให้มากขึ้น
@@ -268,14 +367,13 @@ class BingoEngine:
             current_x = margin + (col_index * col_width)
             current_y = start_y_content - (row_index * item_block_height)
             
-            # แยกคำถามและคำตอบ
-            question, _, answer = pair.partition(':')
-            question = question.strip()
-            answer = answer.strip() if answer else "[ไม่มีคำตอบ]"
+            # คำถามและคำตอบ (แยกไว้แล้วใน QAPair)
+            question = pair.question
+            answer = pair.answer or "[ไม่มีคำตอบ]"
             
-            # 💡 เพิ่มสีเตือนสำหรับคำถามสำรอง (รายการที่ 26 ขึ้นไป)
+            # 💡 เพิ่มสีเตือนสำหรับคำถามสำรอง (รายการหลัง main_count)
             item_number = i + 1
-            if item_number > 25:
+            if item_number > main_count:
                  c.setFillColor(HexColor("#FF4500")) # สีส้มแดง
             else:
                  c.setFillColor(black) # สีดำ
@@ -296,5 +394,4 @@ class BingoEngine:
             c.setFillColor(black) # รีเซ็ตสีสำหรับรายการถัดไป
             
         c.save()
-        buffer.seek(0)
-        return buffer.read()
\ No newline at end of file
+        metrics.record_span("caller_sheet.render", time.perf_counter() - started)
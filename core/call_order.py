@@ -0,0 +1,83 @@
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from core import metrics
+from core.simulator import CHUNK_CELL_BUDGET, NEVER_CALLED, CardSet
+
+# 💡 จำนวนลำดับการเรียกสุ่มที่ประเมินต่อรอบ (ประเมินพร้อมกันทั้ง Batch ด้วย Rank Tensor)
+CANDIDATE_BATCH_SIZE = 1024
+DEFAULT_CANDIDATES = 8192
+
+# จำนวนผู้ชนะแรก ๆ ที่พิจารณาเรื่อง "ชนะพร้อมกัน" (อยากให้ผู้ชนะแต่ละคนเกิดคนละข้อ)
+SPREAD_WINNERS = 5
+
+# น้ำหนักของบทลงโทษ: ผู้ชนะคนแรกนอกช่วง > ชนะพร้อมกันในข้อแรก > ผู้ชนะถัดมาชนะพร้อมกัน
+_WINDOW_WEIGHT = 100
+_FIRST_TIE_WEIGHT = 10
+
+
+class CallOrderResult(NamedTuple):
+    """
+    ลำดับการเรียกที่ดีที่สุดที่พบ (ดัชนีคู่ใน Deck) พร้อมข้อที่มีผู้ชนะคนแรก จำนวนผู้ชนะในข้อนั้น และคะแนน (0 = ตรงเงื่อนไขทั้งหมด)
+    main_count ข้อแรกของ order คือคู่ที่คำตอบอยู่บนการ์ด ที่เหลือเป็นคำถามสำรอง
+    """
+    order: List[int]
+    main_count: int
+    first_line_call: int
+    first_line_winners: int
+    score: int
+    candidates_evaluated: int
+
+
+def score_orders(first_line: np.ndarray, window: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    ให้คะแนนลำดับการเรียกจากข้อที่การ์ดแต่ละใบชนะเส้นแรก (ขนาด ลำดับ x การ์ด) ยิ่งน้อยยิ่งดี
+    คืน (คะแนน, ข้อที่มีผู้ชนะคนแรก, จำนวนผู้ชนะในข้อนั้น)
+    """
+    low, high = window
+    spread = min(SPREAD_WINNERS, first_line.shape[1])
+    earliest = np.sort(np.partition(first_line, spread - 1, axis=1)[:, :spread], axis=1)
+    first_call = earliest[:, 0].astype(np.int64)
+    first_winners = (first_line == first_call[:, None]).sum(axis=1)
+
+    outside = np.maximum(low - first_call, 0) + np.maximum(first_call - high, 0)
+    # ผู้ชนะ SPREAD_WINNERS คนแรกควรชนะคนละข้อ: นับคู่ที่อยู่ติดกันแล้วชนะในข้อเดียวกัน
+    ties = ((earliest[:, 1:] == earliest[:, :-1]) & (earliest[:, 1:] != NEVER_CALLED)).sum(axis=1)
+    score = _WINDOW_WEIGHT * outside + _FIRST_TIE_WEIGHT * (first_winners - 1) + ties
+    return score, first_call, first_winners
+
+
+def optimize_call_order(card_set: CardSet, window: Tuple[int, int], candidates: int = DEFAULT_CANDIDATES,
+                        seed: Optional[int] = None, time_budget: Optional[float] = None) -> CallOrderResult:
+    """
+    ค้นหาลำดับการเรียก (สุ่มสับหลายแบบแล้วประเมินทั้ง Batch) ที่ทำให้ผู้ชนะคนแรกเกิดในช่วงข้อ window (รวมปลาย)
+    และผู้ชนะแต่ละคนเกิดคนละข้อ หยุดทันทีเมื่อเจอลำดับที่ได้คะแนน 0 หรือครบ candidates / time_budget วินาที
+    สุ่มสับเฉพาะคู่ที่อยู่บนการ์ด แล้วต่อท้ายด้วยคำถามสำรอง (เหมือน matching_call_order) เพื่อให้ส่วนหลักของ Caller Sheet ถูกต้อง
+    """
+    rng = np.random.default_rng(seed)
+    on_cards = card_set.on_card_pairs()
+    spare = np.setdiff1d(np.arange(card_set.num_pairs), on_cards)
+    spare = rng.permutation(spare)
+    batch_size = max(1, min(CANDIDATE_BATCH_SIZE, CHUNK_CELL_BUDGET // max(1, card_set.card_ids.size)))
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+
+    best = None
+    evaluated = 0
+    started = time.perf_counter()
+    while evaluated < candidates:
+        size = min(batch_size, candidates - evaluated)
+        main = on_cards[np.argsort(rng.random((size, len(on_cards))), axis=1)]
+        orders = np.concatenate([main, np.broadcast_to(spare, (size, len(spare)))], axis=1)
+        score, first_call, first_winners = score_orders(card_set.evaluate_orders(orders), window)
+        evaluated += size
+
+        index = int(np.argmin(score))
+        if best is None or score[index] < best.score:
+            best = CallOrderResult(orders[index].tolist(), len(on_cards), int(first_call[index]), int(first_winners[index]), int(score[index]), evaluated)
+        if best.score == 0 or (deadline is not None and time.perf_counter() >= deadline):
+            break
+    metrics.record_span("call_order.optimize", time.perf_counter() - started)
+    metrics.incr("call_order.candidates", evaluated)
+    return best._replace(candidates_evaluated=evaluated)
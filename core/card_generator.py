@@ -0,0 +1,164 @@
+import math
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+# 💡 ค่าพิเศษในเมทริกซ์ดัชนีการ์ด: ช่อง FREE (กลางตารางขนาดคี่)
+FREE_INDEX = -1
+FREE_TEXT = "FREE"
+
+# จำนวนรอบสูงสุดที่สุ่มการ์ดที่ซ้ำใหม่ ก่อนสรุปว่าคลังคำเล็กเกินกว่าจะสร้างการ์ดไม่ซ้ำได้
+MAX_UNIQUE_ROUNDS = 64
+
+# คลังคำที่ใหญ่กว่าจำนวนช่องเกินเท่านี้ สุ่มแบบกระจายคำตอบเท่า ๆ กัน (Permutation Stream)
+# คลังที่เล็กกว่านี้ การ์ดแต่ละใบมีคำตอบ 1/4 ของคลังขึ้นไปอยู่แล้ว จำนวนใบต่อคำตอบจึงใกล้เคียงกันเองเมื่อสุ่มแยกทีละใบ
+BALANCED_POOL_FACTOR = 4
+
+
+class CardBatch(NamedTuple):
+    """การ์ดทั้งชุด (ข้อความ) พร้อมลำดับการเรียกที่เข้ากับการ์ด และจำนวนคู่แรกในลำดับที่อยู่บนการ์ด (คำถามหลัก)"""
+    cards: List[List[str]]
+    call_order: List[int]
+    main_count: int
+
+
+def _sample_rows(rng: np.random.Generator, rows: int, pool_size: int, cells: int) -> np.ndarray:
+    """สุ่มลำดับ cells ตัวที่ไม่ซ้ำกันจาก 0..pool_size-1 ให้ทุกแถวพร้อมกัน (argsort ของเลขสุ่ม = การสับไพ่ทั้งเมทริกซ์)"""
+    return np.argsort(rng.random((rows, pool_size)), axis=1)[:, :cells].astype(np.int32)
+
+
+def _balanced_rows(rng: np.random.Generator, rows: int, pool_size: int, cells: int) -> np.ndarray:
+    """
+    ต่อ Permutation สุ่มของ 0..pool_size-1 เป็นสายยาวแล้วตัดทีละ cells ตัวเป็นการ์ด 1 ใบ
+    ทุกคำตอบจึงอยู่บนการ์ดจำนวนใบต่างกันไม่เกิน 1 และใช้หน่วยความจำ O(rows * cells) ไม่ขึ้นกับขนาดคลังคำ
+    (ต้องการ pool_size >= 2 * cells เพื่อให้ซ่อมการ์ดที่คร่อมรอยต่อได้เสมอ)
+    """
+    total = rows * cells
+    num_permutations = -(-total // pool_size)
+    stream = np.argsort(rng.random((num_permutations, pool_size)), axis=1).astype(np.int32).ravel()
+    cards = stream[:total].reshape(rows, cells)
+
+    # การ์ดที่คร่อมรอยต่อ 2 Permutation อาจมีคำตอบซ้ำ: สลับตัวที่ซ้ำในส่วนหลังของใบ กับตัวใน Permutation เดียวกัน
+    # ที่อยู่บนการ์ดซึ่งอยู่ใน Permutation นั้นทั้งใบ หรือท้ายสายที่ไม่ได้ใช้ (จำนวนครั้งที่แต่ละคำตอบถูกใช้จึงแทบไม่เปลี่ยน)
+    sorted_cards = np.sort(cards, axis=1)
+    for row in np.flatnonzero((sorted_cards[:, 1:] == sorted_cards[:, :-1]).any(axis=1)):
+        start = row * cells
+        boundary = (start // pool_size + 1) * pool_size
+        front = set(stream[start:boundary].tolist())
+        next_boundary = boundary + pool_size
+        inner_end = next_boundary if next_boundary >= total else next_boundary // cells * cells
+        spares = (position for position in range(start + cells, inner_end) if int(stream[position]) not in front)
+        for position in range(boundary, start + cells):
+            if int(stream[position]) in front:
+                spare = next(spares)
+                stream[position], stream[spare] = stream[spare], stream[position]
+    return cards
+
+
+def _row_hashes(keys: np.ndarray, multipliers: np.ndarray) -> np.ndarray:
+    """Hash 64 บิตของแต่ละแถว (Polynomial hash แบบ wrap-around) ใช้ตรวจการ์ดซ้ำโดยไม่ต้องเทียบทีละแถว"""
+    return (keys.astype(np.uint64) * multipliers).sum(axis=1, dtype=np.uint64)
+
+
+def _duplicate_rows(hashes: np.ndarray) -> np.ndarray:
+    """ดัชนีแถวที่ Hash ซ้ำกับแถวก่อนหน้า (แถวแรกของแต่ละกลุ่มถือว่าไม่ซ้ำ)"""
+    _, first_index = np.unique(hashes, return_index=True)
+    is_duplicate = np.ones(len(hashes), dtype=bool)
+    is_duplicate[first_index] = False
+    return np.flatnonzero(is_duplicate)
+
+
+def generate_card_indices(card_texts: Sequence[str], num_cards: int, grid_size: int, seed: Optional[int] = None,
+                          unique: bool = False) -> np.ndarray:
+    """
+    สร้างการ์ดทั้งชุดในครั้งเดียว คืนเมทริกซ์ (num_cards, grid_size*grid_size) ของดัชนีใน card_texts
+    ช่องว่าง (คำไม่พอเต็มตาราง) มีดัชนี >= len(card_texts) และช่อง FREE มีค่า FREE_INDEX
+    unique=True รับประกันว่าไม่มีการ์ด 2 ใบที่ข้อความทุกช่องตรงกัน (ตรวจด้วย Hash แล้วสุ่มใบที่ซ้ำใหม่)
+    คลังคำขนาดใหญ่ (หลักพันคู่) สุ่มแบบกระจายให้แต่ละคำตอบอยู่บนการ์ดจำนวนใบใกล้เคียงกัน
+    """
+    rng = np.random.default_rng(seed)
+    total_cells = grid_size * grid_size
+    has_free = grid_size % 2 != 0
+    fill_cells = total_cells - 1 if has_free else total_cells
+    pool_size = max(len(card_texts), fill_cells)
+
+    if pool_size > BALANCED_POOL_FACTOR * fill_cells:
+        cards = _balanced_rows(rng, num_cards, pool_size, fill_cells)
+    else:
+        cards = _sample_rows(rng, num_cards, pool_size, fill_cells)
+
+    if unique and num_cards > 1:
+        # ข้อความซ้ำ (คำตอบเหมือนกัน) และช่องว่างทุกช่องต้องนับเป็นค่าเดียวกันตอนเทียบการ์ด
+        _, text_ids = np.unique(np.asarray(card_texts, dtype=object).astype(str), return_inverse=True)
+        key_of_index = np.full(pool_size, len(text_ids), dtype=np.int64)
+        key_of_index[:len(text_ids)] = text_ids
+        distinct_texts = int(text_ids.max(initial=-1)) + 1
+        if num_cards > math.perm(max(distinct_texts, fill_cells), min(distinct_texts, fill_cells)):
+            raise ValueError(f"คำตอบมีไม่พอสำหรับสร้างการ์ดที่ไม่ซ้ำกัน {num_cards} ใบ (ตาราง {grid_size}x{grid_size})")
+        multipliers = rng.integers(1, 2**63, size=fill_cells, dtype=np.uint64) | np.uint64(1)
+
+        hashes = _row_hashes(key_of_index[cards], multipliers)
+        duplicates = _duplicate_rows(hashes)
+        rounds = 0
+        while len(duplicates):
+            rounds += 1
+            if rounds > MAX_UNIQUE_ROUNDS:
+                raise ValueError(f"คำตอบมีไม่พอสำหรับสร้างการ์ดที่ไม่ซ้ำกัน {num_cards} ใบ (ตาราง {grid_size}x{grid_size})")
+            cards[duplicates] = _sample_rows(rng, len(duplicates), pool_size, fill_cells)
+            hashes[duplicates] = _row_hashes(key_of_index[cards[duplicates]], multipliers)
+            duplicates = _duplicate_rows(hashes)
+
+    if has_free:
+        center_index = total_cells // 2
+        cards = np.insert(cards, center_index, FREE_INDEX, axis=1)
+    return cards
+
+
+def cards_to_text(card_indices: np.ndarray, card_texts: Sequence[str]) -> list:
+    """แปลงเมทริกซ์ดัชนีการ์ดเป็นรายการข้อความ (List[List[str]]) ด้วย Fancy Indexing ครั้งเดียว"""
+    pool_size = int(card_indices.max(initial=0)) + 1
+    lookup = np.empty(max(pool_size, len(card_texts)) + 1, dtype=object)
+    lookup[:] = ""
+    lookup[:len(card_texts)] = list(card_texts)
+    lookup[FREE_INDEX] = FREE_TEXT
+    return lookup[card_indices].tolist()
+
+
+class AnswerIndex:
+    """
+    Index คำตอบ -> การ์ดที่มีคำตอบนั้น (CSR: เลขการ์ดเรียงตามดัชนีคำตอบ และช่วงของแต่ละคำตอบ)
+    ใช้หน่วยความจำเท่าจำนวนช่องที่มีคำตอบ ไม่ใช่ (คำตอบ x การ์ด)
+    """
+    __slots__ = ("cards", "bounds")
+
+    def __init__(self, card_indices: np.ndarray, num_answers: int):
+        cards, cells = np.nonzero((card_indices >= 0) & (card_indices < num_answers))
+        answers = card_indices[cards, cells]
+        order = np.argsort(answers, kind="stable")
+        self.cards = cards[order].astype(np.int32)
+        self.bounds = np.searchsorted(answers[order], np.arange(num_answers + 1))
+
+    def counts(self) -> np.ndarray:
+        """จำนวนการ์ดที่มีคำตอบแต่ละข้อ"""
+        return np.diff(self.bounds)
+
+    def num_used(self) -> int:
+        """จำนวนคำตอบที่อยู่บนการ์ดอย่างน้อย 1 ใบ"""
+        return int(np.count_nonzero(self.counts()))
+
+    def cards_with(self, answer: int) -> np.ndarray:
+        """เลขการ์ด (เริ่มที่ 0) ที่มีคำตอบ answer"""
+        return self.cards[self.bounds[answer]:self.bounds[answer + 1]]
+
+
+def matching_call_order(index: AnswerIndex, num_pairs: int, seed: Optional[int] = None) -> List[int]:
+    """
+    ลำดับการเรียกที่เข้ากับการ์ด: คู่ที่อยู่บนการ์ดอย่างน้อย 1 ใบก่อน (สุ่มลำดับ) ตามด้วยคู่ที่ไม่อยู่บนการ์ดใบไหนเลย
+    (ดัชนีคำตอบใน Index คือดัชนีคู่ใน Deck เพราะคลังคำเป็นส่วนต้นของ Deck)
+    """
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(num_pairs, dtype=np.int64)
+    answer_counts = index.counts()[:num_pairs]
+    counts[:len(answer_counts)] = answer_counts
+    on_cards, spare = np.flatnonzero(counts > 0), np.flatnonzero(counts == 0)
+    return np.concatenate([rng.permutation(on_cards), rng.permutation(spare)]).tolist()
@@ -0,0 +1,349 @@
+"""
+สร้างชุดบิงโกหลายชุดพร้อมกันแบบไม่ต้องเปิด Streamlit
+
+วิธีรัน (จากโฟลเดอร์หลักของโปรเจกต์):
+    python -m core.cli manifest.jsonl --output-dir out/ --workers 4
+
+Manifest เป็น JSONL (1 ชุดต่อบรรทัด) หรือ CSV (มีแถวหัวตาราง) ที่มีคอลัมน์:
+    title (จำเป็น), qa หรือ qa_file หรือ pairs (JSONL เท่านั้น) หรือ topic, num_cards, grid_size, seed,
+    bg_color, text_color, free_space_color, logo
+qa คือข้อความ 'คำถาม:คำตอบ' บรรทัดละคู่ (รูปแบบเดียวกับ Text Area), qa_file/logo เป็น path เทียบกับไฟล์ Manifest
+topic คือหัวข้อให้ AI สร้าง Q&A ให้ (ต้องมี GROQ_API_KEY) ทุกหัวข้อสร้างพร้อมกันในรอบเดียวภายใต้ขีดจำกัดคำขอ/Token
+(BINGO_LLM_RPM / BINGO_LLM_TPM) และหัวข้อที่เคยสร้างแล้วดึงจากแคช
+แถวที่ไม่ถูกต้องถูกรายงานเป็นชุดที่ล้มเหลว ชุดที่เหลือยังสร้างต่อตามปกติ (exit code 1 ถ้ามีชุดที่ล้มเหลว)
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import as_completed
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from core.bingo_engine import BingoEngine
+from core.call_order import optimize_call_order
+from core.export import write_bingo_set_zip
+from core.fonts import DEFAULT_FONT, FONT_CATALOG, resolve_font_path
+from core.imposition import CARDS_PER_PAGE_OPTIONS, DEFAULT_PAGE_SIZE, PAGE_SIZES
+from core.models import CARD_POOL_SIZE, Deck
+from core.process_pool import default_worker_count, get_default_process_pool
+from core.qa_cache import normalize_topic
+from core.qa_parser import parse_deck
+from core.simulator import CardSet
+
+DEFAULT_FONT_PATH = FONT_CATALOG[DEFAULT_FONT]
+
+# จำนวนคู่ Q&A ที่ขอจาก AI ต่อหัวข้อ (เท่ากับหน้าเว็บ: หลัก 25 + สำรอง 10)
+DEFAULT_QA_COUNT = 35
+
+# 💡 ค่าเริ่มต้นของแต่ละชุด (เหมือนค่าเริ่มต้นในหน้าเว็บ)
+SET_DEFAULTS = {
+    "num_cards": 30,
+    "grid_size": 5,
+    "seed": None,
+    "bg_color": "#FFFFFF",
+    "text_color": "#000000",
+    "free_space_color": "#F0F8FF",
+    "logo": None,
+    "cards_per_page": 1,
+    "page_size": DEFAULT_PAGE_SIZE,
+    "pool_size": CARD_POOL_SIZE,  # "all" = สุ่มการ์ดจากทุกคู่
+}
+
+_UNSAFE_FILENAME_REGEX = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+def _read_manifest_rows(manifest_path: str) -> List[Union[Dict[str, Any], ValueError]]:
+    """อ่าน Manifest (.jsonl หรือ .csv) เป็นรายการ dict ต่อชุด (บรรทัด JSON ที่อ่านไม่ได้เป็น ValueError ในตำแหน่งของชุดนั้น)"""
+    with open(manifest_path, encoding="utf-8-sig", newline="") as f:
+        if manifest_path.lower().endswith(".csv"):
+            return [row for row in csv.DictReader(f)]
+        rows: List[Union[Dict[str, Any], ValueError]] = []
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                rows.append(ValueError(f"บรรทัด {line_number}: JSON ไม่ถูกต้อง ({e})"))
+                continue
+            rows.append(row if isinstance(row, dict) else ValueError(f"บรรทัด {line_number}: ต้องเป็น JSON Object"))
+        return rows
+
+
+def _int_field(job: Dict[str, Any], key: str) -> None:
+    try:
+        job[key] = int(job[key])
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} ต้องเป็นจำนวนเต็ม (ได้ {job[key]!r})") from None
+
+
+def _load_job(row: Dict[str, Any], number: int, title: str, base_dir: str) -> Dict[str, Any]:
+    """ตรวจสอบ 1 แถวของ Manifest แล้วคืนงานที่มีค่าครบทุกช่อง (ValueError/OSError ถ้าแถวไม่ถูกต้อง)"""
+    if not title:
+        raise ValueError("ไม่มี title")
+
+    topic = None
+    if "pairs" in row:
+        deck = Deck(row["pairs"])
+    elif "qa_file" in row:
+        with open(os.path.join(base_dir, row["qa_file"]), encoding="utf-8") as qa_file:
+            deck = parse_deck(qa_file.read())
+    elif "qa" not in row and str(row.get("topic", "")).strip():
+        # ให้ AI สร้างทีหลัง (generate_topic_decks) ตรวจจำนวนคู่หลังสร้างเสร็จ
+        topic, deck = str(row["topic"]).strip(), None
+    else:
+        deck = parse_deck(str(row.get("qa", "")))
+
+    job = dict(SET_DEFAULTS)
+    job.update({key: row[key] for key in SET_DEFAULTS if key in row})
+    for key in ("num_cards", "grid_size", "cards_per_page"):
+        _int_field(job, key)
+    if job["seed"] is not None:
+        _int_field(job, "seed")
+    if str(job["pool_size"]).lower() == "all":
+        job["pool_size"] = None
+    else:
+        _int_field(job, "pool_size")
+    if job["logo"] is not None:
+        job["logo"] = os.path.join(base_dir, job["logo"])
+
+    if job["num_cards"] < 1:
+        raise ValueError("num_cards ต้องเป็นจำนวนเต็มบวก")
+    if job["grid_size"] not in (3, 4, 5):
+        raise ValueError("grid_size ต้องเป็น 3, 4 หรือ 5")
+    if job["cards_per_page"] not in CARDS_PER_PAGE_OPTIONS:
+        raise ValueError(f"cards_per_page ต้องเป็น {', '.join(map(str, CARDS_PER_PAGE_OPTIONS))}")
+    if job["page_size"] not in PAGE_SIZES:
+        raise ValueError(f"page_size ต้องเป็น {', '.join(PAGE_SIZES)}")
+    if job["pool_size"] is not None and job["pool_size"] < 1:
+        raise ValueError("pool_size ต้องเป็นจำนวนเต็มบวก หรือ \"all\"")
+    job.update(number=number, title=title, topic=topic, pairs=None)
+    if deck is not None:
+        _set_pairs(job, deck)
+    return job
+
+
+def load_manifest(manifest_path: str) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], str]]]:
+    """
+    อ่านและตรวจสอบ Manifest ทีละแถว คืน (งานที่ถูกต้องพร้อมค่าครบทุกช่อง, [(ชุด, ข้อความผิดพลาด)] ของแถวที่ไม่ถูกต้อง)
+    แถวที่ผิดไม่ทำให้ชุดอื่นหยุด (OSError/ValueError จากตัวไฟล์ Manifest เองยังโยนออกไปตามเดิม)
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    jobs, invalid = [], []
+    for number, row in enumerate(_read_manifest_rows(manifest_path), start=1):
+        if isinstance(row, ValueError):
+            invalid.append(({"number": number, "title": "-"}, str(row)))
+            continue
+        row = {key: value for key, value in row.items() if value not in (None, "")}
+        title = str(row.get("title", "")).strip()
+        try:
+            jobs.append(_load_job(row, number, title, base_dir))
+        except (OSError, ValueError) as e:
+            invalid.append(({"number": number, "title": title or "-"}, str(e)))
+    return jobs, invalid
+
+
+def _set_pairs(job: Dict[str, Any], deck: Deck) -> None:
+    min_pairs = job["grid_size"] * job["grid_size"]
+    if len(deck) < min_pairs:
+        raise ValueError(f"คู่คำถาม-คำตอบไม่พอ ต้องการอย่างน้อย {min_pairs} คู่ (มี {len(deck)} คู่)")
+    job["pairs"] = [tuple(pair) for pair in deck]
+
+
+def generate_topic_decks(jobs: List[Dict[str, Any]], count: int = DEFAULT_QA_COUNT, concurrency: Optional[int] = None,
+                         assistant: Any = None, log=print) -> List[Tuple[Dict[str, Any], str]]:
+    """
+    สร้าง Q&A ของทุกชุดที่กำหนด topic ด้วย AI ในรอบเดียว (AIAssistant.generate_batch) แล้วเติม pairs ให้แต่ละชุด
+    คืน [(งาน, ข้อความผิดพลาด)] ของชุดที่ได้คู่ไม่พอ (ชุดอื่นพร้อมส่งต่อให้ run_batch)
+    """
+    from core.ai_assistant import DEFAULT_BATCH_CONCURRENCY, AIAssistant
+
+    topic_jobs = [job for job in jobs if job["pairs"] is None]
+    if not topic_jobs:
+        return []
+    assistant = assistant or AIAssistant()
+    results = assistant.generate_batch([job["topic"] for job in topic_jobs], count,
+                                       concurrency=concurrency or DEFAULT_BATCH_CONCURRENCY)
+    by_topic = {normalize_topic(result.topic): result for result in results}
+
+    failures = []
+    for result in results:
+        source = "แคช" if result.cached else f"{result.requests} คำขอ, รอโควตา {result.rate_limit_wait:.2f}s"
+        log(f"🤖 {result.topic}: {len(result.pairs)} คู่ ({source}, รวม {result.seconds:.2f}s)")
+    for job in topic_jobs:
+        result = by_topic[normalize_topic(job["topic"])]
+        try:
+            _set_pairs(job, parse_deck("\n".join(result.pairs)))
+        except ValueError as e:
+            failures.append((job, f"{e}{f' ({result.error})' if result.error else ''}"))
+    return failures
+
+
+def _zip_file_name(title: str, used_names: set) -> str:
+    """ชื่อไฟล์ ZIP ของชุด (แบบเดียวกับหน้าเว็บ) ถ้าชื่อซ้ำเติมเลขต่อท้าย"""
+    base_name = f"{_UNSAFE_FILENAME_REGEX.sub('_', title).strip('_') or 'Bingo'}_Bingo_Set"
+    name = f"{base_name}.zip"
+    suffix = 2
+    while name in used_names:
+        name = f"{base_name}_{suffix}.zip"
+        suffix += 1
+    used_names.add(name)
+    return name
+
+
+def render_set(job: Dict[str, Any]) -> Dict[str, Any]:
+    """งานใน Worker: สร้างการ์ด (จัดลำดับ Caller Sheet ถ้ากำหนดช่วง) แล้วเขียน ZIP ของชุดเดียว คืนสถิติเวลา"""
+    started = time.perf_counter()
+    engine = BingoEngine(job["font_path"])
+    deck = Deck(job["pairs"])
+    card_batch = engine.generate_card_batch(deck, job["num_cards"], job["grid_size"], seed=job["seed"], unique=job["unique"],
+                                            pool_size=job["pool_size"])
+    cards_data = card_batch.cards
+    cards_seconds = time.perf_counter() - started
+
+    call_order, main_count = card_batch.call_order, card_batch.main_count
+    if job["window"] is not None:
+        # ลำดับที่จัดแล้วยังเรียกคู่บนการ์ดก่อนเสมอ ใช้ main_count จากผลลัพธ์เพื่อให้ส่วนหลัก/สำรองใน Caller Sheet ตรงกับการ์ด
+        result = optimize_call_order(CardSet(cards_data, deck, job["grid_size"]), job["window"], seed=job["seed"])
+        call_order, main_count = result.order, result.main_count
+
+    try:
+        write_bingo_set_zip(
+            job["output_path"], engine, cards_data, deck,
+            title=job["title"], grid_size=job["grid_size"],
+            bg_color=job["bg_color"], text_color=job["text_color"], free_space_color=job["free_space_color"],
+            logo_file=job["logo"], workers=1, call_order=call_order,
+            cards_per_page=job["cards_per_page"], page_size=job["page_size"], main_count=main_count
+        )
+    except Exception:
+        # ไม่ทิ้งไฟล์ ZIP ที่เขียนไม่ครบไว้ในโฟลเดอร์ปลายทาง
+        if os.path.exists(job["output_path"]):
+            os.remove(job["output_path"])
+        raise
+    return {
+        "number": job["number"],
+        "title": job["title"],
+        "output_path": job["output_path"],
+        "num_cards": job["num_cards"],
+        "cards_seconds": cards_seconds,
+        "total_seconds": time.perf_counter() - started,
+        "bytes": os.path.getsize(job["output_path"]),
+    }
+
+
+def run_batch(jobs: List[Dict[str, Any]], output_dir: str, font_path: str = DEFAULT_FONT_PATH, workers: Optional[int] = None,
+              unique: bool = True, window: Optional[Tuple[int, int]] = None, log=print) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], str]]]:
+    """
+    สร้างทุกชุดใน jobs ด้วย Process Pool ที่ใช้ร่วมกัน (1 ชุดต่อ Worker, ขนาดตาม workers ของการเรียกครั้งแรก) และเขียน ZIP ลง output_dir
+    คืน (ผลของชุดที่สำเร็จ, [(งาน, ข้อความผิดพลาด)] ของชุดที่ล้มเหลว)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    font_path = resolve_font_path(font_path)
+    used_names = set()
+    for job in jobs:
+        job.update(font_path=font_path, unique=unique, window=window,
+                   output_path=os.path.join(output_dir, _zip_file_name(job["title"], used_names)))
+
+    workers = min(workers or default_worker_count(), len(jobs)) or 1
+    results, failures = [], []
+
+    def report(job, result=None, error=None):
+        done = len(results) + len(failures)
+        if error is None:
+            log(f"[{done}/{len(jobs)}] ✅ {job['title']} -> {result['output_path']} "
+                f"({result['num_cards']} ใบ, การ์ด {result['cards_seconds']:.2f}s, รวม {result['total_seconds']:.2f}s)")
+        else:
+            log(f"[{done}/{len(jobs)}] ❌ {job['title']}: {error}")
+
+    if workers <= 1:
+        for job in jobs:
+            try:
+                results.append(render_set(job))
+                report(job, results[-1])
+            except Exception as e:
+                failures.append((job, str(e)))
+                report(job, error=e)
+        return results, failures
+
+    executor = get_default_process_pool(workers)
+    futures = {executor.submit(render_set, job): job for job in jobs}
+    for future in as_completed(futures):
+        job = futures[future]
+        try:
+            results.append(future.result())
+            report(job, results[-1])
+        except Exception as e:
+            failures.append((job, str(e)))
+            report(job, error=e)
+    results.sort(key=lambda result: result["number"])
+    return results, failures
+
+
+def _parse_window(value: str) -> Tuple[int, int]:
+    low, _, high = value.partition("-")
+    try:
+        window = (int(low), int(high or low))
+    except ValueError:
+        raise argparse.ArgumentTypeError("รูปแบบช่วงต้องเป็น LOW-HIGH เช่น 12-20")
+    if window[0] < 1 or window[0] > window[1]:
+        raise argparse.ArgumentTypeError("ช่วงข้อต้องเริ่มที่ 1 ขึ้นไป และ LOW <= HIGH")
+    return window
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m core.cli", description="สร้างชุดบิงโก (PDF ผู้เล่น + Caller Sheet) หลายชุดจาก Manifest",
+                                     epilog="แถวใน Manifest ที่ไม่ถูกต้อง (เช่น num_cards < 1, คู่ Q&A ไม่พอ) ถูกรายงานเป็นชุดที่ล้มเหลว "
+                                            "ชุดที่เหลือยังสร้างต่อตามปกติ จบด้วย exit code 1 ถ้ามีชุดที่ล้มเหลว "
+                                            "(2 ถ้าอ่านไฟล์ Manifest ไม่ได้เลย)")
+    parser.add_argument("manifest", help="ไฟล์ Manifest (.jsonl หรือ .csv)")
+    parser.add_argument("-o", "--output-dir", default="bingo_sets", help="โฟลเดอร์ปลายทางของไฟล์ ZIP (ค่าเริ่มต้น: bingo_sets)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="จำนวน Process (ค่าเริ่มต้น: BINGO_RENDER_WORKERS หรือจำนวน CPU)")
+    parser.add_argument("--font", default=DEFAULT_FONT,
+                        help=f"ชื่อฟอนต์ ({', '.join(FONT_CATALOG)}) หรือไฟล์ฟอนต์ .ttf (ค่าเริ่มต้น: {DEFAULT_FONT})")
+    parser.add_argument("--allow-duplicate-cards", action="store_true", help="ไม่ต้องรับประกันว่าการ์ดทุกใบไม่ซ้ำกัน")
+    parser.add_argument("--qa-count", type=int, default=DEFAULT_QA_COUNT,
+                        help=f"จำนวนคู่ Q&A ที่ขอจาก AI ต่อชุดที่กำหนด topic (ค่าเริ่มต้น: {DEFAULT_QA_COUNT})")
+    parser.add_argument("--ai-concurrency", type=int, default=None, help="จำนวนหัวข้อที่ให้ AI สร้างพร้อมกัน")
+    parser.add_argument("--first-winner-window", type=_parse_window, default=None, metavar="LOW-HIGH",
+                        help="จัดลำดับ Caller Sheet ให้ผู้ชนะคนแรกเกิดในช่วงข้อนี้ เช่น 12-20")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        jobs, invalid = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"อ่าน Manifest ไม่สำเร็จ: {e}", file=sys.stderr)
+        return 2
+    if not jobs and not invalid:
+        print("Manifest ไม่มีชุดบิงโก", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    try:
+        topic_failures = generate_topic_decks(jobs, args.qa_count, args.ai_concurrency)
+    except ValueError as e:
+        print(f"สร้าง Q&A ด้วย AI ไม่สำเร็จ: {e}", file=sys.stderr)
+        return 2
+    failed_numbers = {job["number"] for job, _ in topic_failures}
+    jobs = [job for job in jobs if job["number"] not in failed_numbers]
+
+    print(f"กำลังสร้าง {len(jobs)} ชุด ลงโฟลเดอร์ {args.output_dir} ...")
+    results, failures = run_batch(jobs, args.output_dir, font_path=args.font, workers=args.workers,
+                                  unique=not args.allow_duplicate_cards, window=args.first_winner_window)
+
+    elapsed = time.perf_counter() - started
+    total_cards = sum(result["num_cards"] for result in results)
+    failures = sorted(invalid + topic_failures + failures, key=lambda failure: failure[0]["number"])
+    print(f"เสร็จ {len(results)}/{len(jobs) + len(topic_failures) + len(invalid)} ชุด ({total_cards} ใบ) ใน {elapsed:.2f}s")
+    for job, error in failures:
+        print(f"  ล้มเหลว: ชุดที่ {job['number']} {job['title']}: {error}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
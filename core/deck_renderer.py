@@ -0,0 +1,143 @@
+import io
+import os
+import tempfile
+from typing import List, Any, Optional
+
+from pypdf import PdfReader, PdfWriter
+
+from core import metrics
+from core.bingo_engine import BingoEngine
+from core.fonts import deck_glyphs
+from core.imposition import DEFAULT_PAGE_SIZE
+from core.process_pool import default_worker_count, get_default_process_pool
+
+# 💡 จำนวนการ์ดต่อ 1 งานย่อย (Chunk) ที่ส่งให้ Worker แต่ละตัว
+DEFAULT_CHUNK_SIZE = 50
+
+# ชุดการ์ดที่เล็กกว่านี้เรนเดอร์แบบ Serial เร็วกว่า (ค่าเริ่มต้น Process Pool ไม่คุ้ม)
+PARALLEL_MIN_CARDS = 100
+# ชุดการ์ดที่ใหญ่กว่านี้เรนเดอร์แบบ Serial: ตอนรวมไฟล์ PdfWriter ถือทุกหน้าเป็นอ็อบเจกต์ Python (ราว 14 MB ต่อ 1,000 ใบ)
+# หน่วยความจำสูงสุดจึงโตเร็วกว่าเส้นทาง Serial ราวเท่าตัว ตั้งเพดานไว้ให้ RAM ของแต่ละงานมีขอบเขต
+PARALLEL_MAX_CARDS = int(os.environ.get("BINGO_PARALLEL_MAX_CARDS", 1000))
+
+
+def _read_logo_bytes(logo_file: Any) -> Optional[bytes]:
+    """อ่านไฟล์โลโก้เป็น bytes ครั้งเดียว เพื่อส่งข้าม Process ได้ (UploadedFile ส่งข้าม Process ไม่ได้)"""
+    if logo_file is None or isinstance(logo_file, (bytes, bytearray)):
+        return logo_file
+    if hasattr(logo_file, "getvalue"):
+        return logo_file.getvalue()
+    if hasattr(logo_file, "read"):
+        if hasattr(logo_file, "seek"):
+            logo_file.seek(0)
+        return logo_file.read()
+    with open(logo_file, "rb") as f:
+        return f.read()
+
+
+def _render_chunk(job: tuple) -> str:
+    """
+    งานใน Worker: เรนเดอร์การ์ดช่วงหนึ่งเป็น PDF ย่อยลงไฟล์ในโฟลเดอร์ชั่วคราว คืน path (Worker ใช้ซ้ำข้ามงาน ฟอนต์จึงถูกลงทะเบียนครั้งเดียวต่อ Worker)
+    ไม่ส่ง bytes กลับ: Process หลักไม่ต้องถือ PDF ย่อยทุกไฟล์ไว้ใน RAM พร้อมกันระหว่างรอรวม
+    """
+    font_path, start_index, cards, render_kwargs, spill_dir = job
+    engine = BingoEngine(font_path)
+    path = os.path.join(spill_dir, f"part-{start_index:08d}.pdf")
+    with open(path, "wb") as f:
+        engine.write_pdf(f, cards, start_index=start_index, **render_kwargs)
+    return path
+
+
+class _PositionTrackingWriter:
+    """ห่อ Stream ที่เขียนได้อย่างเดียว (เช่น Entry ใน ZIP) ให้มี tell() ตามที่ pypdf ต้องใช้"""
+
+    def __init__(self, stream: Any):
+        self._stream = stream
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._stream.write(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        if hasattr(self._stream, "flush"):
+            self._stream.flush()
+
+
+def merge_pdf_parts(parts: List[Any], stream: Any) -> None:
+    """
+    รวม PDF ย่อยหลายไฟล์ (bytes หรือ path เรียงตามลำดับ) แล้วเขียนเป็นไฟล์เดียวลง stream
+    อ็อบเจกต์ที่เหมือนกันทุก byte (Subset ฟอนต์, กรอบการ์ด, โลโก้ ที่ทุกไฟล์ย่อยฝังซ้ำ) ถูกเก็บไว้ชุดเดียว
+    (PdfWriter ยังถือหน้าทั้งหมดไว้ใน RAM จนเขียนเสร็จ: ประมาณขนาด PDF ที่ได้ เท่ากับเส้นทาง Serial ของ ReportLab)
+    """
+    writer = PdfWriter()
+    for part in parts:
+        if isinstance(part, (bytes, bytearray)):
+            writer.append(PdfReader(io.BytesIO(part)))
+        else:
+            # อ่านจากไฟล์ทีละไฟล์: หน้าถูกคัดลอกเข้า writer แล้วปิดไฟล์ทันที ไม่ค้างสำเนา bytes ของไฟล์ย่อย
+            with open(part, "rb") as f:
+                writer.append(PdfReader(f))
+    writer.compress_identical_objects()
+    writer.write(_PositionTrackingWriter(stream))
+
+
+def render_deck_pdf(engine: BingoEngine, cards_data: List[List[str]], title: str, grid_size: int, bg_color: str, text_color: str,
+                    free_space_color: str, logo_file: Any = None, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    cards_per_page: int = 1, page_size: str = DEFAULT_PAGE_SIZE) -> bytes:
+    """เรนเดอร์ PDF การ์ดผู้เล่นทั้งชุดเป็น bytes (ดู write_deck_pdf)"""
+    buffer = io.BytesIO()
+    write_deck_pdf(buffer, engine, cards_data, title, grid_size, bg_color, text_color, free_space_color, logo_file, workers, chunk_size,
+                   cards_per_page, page_size)
+    return buffer.getvalue()
+
+
+def write_deck_pdf(stream: Any, engine: BingoEngine, cards_data: List[List[str]], title: str, grid_size: int, bg_color: str, text_color: str,
+                   free_space_color: str, logo_file: Any = None, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   cards_per_page: int = 1, page_size: str = DEFAULT_PAGE_SIZE) -> None:
+    """
+    เรนเดอร์ PDF การ์ดผู้เล่นทั้งชุดลง stream โดยแบ่งการ์ดเป็นช่วง ๆ ให้ Process Pool เรนเดอร์พร้อมกัน แล้วรวมเป็นไฟล์เดียว
+    ถ้าชุดการ์ดเล็ก ใหญ่เกิน PARALLEL_MAX_CARDS หรือ workers=1 (ค่าเริ่มต้นบนเครื่อง 1 CPU) จะเรนเดอร์แบบ Serial ด้วย engine เดิม
+    งานขนานใช้ Process Pool ที่ใช้ร่วมกันทั้ง Process (core.process_pool) จำนวนงานที่รันพร้อมกันจึงไม่เกินขนาด Pool
+    (cards_per_page / page_size: จำนวนการ์ดต่อหน้าและขนาดกระดาษ ดู core.imposition)
+    """
+    workers = workers or default_worker_count()
+    render_kwargs = dict(
+        title=title,
+        grid_size=grid_size,
+        bg_color=bg_color,
+        text_color=text_color,
+        free_space_color=free_space_color,
+        logo_file=_read_logo_bytes(logo_file),
+        # ทุกช่วงใช้ชุดตัวอักษรของทั้งชุด: Subset ฟอนต์เหมือนกันทุกไฟล์ย่อย จึงตัดซ้ำตอนรวมได้
+        glyphs=deck_glyphs([title, *(cell for card in cards_data for cell in card)]),
+        cards_per_page=cards_per_page,
+        page_size=page_size,
+    )
+
+    if workers <= 1 or not PARALLEL_MIN_CARDS <= len(cards_data) <= PARALLEL_MAX_CARDS:
+        engine.write_pdf(stream, cards_data, **render_kwargs)
+        return
+
+    # แต่ละช่วงต้องเต็มหน้าพอดี ไม่เช่นนั้นจะมีหน้าที่การ์ดไม่ครบอยู่กลางไฟล์
+    chunk_size = -(-chunk_size // cards_per_page) * cards_per_page
+    # PDF ย่อยเขียนลงดิสก์ (ลบทั้งโฟลเดอร์เมื่อรวมเสร็จหรือเกิด Error)
+    with tempfile.TemporaryDirectory(prefix="bingo-pdf-") as spill_dir:
+        jobs = [
+            (engine.font_path, start, cards_data[start:start + chunk_size], render_kwargs, spill_dir)
+            for start in range(0, len(cards_data), chunk_size)
+        ]
+
+        # สถิติรายหน้าถูกบันทึกใน Worker: ฝั่งนี้บันทึกเวลารวม จำนวนหน้า และขนาดไฟล์ย่อยแทน
+        with metrics.span("pdf.parallel_render"):
+            parts = list(get_default_process_pool().map(_render_chunk, jobs))
+        metrics.incr("pdf.parallel_chunks", len(parts))
+        metrics.incr("pdf.pages", -(-len(cards_data) // cards_per_page))
+        metrics.incr("pdf.bytes", sum(os.path.getsize(part) for part in parts))
+
+        with metrics.span("pdf.merge"):
+            merge_pdf_parts(parts, stream)
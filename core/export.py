@@ -0,0 +1,147 @@
+import os
+import zipfile
+from typing import List, Any, Callable, Optional, Iterator, Sequence, Union
+
+from core import metrics
+from core.artifact_cache import ArtifactCache, artifact_key, file_fingerprint
+from core.bingo_engine import BingoEngine
+from core.models import CARD_POOL_SIZE, Deck, QAPair
+from core.deck_renderer import _read_logo_bytes, write_deck_pdf
+from core.imposition import DEFAULT_PAGE_SIZE
+
+# 💡 ขนาด Chunk ที่ส่งออกจาก iter_bingo_set_zip (64 KiB)
+ZIP_CHUNK_SIZE = 64 * 1024
+
+PLAYER_PDF_NAME = "Player_Cards_{num_cards}p.pdf"
+CALLER_PDF_NAME = "Caller_Sheet_QnA.pdf"
+
+
+class _ChunkSink:
+    """ปลายทางของ ZipFile แบบเขียนอย่างเดียว: เก็บข้อมูลที่ถูกเขียนไว้จนกว่าจะถูกดึงออกเป็น Chunk"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self, chunk_size: int = ZIP_CHUNK_SIZE) -> Iterator[bytes]:
+        """ดึงข้อมูลที่ค้างอยู่ออกมาเป็น Chunk แล้วล้าง Buffer ทิ้ง"""
+        pending = b"".join(self._chunks)
+        self._chunks = []
+        for start in range(0, len(pending), chunk_size):
+            yield pending[start:start + chunk_size]
+
+
+def _target_size(target: Any) -> Optional[int]:
+    """ตำแหน่งปัจจุบันของไฟล์ปลายทาง (หรือขนาดไฟล์ถ้าเป็น path) ใช้นับจำนวน bytes ที่เขียน (None = วัดไม่ได้)"""
+    try:
+        if hasattr(target, "tell"):
+            return target.tell()
+        return os.path.getsize(target)
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def _write_entries(zip_file: zipfile.ZipFile, engine: BingoEngine, cards_data: List[List[str]], qa_pairs: Union[Deck, Sequence[QAPair]], title: str,
+                   grid_size: int, bg_color: str, text_color: str, free_space_color: str, logo_file: Any, workers: Optional[int],
+                   call_order: Optional[Sequence[int]] = None, cards_per_page: int = 1, page_size: str = DEFAULT_PAGE_SIZE,
+                   main_count: int = CARD_POOL_SIZE) -> Iterator[None]:
+    """เขียน PDF ผู้เล่นและ Caller Sheet ลง Entry ของ ZIP โดยตรง (yield หลังเขียนเสร็จแต่ละไฟล์)"""
+    player_pdf_name = PLAYER_PDF_NAME.format(num_cards=len(cards_data))
+    with metrics.span("zip.player_pdf"), zip_file.open(player_pdf_name, "w") as entry:
+        write_deck_pdf(entry, engine, cards_data, title, grid_size, bg_color, text_color, free_space_color, logo_file, workers,
+                       cards_per_page=cards_per_page, page_size=page_size)
+    yield
+
+    with metrics.span("zip.caller_sheet"), zip_file.open(CALLER_PDF_NAME, "w") as entry:
+        engine.write_caller_sheet_pdf(entry, qa_pairs, title, call_order, main_count)
+    yield
+
+
+def write_bingo_set_zip(target: Any, engine: BingoEngine, cards_data: List[List[str]], qa_pairs: Union[Deck, Sequence[QAPair]], title: str, grid_size: int,
+                        bg_color: str, text_color: str, free_space_color: str, logo_file: Any = None, workers: Optional[int] = None,
+                        call_order: Optional[Sequence[int]] = None, cards_per_page: int = 1, page_size: str = DEFAULT_PAGE_SIZE,
+                        main_count: int = CARD_POOL_SIZE) -> None:
+    """
+    เขียนชุดบิงโก (PDF ผู้เล่น + Caller Sheet) ลง ZIP ปลายทางโดยตรง (call_order กำหนดลำดับคำถามใน Caller Sheet
+    และ main_count คือจำนวนคำถามหลักในลำดับนั้น)
+    cards_per_page / page_size กำหนดจำนวนการ์ดต่อหน้าและขนาดกระดาษของ PDF ผู้เล่น
+    target เป็น path หรือไฟล์ที่เปิดแบบ binary ก็ได้ ไม่มีการคัดลอก PDF ทั้งไฟล์เป็น bytes ระหว่างทาง
+    """
+    # path ถูกเขียนทับตั้งแต่ต้น ส่วนไฟล์ที่เปิดไว้แล้วอาจมีข้อมูลอื่นอยู่ก่อนตำแหน่งปัจจุบัน
+    start_position = _target_size(target) if hasattr(target, "tell") else 0
+    with metrics.span("zip.total"):
+        with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for _ in _write_entries(zip_file, engine, cards_data, qa_pairs, title, grid_size, bg_color, text_color, free_space_color, logo_file, workers, call_order,
+                                    cards_per_page, page_size, main_count):
+                pass
+    end_position = _target_size(target)
+    if start_position is not None and end_position is not None:
+        metrics.incr("zip.bytes", end_position - start_position)
+
+
+def iter_bingo_set_zip(engine: BingoEngine, cards_data: List[List[str]], qa_pairs: Union[Deck, Sequence[QAPair]], title: str, grid_size: int,
+                       bg_color: str, text_color: str, free_space_color: str, logo_file: Any = None, workers: Optional[int] = None,
+                       chunk_size: int = ZIP_CHUNK_SIZE, call_order: Optional[Sequence[int]] = None, cards_per_page: int = 1,
+                       page_size: str = DEFAULT_PAGE_SIZE, main_count: int = CARD_POOL_SIZE) -> Iterator[bytes]:
+    """
+    สร้างชุดบิงโกเป็น ZIP แบบ Streaming: คืน Chunk ของ ZIP ทันทีที่แต่ละไฟล์เขียนเสร็จ
+    เหมาะกับการส่งต่อเป็น HTTP Response หรือเขียนลงไฟล์ทีละส่วน
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for _ in _write_entries(zip_file, engine, cards_data, qa_pairs, title, grid_size, bg_color, text_color, free_space_color, logo_file, workers, call_order,
+                                cards_per_page, page_size, main_count):
+            yield from sink.drain(chunk_size)
+    # Central Directory ของ ZIP ถูกเขียนตอนปิดไฟล์
+    yield from sink.drain(chunk_size)
+    metrics.incr("zip.bytes", sink.tell())
+
+
+def cached_bingo_set_zip(cache: ArtifactCache, engine: BingoEngine, cards_data: List[List[str]], qa_pairs: Union[Deck, Sequence[QAPair]], title: str,
+                         grid_size: int, bg_color: str, text_color: str, free_space_color: str, call_order: Sequence[int], logo_file: Any = None,
+                         workers: Optional[int] = None, cards_per_page: int = 1, page_size: str = DEFAULT_PAGE_SIZE,
+                         main_count: int = CARD_POOL_SIZE, progress: Optional[Callable[[str], None]] = None) -> str:
+    """
+    คืน path ของ ZIP ชุดบิงโกในแคช (เรนเดอร์ใหม่เฉพาะเมื่อยังไม่มี ZIP ของเนื้อหานี้)
+    แคชเก็บเฉพาะ ZIP 1 ไฟล์ต่อชุด: PDF ถูกเขียนลง Entry ของ ZIP โดยตรง (ไม่เก็บ PDF ซ้ำอีกชุด)
+    และไม่มีไฟล์อื่นของชุดที่ต้องอยู่รอดระหว่างเขียน (Eviction จากงานอื่นที่ใช้แคชร่วมกันจึงลบไฟล์กลางทางไม่ได้)
+    Key ขึ้นกับทุกอย่างที่มีผลต่อ PDF ทั้งสองไฟล์ (call_order ต้องกำหนดเสมอ เพื่อให้ผลลัพธ์ซ้ำได้)
+    progress(ข้อความ) ถูกเรียกก่อนเรนเดอร์แต่ละไฟล์ (Exception จาก progress จะหยุดงาน และไม่มี ZIP ที่ไม่ครบค้างในแคช)
+    """
+    report = progress or (lambda message: None)
+    logo_bytes = _read_logo_bytes(logo_file)
+    # ฟอนต์ที่โหลดไม่ได้ (Fallback เป็น Helvetica) ใช้ชื่อฟอนต์แทน Hash ของไฟล์
+    font = file_fingerprint(engine.font_path) if os.path.exists(engine.font_path) else engine.font_name
+    pairs = [(pair.question, pair.answer) for pair in qa_pairs]
+    player_key = artifact_key("player", cards_data, title, grid_size, bg_color, text_color, free_space_color, logo_bytes, font,
+                              cards_per_page, page_size)
+    caller_key = artifact_key("caller", [pairs[index] for index in call_order], title, font, main_count)
+    zip_key = artifact_key("zip", player_key, caller_key, len(cards_data))
+
+    zip_path = cache.get(zip_key, "set.zip")
+    if zip_path is not None:
+        return zip_path
+
+    report(f"กำลังสร้าง PDF การ์ดผู้เล่น {len(cards_data)} ใบ...")
+    with metrics.span("zip.total"), cache.writer(zip_key, "set.zip") as f:
+        with zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            entries = _write_entries(zip_file, engine, cards_data, qa_pairs, title, grid_size, bg_color, text_color, free_space_color,
+                                     logo_bytes, workers, call_order, cards_per_page, page_size, main_count)
+            next(entries)
+            report("กำลังสร้าง Caller Sheet...")
+            for _ in entries:
+                pass
+        # วัดขนาดจากไฟล์ที่เปิดอยู่ (ไฟล์ในแคชอาจถูกงานอื่น Evict ไปแล้วทันทีที่เขียนเสร็จ)
+        metrics.incr("zip.bytes", f.tell())
+    return cache.path(zip_key, "set.zip")
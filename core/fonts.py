@@ -0,0 +1,80 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from core import metrics
+
+# 💡 ฟอนต์ไทยที่มากับโปรเจกต์ (ชื่อที่แสดงในแอป/CLI -> ไฟล์ TTF)
+FONT_DIR = "assets/fonts"
+FONT_CATALOG: Dict[str, str] = {
+    "TH Niramit AS": os.path.join(FONT_DIR, "TH Niramit AS.ttf"),
+    "TH Sarabun": os.path.join(FONT_DIR, "THSarabun.ttf"),
+}
+DEFAULT_FONT = "TH Niramit AS"
+
+# จำนวน Subset ของฟอนต์ (ต่อชุดตัวอักษร) ที่เก็บไว้ใน Process
+SUBSET_CACHE_SIZE = 64
+
+
+def available_fonts() -> List[str]:
+    """ชื่อฟอนต์ใน FONT_CATALOG ที่มีไฟล์อยู่จริง (ฟอนต์เริ่มต้นอยู่ลำดับแรก)"""
+    names = [name for name, path in FONT_CATALOG.items() if os.path.exists(path)]
+    return sorted(names, key=lambda name: name != DEFAULT_FONT)
+
+
+def resolve_font_path(font: str) -> str:
+    """รับชื่อฟอนต์ใน FONT_CATALOG หรือ path ของไฟล์ .ttf แล้วคืน path"""
+    return FONT_CATALOG.get(font, font)
+
+
+def deck_glyphs(texts: Iterable[str]) -> str:
+    """ตัวอักษรที่ไม่ใช่ ASCII ทั้งหมดในข้อความ เรียงตาม Code Point (ASCII อยู่ใน Subset แรกของ reportlab เสมอ)"""
+    chars = set()
+    for text in texts:
+        chars.update(text)
+    return "".join(sorted(char for char in chars if ord(char) > 127))
+
+
+def prime_glyph_subset(c: Any, font: Any, glyphs: str) -> None:
+    """
+    จองรหัสตัวอักษรใน Subset ของฟอนต์ตามลำดับ glyphs ก่อนวาดจริง
+    ทำให้เอกสารที่ใช้ชุดตัวอักษรเดียวกันได้ Subset ที่เหมือนกันทุก byte ไม่ว่าจะวาดข้อความใดก่อน
+    (PDF ย่อยที่เรนเดอร์ขนานกันจึงรวมแล้วตัดฟอนต์ซ้ำทิ้งได้ และดึง Subset จากแคชได้)
+    """
+    if glyphs and hasattr(font, "splitString"):
+        font.splitString(glyphs, c._doc)
+
+
+class _SubsetCache:
+    """แคชผล makeSubset ของฟอนต์ 1 ไฟล์ ตามชุดตัวอักษรของ Subset (LRU, Thread-safe)"""
+
+    def __init__(self, make_subset: Any, max_entries: int = SUBSET_CACHE_SIZE):
+        self._make_subset = make_subset
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, ...], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, subset: List[int]) -> bytes:
+        key = tuple(subset)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                metrics.incr("font.subset_cache_hits")
+                return data
+
+        with metrics.span("font.subset"):
+            data = self._make_subset(subset)
+        with self._lock:
+            self._entries[key] = data
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+
+def install_subset_cache(font: Any) -> None:
+    """ให้ TTFont ของ reportlab ใช้ Subset จากแคชแทนการสร้างใหม่ทุกเอกสาร (reportlab ฝังเฉพาะตัวอักษรที่ใช้อยู่แล้ว)"""
+    face = getattr(font, "face", None)
+    if face is not None and not isinstance(getattr(face, "makeSubset", None), _SubsetCache):
+        face.makeSubset = _SubsetCache(face.makeSubset)
@@ -0,0 +1,149 @@
+import threading
+import time
+import uuid
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from core.models import Deck, QAPair
+from core.simulator import BLANK_CELL_ID, FREE_CELL_ID, CardSet, winning_line_masks
+
+# 💡 จำนวนเกมที่เก็บไว้พร้อมกันในหน่วยความจำ (เกินแล้วลบเกมที่สร้างก่อนสุดทิ้ง)
+MAX_SESSIONS = 32
+
+_SESSIONS: Dict[str, "GameSession"] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+class CallResult(NamedTuple):
+    """ผลของการเรียก 1 ข้อ: ลำดับข้อ, คู่ที่เรียก, การ์ดที่เพิ่งได้บิงโก (เส้นแรก) และการ์ดที่เพิ่งเต็มใบ (เลขการ์ดเริ่มที่ 0)"""
+    call_number: int
+    pair: QAPair
+    line_winners: List[int]
+    full_card_winners: List[int]
+
+
+class GameSession:
+    """
+    เกมที่กำลังเล่นอยู่ 1 เกม: เก็บ Index จากคำตอบ -> (การ์ด, ช่อง) และตัวนับช่องที่ขีดแล้วต่อเส้นของทุกการ์ด
+    การเรียกแต่ละข้ออัปเดตเฉพาะการ์ดที่มีคำตอบนั้น (O(การ์ดที่ได้รับผลกระทบ)) ไม่ต้องสแกนการ์ดทั้งหมดใหม่
+    """
+
+    def __init__(self, cards_data: Sequence[Sequence[str]], qa_pairs: Union[Deck, Sequence[Union[str, QAPair]]], grid_size: int,
+                 call_order: Optional[Sequence[int]] = None):
+        self.session_id = uuid.uuid4().hex
+        self.created_at = time.time()
+        self.deck = Deck.coerce(qa_pairs)
+        self.grid_size = grid_size
+        self.cards_data = cards_data
+        self.call_order = list(call_order) if call_order is not None else list(range(len(self.deck)))
+        self._lock = threading.Lock()
+
+        card_set = CardSet(cards_data, self.deck, grid_size)
+        self._pair_text_ids = card_set.pair_text_ids
+        card_ids = card_set.card_ids
+        num_cards, num_cells = card_ids.shape
+        self.num_cards = num_cards
+
+        # Index: เรียงตำแหน่ง (การ์ด, ช่อง) ตามรหัสคำตอบ แล้วเก็บช่วงของแต่ละคำตอบ (CSR)
+        flat_ids = card_ids.ravel()
+        positions = np.argsort(flat_ids, kind="stable")
+        sorted_ids = flat_ids[positions]
+        self._index_positions = positions.astype(np.int64)
+        self._index_bounds = np.searchsorted(sorted_ids, np.arange(card_set.num_texts + 1))
+
+        # ตารางช่อง -> เส้นที่ผ่านช่องนั้น (เติมด้วยเส้นหลอกคอลัมน์สุดท้ายให้ทุกช่องยาวเท่ากัน)
+        masks = winning_line_masks(grid_size)
+        self._num_lines = len(masks)
+        cell_lines = [[line for line, mask in enumerate(masks) if mask >> cell & 1] for cell in range(num_cells)]
+        width = max(len(lines) for lines in cell_lines)
+        self._cell_lines = np.array([lines + [self._num_lines] * (width - len(lines)) for lines in cell_lines], dtype=np.int64)
+
+        # ตัวนับช่องที่ขีดแล้วต่อเส้น (เริ่มจากช่อง FREE) และจำนวนช่องที่ขีดแล้วต่อการ์ด
+        self._line_counts = np.zeros((num_cards, self._num_lines + 1), dtype=np.int16)
+        free_cards, free_cells = np.nonzero(card_ids == FREE_CELL_ID)
+        np.add.at(self._line_counts, (free_cards[:, None], self._cell_lines[free_cells]), 1)
+        self._marked_counts = np.bincount(free_cards, minlength=num_cards).astype(np.int16)
+        self._markable_cells = (card_ids != BLANK_CELL_ID).sum(axis=1)
+        self._has_blank = self._markable_cells < num_cells
+        self._marked = card_ids == FREE_CELL_ID
+
+        self.called: List[int] = []
+        self._called_texts = set()
+        self.line_winners: List[CallResult] = []
+        self._has_line = np.zeros(num_cards, dtype=bool)
+        self._has_full = np.zeros(num_cards, dtype=bool)
+
+    @property
+    def next_pair_index(self) -> Optional[int]:
+        """คู่ถัดไปตามลำดับการเรียก (None = เรียกครบแล้ว)"""
+        called = set(self.called)
+        for pair_index in self.call_order:
+            if pair_index not in called:
+                return pair_index
+        return None
+
+    def call_next(self) -> Optional[CallResult]:
+        """เรียกคู่ถัดไปตามลำดับใน Caller Sheet"""
+        pair_index = self.next_pair_index
+        return None if pair_index is None else self.call(pair_index)
+
+    def call(self, pair_index: int) -> CallResult:
+        """ขีดคำตอบของคู่ที่ pair_index บนทุกการ์ด แล้วคืนการ์ดที่เพิ่งชนะจากการเรียกครั้งนี้"""
+        with self._lock:
+            self.called.append(pair_index)
+            call_number = len(self.called)
+            pair = self.deck[pair_index]
+            text_id = int(self._pair_text_ids[pair_index])
+            if text_id in self._called_texts:
+                return CallResult(call_number, pair, [], [])
+            self._called_texts.add(text_id)
+
+            positions = self._index_positions[self._index_bounds[text_id]:self._index_bounds[text_id + 1]]
+            cards, cells = np.divmod(positions, self._marked.shape[1])
+            self._marked[cards, cells] = True
+
+            lines = self._cell_lines[cells]
+            np.add.at(self._line_counts, (cards[:, None], lines), 1)
+            np.add.at(self._marked_counts, cards, 1)
+
+            completed = (self._line_counts[cards[:, None], lines] == self.grid_size) & (lines != self._num_lines)
+            line_winners = np.unique(cards[completed.any(axis=1) & ~self._has_line[cards]])
+            self._has_line[line_winners] = True
+
+            full = (self._marked_counts[cards] == self._markable_cells[cards]) & ~self._has_blank[cards] & ~self._has_full[cards]
+            full_winners = np.unique(cards[full])
+            self._has_full[full_winners] = True
+
+            result = CallResult(call_number, pair, line_winners.tolist(), full_winners.tolist())
+            if result.line_winners:
+                self.line_winners.append(result)
+            return result
+
+    def card_marks(self, card_index: int) -> List[bool]:
+        """สถานะขีดแล้ว/ยังไม่ขีดของทุกช่องบนการ์ด card_index (ใช้ตรวจการ์ดที่ผู้เล่นยกมือ)"""
+        return self._marked[card_index].tolist()
+
+    def has_bingo(self, card_index: int) -> bool:
+        return bool(self._has_line[card_index])
+
+
+def create_session(cards_data: Sequence[Sequence[str]], qa_pairs: Union[Deck, Sequence[Union[str, QAPair]]], grid_size: int,
+                   call_order: Optional[Sequence[int]] = None) -> GameSession:
+    """สร้างเกมใหม่แล้วเก็บไว้ใน Store ของ Process (ดึงกลับด้วย session_id ได้ข้ามรอบรันของ Streamlit)"""
+    session = GameSession(cards_data, qa_pairs, grid_size, call_order)
+    with _SESSIONS_LOCK:
+        _SESSIONS[session.session_id] = session
+        while len(_SESSIONS) > MAX_SESSIONS:
+            del _SESSIONS[next(iter(_SESSIONS))]
+    return session
+
+
+def get_session(session_id: Optional[str]) -> Optional[GameSession]:
+    with _SESSIONS_LOCK:
+        return _SESSIONS.get(session_id)
+
+
+def end_session(session_id: str) -> None:
+    with _SESSIONS_LOCK:
+        _SESSIONS.pop(session_id, None)
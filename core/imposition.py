@@ -0,0 +1,70 @@
+from typing import Dict, List, NamedTuple, Tuple
+
+from reportlab.lib.pagesizes import A3, A4, letter
+
+# 💡 การจัดหน้า (Imposition): วางการ์ดหลายใบต่อแผ่นเพื่อประหยัดกระดาษและเวลาพิมพ์
+# การ์ดทุกใบยังออกแบบบนพื้นที่ A4 เดิม แล้วย่อ/ขยายทั้งใบเท่ากัน (ตัวอักษรทุกใบจึงขนาดเท่ากันเสมอ)
+PAGE_SIZES: Dict[str, Tuple[float, float]] = {"A4": A4, "A3": A3, "Letter": letter}
+DEFAULT_PAGE_SIZE = "A4"
+CARDS_PER_PAGE_OPTIONS = (1, 2, 4, 6, 9)
+
+SHEET_MARGIN = 18  # ขอบกระดาษที่เครื่องพิมพ์ส่วนใหญ่พิมพ์ไม่ถึง
+GUTTER = 18  # ระยะห่างระหว่างการ์ด (ที่วางเส้นตัด)
+CUT_MARK_LENGTH = 8
+CUT_MARK_OFFSET = 3  # เว้นระยะเส้นตัดจากขอบการ์ด
+
+
+class Slot(NamedTuple):
+    """ตำแหน่งการ์ด 1 ใบบนแผ่น: มุมล่างซ้าย (x, y), อัตราย่อ scale และขนาดจริงบนแผ่นหลังย่อ"""
+    x: float
+    y: float
+    scale: float
+    width: float
+    height: float
+
+
+def _grid_options(cards_per_page: int) -> List[Tuple[int, int]]:
+    return [(cols, cards_per_page // cols) for cols in range(1, cards_per_page + 1) if cards_per_page % cols == 0]
+
+
+def plan_slots(card_box: Tuple[float, float], cards_per_page: int, page_size: str = DEFAULT_PAGE_SIZE) -> List[Slot]:
+    """
+    แบ่งแผ่นเป็นตาราง (คอลัมน์ x แถว) ที่ทำให้การ์ดขนาด card_box ใหญ่ที่สุด แล้วคืนตำแหน่งเรียงจากซ้ายบนไปขวาล่าง
+    การ์ดทุกช่องใช้อัตราย่อเดียวกัน และชิดกึ่งกลางช่อง
+    """
+    if cards_per_page not in CARDS_PER_PAGE_OPTIONS:
+        raise ValueError(f"จำนวนการ์ดต่อหน้าต้องเป็น {', '.join(map(str, CARDS_PER_PAGE_OPTIONS))} (ได้ {cards_per_page})")
+    if page_size not in PAGE_SIZES:
+        raise ValueError(f"ขนาดกระดาษต้องเป็น {', '.join(PAGE_SIZES)} (ได้ {page_size})")
+
+    page_width, page_height = PAGE_SIZES[page_size]
+    card_width, card_height = card_box
+
+    def layout(cols: int, rows: int) -> Tuple[float, float, float]:
+        slot_width = (page_width - 2 * SHEET_MARGIN - (cols - 1) * GUTTER) / cols
+        slot_height = (page_height - 2 * SHEET_MARGIN - (rows - 1) * GUTTER) / rows
+        return min(slot_width / card_width, slot_height / card_height), slot_width, slot_height
+
+    cols, rows = max(_grid_options(cards_per_page), key=lambda grid: layout(*grid)[0])
+    scale, slot_width, slot_height = layout(cols, rows)
+    width, height = card_width * scale, card_height * scale
+
+    slots = []
+    for row in range(rows):
+        for col in range(cols):
+            x = SHEET_MARGIN + col * (slot_width + GUTTER) + (slot_width - width) / 2
+            top = page_height - SHEET_MARGIN - row * (slot_height + GUTTER)
+            y = top - slot_height + (slot_height - height) / 2
+            slots.append(Slot(x, y, scale, width, height))
+    return slots
+
+
+def draw_cut_marks(c, slots: List[Slot]) -> None:
+    """วาดเส้นตัดสั้น ๆ ที่มุมทั้ง 4 ของการ์ดทุกช่อง (อยู่นอกขอบการ์ด จึงไม่ทับเนื้อหา)"""
+    c.setLineWidth(0.5)
+    for slot in slots:
+        for x, dx in ((slot.x, -1), (slot.x + slot.width, 1)):
+            for y, dy in ((slot.y, -1), (slot.y + slot.height, 1)):
+                # เส้นแนวนอนและแนวตั้งยื่นออกจากมุม
+                c.line(x + dx * CUT_MARK_OFFSET, y, x + dx * (CUT_MARK_OFFSET + CUT_MARK_LENGTH), y)
+                c.line(x, y + dy * CUT_MARK_OFFSET, x, y + dy * (CUT_MARK_OFFSET + CUT_MARK_LENGTH))
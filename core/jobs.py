@@ -0,0 +1,201 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from core import metrics
+
+logger = logging.getLogger(__name__)
+
+# 💡 งานเบื้องหลัง (Background Job) ระดับ Process: งานหนัก (สร้างการ์ด + PDF + ZIP) รันใน Thread Pool ขนาดจำกัด
+# แทนการรันในรอบสคริปต์ของ Streamlit ผู้ใช้หลายคนจึงไม่ต้องรอกันทั้งหน้า และหน้าเว็บ Rerun ได้ระหว่างรอ
+# สถานะและผลลัพธ์เก็บตาม job_id (เก็บ job_id ไว้ใน st.session_state แล้วดึงกลับได้ทุกรอบ Rerun)
+
+# จำนวนงานที่รันพร้อมกัน (งานที่เกินรอในคิว)
+DEFAULT_JOB_WORKERS = int(os.environ.get("BINGO_JOB_WORKERS", 2))
+# Admission Control: งานที่ยังไม่เสร็จ (รอคิว + กำลังรัน) สูงสุด เกินนี้ปฏิเสธงานใหม่ทันทีแทนการรอคิวยาว
+DEFAULT_MAX_ACTIVE_JOBS = int(os.environ.get("BINGO_MAX_ACTIVE_JOBS", 8))
+# จำนวนงานที่เสร็จแล้วที่เก็บผลไว้ (เกินแล้วลบงานที่สร้างก่อนสุดทิ้ง)
+MAX_FINISHED_JOBS = 64
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class JobRejected(RuntimeError):
+    """คิวเต็ม (Admission Control) ให้ผู้ใช้ลองใหม่ภายหลัง"""
+
+
+class JobCancelled(Exception):
+    """งานถูกยกเลิก (โยนจาก Job.report ที่จุดตรวจระหว่างรัน)"""
+
+
+class JobEvent(NamedTuple):
+    """ความคืบหน้า 1 ครั้ง: วินาทีนับจากเริ่มรัน, ข้อความ และสัดส่วนที่เสร็จ (0-1, None = ไม่ทราบ)"""
+    elapsed: float
+    message: str
+    fraction: Optional[float]
+
+
+class Job:
+    """
+    งาน 1 งานในคิว: func(job, *args, **kwargs) รันใน Worker Thread และรายงานความคืบหน้าผ่าน job.report()
+    (func ห้ามเรียกคำสั่ง st.* เพราะไม่ได้อยู่ในรอบสคริปต์ของ Streamlit)
+    """
+
+    def __init__(self, name: str, func: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]):
+        self.job_id = uuid.uuid4().hex
+        self.name = name
+        self.state = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.events: List[JobEvent] = []
+        self.metrics = metrics.Metrics()
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._future: Optional[Future] = None
+        self._cancel_requested = threading.Event()
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested.is_set()
+
+    @property
+    def last_event(self) -> Optional[JobEvent]:
+        with self._lock:
+            return self.events[-1] if self.events else None
+
+    def report(self, message: str, fraction: Optional[float] = None) -> None:
+        """บันทึกความคืบหน้า (เรียกจากในงาน) และเป็นจุดตรวจการยกเลิก: โยน JobCancelled ถ้ามีคำขอยกเลิกแล้ว"""
+        if self._cancel_requested.is_set():
+            raise JobCancelled(self.job_id)
+        elapsed = time.time() - (self.started_at or self.created_at)
+        with self._lock:
+            self.events.append(JobEvent(elapsed, message, fraction))
+
+    def cancel(self) -> None:
+        """ขอยกเลิก: งานที่ยังรอคิวถูกยกเลิกทันที งานที่กำลังรันหยุดที่ report() ครั้งถัดไป"""
+        self._cancel_requested.set()
+        if self._future is not None and self._future.cancel():
+            self._finish(CANCELLED)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """รอจนงานจบ (สำเร็จ/ล้มเหลว/ยกเลิก) คืน False ถ้าครบ timeout ก่อน"""
+        return self._done.wait(timeout)
+
+    def _run(self) -> None:
+        if self._cancel_requested.is_set():
+            self._finish(CANCELLED)
+            return
+        self.state = RUNNING
+        self.started_at = time.time()
+        metrics.record_span("jobs.queue_wait", self.started_at - self.created_at)
+        try:
+            # Thread ของ Pool ไม่ได้สืบทอด Context ของผู้ส่งงาน: เก็บสถิติของงานนี้แยกไว้ใน job.metrics
+            with metrics.capture() as job_metrics:
+                self.metrics = job_metrics
+                with metrics.span(f"jobs.{self.name}"):
+                    result = self._func(self, *self._args, **self._kwargs)
+        except JobCancelled:
+            self._finish(CANCELLED)
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", self.name, self.job_id)
+            self.error = e
+            self._finish(FAILED)
+        else:
+            self.result = result
+            self._finish(DONE)
+
+    def _finish(self, state: str) -> None:
+        with self._lock:
+            if self.finished:
+                return
+            self.state = state
+            self.finished_at = time.time()
+        metrics.incr(f"jobs.{state}")
+        self._done.set()
+
+
+class JobQueue:
+    """คิวงานใน Process (ไม่ต้องมี Broker ภายนอก): Thread Pool ขนาด max_workers และรับงานค้างได้ไม่เกิน max_active"""
+
+    def __init__(self, max_workers: int = DEFAULT_JOB_WORKERS, max_active: int = DEFAULT_MAX_ACTIVE_JOBS):
+        self.max_workers = max(1, max_workers)
+        self.max_active = max(self.max_workers, max_active)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bingo-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Job:
+        """ส่งงานเข้าคิว คืน Job ทันที (โยน JobRejected ถ้างานค้างเต็ม max_active)"""
+        with self._lock:
+            active = sum(1 for job in self._jobs.values() if not job.finished)
+            if active >= self.max_active:
+                metrics.incr("jobs.rejected")
+                raise JobRejected(f"มีงานค้างอยู่ {active} งาน (รับได้สูงสุด {self.max_active})")
+            job = Job(name, func, args, kwargs)
+            self._jobs[job.job_id] = job
+            job._future = self._executor.submit(job._run)
+            self._prune()
+        metrics.incr("jobs.submitted")
+        return job
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: Optional[str]) -> None:
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+
+    def queue_position(self, job: Job) -> int:
+        """จำนวนงานที่รอคิวอยู่ก่อนงานนี้ (0 = กำลังรันหรือได้รันเป็นงานถัดไป)"""
+        with self._lock:
+            waiting = [other for other in self._jobs.values() if other.state == QUEUED]
+        return waiting.index(job) if job in waiting else 0
+
+    def active_count(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def shutdown(self, wait: bool = True) -> None:
+        for job in list(self._jobs.values()):
+            job.cancel()
+        self._executor.shutdown(wait=wait)
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+
+_DEFAULT_QUEUE: Optional[JobQueue] = None
+_DEFAULT_QUEUE_LOCK = threading.Lock()
+
+
+def get_default_job_queue() -> JobQueue:
+    """คิวงานที่ใช้ร่วมกันทั้ง Process (ทุก Session ของ Streamlit)"""
+    global _DEFAULT_QUEUE
+    with _DEFAULT_QUEUE_LOCK:
+        if _DEFAULT_QUEUE is None:
+            _DEFAULT_QUEUE = JobQueue()
+        return _DEFAULT_QUEUE
@@ -0,0 +1,123 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Tuple
+
+# 💡 ตัวเก็บสถิติระดับ Process: เวลาแต่ละขั้นตอน (Span) และตัวนับเหตุการณ์ (Counter)
+# ใช้ span()/incr() จากโค้ดส่วนไหนก็ได้ ผลรวมเก็บใน METRICS และส่งต่อให้ทุก capture() ที่ครอบอยู่ด้วย
+# (งานใน Worker Process ของ deck_renderer/cli นับแยกใน Process นั้น ไม่รวมกลับมาที่ Process หลัก)
+
+PROMETHEUS_PREFIX = "bingo"
+
+
+class Metrics:
+    """สถิติ Span (จำนวนครั้ง/เวลารวม/สูงสุด/ล่าสุด) และ Counter แบบ Thread-safe"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: Dict[str, list] = {}
+        self._counters: Dict[str, float] = {}
+
+    def record_span(self, name: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                self._spans[name] = [1, seconds, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+                stats[3] = seconds
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """คัดลอกสถิติ ณ ตอนนี้เป็น dict (ปลอดภัยที่จะอ่านขณะที่ Thread อื่นยังบันทึกอยู่)"""
+        with self._lock:
+            spans = {
+                name: {"count": count, "total_seconds": total, "max_seconds": longest, "last_seconds": last}
+                for name, (count, total, longest, last) in self._spans.items()
+            }
+            return {"spans": spans, "counters": dict(self._counters)}
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent, ensure_ascii=False, sort_keys=True)
+
+    def to_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """Prometheus Text Exposition Format (Span เป็น summary + gauge ค่าสูงสุด, Counter เป็น counter)"""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_span_seconds Time spent in each pipeline stage.",
+            f"# TYPE {prefix}_span_seconds summary",
+        ]
+        for name, stats in sorted(snapshot["spans"].items()):
+            label = _prometheus_label(name)
+            lines.append(f'{prefix}_span_seconds_count{{span="{label}"}} {stats["count"]}')
+            lines.append(f'{prefix}_span_seconds_sum{{span="{label}"}} {stats["total_seconds"]:.9f}')
+        lines.append(f"# HELP {prefix}_span_max_seconds Slowest single run of each pipeline stage.")
+        lines.append(f"# TYPE {prefix}_span_max_seconds gauge")
+        for name, stats in sorted(snapshot["spans"].items()):
+            lines.append(f'{prefix}_span_max_seconds{{span="{_prometheus_label(name)}"}} {stats["max_seconds"]:.9f}')
+        lines.append(f"# HELP {prefix}_events_total Pipeline event counters (cache hits, pages, bytes, retries).")
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f'{prefix}_events_total{{name="{_prometheus_label(name)}"}} {value:g}')
+        return "\n".join(lines) + "\n"
+
+
+def _prometheus_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# สถิติรวมของทั้ง Process
+METRICS = Metrics()
+
+# ตัวเก็บเพิ่มเติมของงานที่กำลังรัน (เช่น การกด Generate 1 ครั้ง) ผูกกับ Context ปัจจุบัน
+_CAPTURES: ContextVar[Tuple[Metrics, ...]] = ContextVar("bingo_metric_captures", default=())
+
+
+def _targets() -> Tuple[Metrics, ...]:
+    return (METRICS,) + _CAPTURES.get()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """จับเวลาโค้ดในบล็อก with แล้วบันทึกเป็น Span ชื่อ name (บันทึกแม้เกิด Exception)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        for metrics in _targets():
+            metrics.record_span(name, elapsed)
+
+
+def record_span(name: str, seconds: float) -> None:
+    """บันทึก Span ที่จับเวลาไว้เอง (ใช้ในลูปที่ไม่อยากเปิด with ทุกรอบ)"""
+    for metrics in _targets():
+        metrics.record_span(name, seconds)
+
+
+def incr(name: str, value: float = 1) -> None:
+    for metrics in _targets():
+        metrics.incr(name, value)
+
+
+@contextmanager
+def capture() -> Iterator[Metrics]:
+    """เก็บสถิติเฉพาะของงานในบล็อก with (ซ้อนกันได้) นอกเหนือจากสถิติรวมของ Process"""
+    metrics = Metrics()
+    token = _CAPTURES.set(_CAPTURES.get() + (metrics,))
+    try:
+        yield metrics
+    finally:
+        _CAPTURES.reset(token)
@@ -0,0 +1,72 @@
+from typing import Iterable, Iterator, NamedTuple, Optional, Sequence, Tuple, Union
+
+# 💡 จำนวนคู่แรกที่ใช้ทำการ์ดผู้เล่น (ส่วนที่เหลือเป็นคำถามสำรองใน Caller Sheet)
+CARD_POOL_SIZE = 25
+
+
+class QAPair(NamedTuple):
+    """
+    คู่คำถาม-คำตอบ 1 คู่ (NamedTuple: ไม่มี __dict__ ต่ออินสแตนซ์ เปรียบเทียบ/Hash ได้เหมือน tuple)
+    แยกจากข้อความครั้งเดียวตอนรับ Input แล้วส่งต่อทั้งระบบ แทนการ partition(':') ซ้ำทุกขั้นตอน
+    """
+    question: str
+    answer: str
+
+    @property
+    def card_text(self) -> str:
+        """ข้อความที่แสดงบนการ์ดผู้เล่น: คำตอบ แต่ถ้าไม่มีคำตอบ (Input ผิดพลาด) ให้ใช้คำถามแทน"""
+        return self.answer or self.question
+
+    @classmethod
+    def from_text(cls, pair: str) -> "QAPair":
+        """แปลงข้อความ 'คำถาม:คำตอบ' (แยกที่ ':' ตัวแรก) เป็น QAPair"""
+        question, _, answer = pair.partition(":")
+        return cls(question.strip(), answer.strip())
+
+    @classmethod
+    def coerce(cls, pair: Union[str, Tuple[str, str], "QAPair"]) -> "QAPair":
+        """รับได้ทั้งข้อความ 'คำถาม:คำตอบ', tuple หรือ QAPair แล้วคืนเป็น QAPair"""
+        if isinstance(pair, QAPair):
+            return pair
+        if isinstance(pair, str):
+            return cls.from_text(pair)
+        return cls(*pair)
+
+    def __str__(self) -> str:
+        return f"{self.question}:{self.answer}"
+
+
+class Deck:
+    """ชุดคู่คำถาม-คำตอบของเกม 1 เกม (ลำดับตาม Input) พร้อมรายการข้อความบนการ์ดที่คำนวณไว้ครั้งเดียว"""
+    __slots__ = ("pairs", "card_texts")
+
+    def __init__(self, pairs: Iterable[Union[str, Tuple[str, str], QAPair]]):
+        self.pairs: Tuple[QAPair, ...] = tuple(QAPair.coerce(pair) for pair in pairs)
+        self.card_texts: Tuple[str, ...] = tuple(pair.card_text for pair in self.pairs)
+
+    @classmethod
+    def coerce(cls, qa_pairs: Union["Deck", Iterable[Union[str, Tuple[str, str], QAPair]]]) -> "Deck":
+        """รับได้ทั้ง Deck หรือรายการคู่ (ข้อความ/tuple/QAPair) แล้วคืนเป็น Deck"""
+        if isinstance(qa_pairs, Deck):
+            return qa_pairs
+        return cls(qa_pairs)
+
+    def card_pool(self, size: Optional[int] = CARD_POOL_SIZE) -> Sequence[str]:
+        """ข้อความบนการ์ดจาก size คู่แรก (คลังคำที่ใช้สุ่มลงการ์ดผู้เล่น) size=None ใช้ทุกคู่"""
+        return self.card_texts if size is None else self.card_texts[:size]
+
+    def to_text(self) -> str:
+        """แปลงกลับเป็นข้อความ 1 คู่ต่อบรรทัด (รูปแบบเดียวกับ Text Area)"""
+        return "\n".join(str(pair) for pair in self.pairs)
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def __iter__(self) -> Iterator[QAPair]:
+        return iter(self.pairs)
+
+    def __getitem__(self, index):
+        return self.pairs[index]
+
+    def __repr__(self) -> str:
+        return f"Deck({len(self.pairs)} pairs)"
@@ -0,0 +1,126 @@
+import io
+import logging
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+from reportlab.lib.pagesizes import A4
+
+from core import metrics
+from core.bingo_engine import (CARD_GRID_TOP, CARD_MARGIN, CELL_MAX_FONT_SIZE, CELL_MIN_FONT_SIZE, CELL_PADDING,
+                               BingoEngine)
+from core.text_layout import fit_text
+
+logger = logging.getLogger(__name__)
+
+# 💡 ภาพตัวอย่างการ์ด (PNG) วาดด้วย Pillow ตาม Layout เดียวกับ BingoEngine.write_pdf (สี, โลโก้, ตัดบรรทัด, ช่อง FREE)
+# ใช้ตอนผู้ใช้ปรับสี/ฟอนต์/โลโก้ เพื่อเห็นผลทันทีโดยไม่ต้องเรนเดอร์ PDF ทั้งชุด
+# ภาพแคชตามข้อมูลที่ใช้วาด (เปลี่ยนสีกลับไปค่าเดิมได้ภาพจากแคชทันที)
+
+# พิกเซลต่อ 1pt ของพื้นที่ออกแบบ A4 (1.5 = การ์ดกว้างประมาณ 890px)
+PREVIEW_SCALE = 1.5
+# จำนวนการ์ดที่แสดงเป็นตัวอย่าง และจำนวนภาพที่เก็บในแคช
+PREVIEW_CARDS = 2
+PREVIEW_CACHE_SIZE = 128
+
+
+@lru_cache(maxsize=64)
+def _pil_font(font_path: str, font_name: str, size: float) -> Any:
+    """ฟอนต์ของ Pillow ตามขนาดพิกเซล (โหลดไฟล์ TTF ครั้งเดียวต่อขนาด) ถ้า Engine ใช้ Helvetica แทนก็ใช้ฟอนต์เริ่มต้นของ Pillow"""
+    if font_name != "Helvetica":
+        try:
+            return ImageFont.truetype(font_path, size)
+        except OSError:
+            pass
+    return ImageFont.load_default(size)
+
+
+def _load_logo(logo_bytes: Optional[bytes], size: int) -> Optional[Image.Image]:
+    if not logo_bytes:
+        return None
+    try:
+        return Image.open(io.BytesIO(logo_bytes)).convert("RGBA").resize((size, size))
+    except Exception as e:
+        logger.warning("Cannot draw logo in preview: %s", e)
+        return None
+
+
+@lru_cache(maxsize=PREVIEW_CACHE_SIZE)
+def _card_preview_png(font_path: str, font_name: str, card: Tuple[str, ...], card_number: int, title: str, grid_size: int,
+                      bg_color: str, text_color: str, free_space_color: str, logo_bytes: Optional[bytes], scale: float) -> bytes:
+    width, height = A4
+    cell_size = (width - CARD_MARGIN * 2) / grid_size
+    grid_top = height - CARD_GRID_TOP
+    # ตัดพื้นที่ว่างใต้ตารางทิ้ง (เหมือนตอนวางหลายใบต่อหน้า)
+    card_height = CARD_GRID_TOP + cell_size * grid_size + CARD_MARGIN
+
+    def px(x: float, y: float) -> Tuple[float, float]:
+        """แปลงพิกัด PDF (จุดเริ่มมุมล่างซ้าย) เป็นพิกเซล (จุดเริ่มมุมบนซ้าย)"""
+        return x * scale, (height - y) * scale
+
+    def font(size: float) -> Any:
+        return _pil_font(font_path, font_name, size * scale)
+
+    image = Image.new("RGB", (round(width * scale), round(card_height * scale)), "white")
+    draw = ImageDraw.Draw(image)
+
+    # ส่วนคงที่ (ตรงกับ BingoEngine._draw_card_template)
+    draw.text(px(width / 2, height - 40), title, fill=text_color, font=font(30), anchor="ms")
+    logo = _load_logo(logo_bytes, round(50 * scale))
+    if logo is not None:
+        image.paste(logo, tuple(round(v) for v in px(CARD_MARGIN, height - 10)), logo)
+
+    center_index = (grid_size * grid_size) // 2 if grid_size % 2 != 0 else None
+    for row in range(grid_size):
+        for col in range(grid_size):
+            x = CARD_MARGIN + col * cell_size
+            y = grid_top - row * cell_size
+            word_idx = row * grid_size + col
+            is_free = word_idx == center_index
+            draw.rectangle([px(x, y), px(x + cell_size, y - cell_size)], fill=free_space_color if is_free else bg_color,
+                           outline=text_color, width=max(1, round(scale)))
+            if is_free:
+                draw.text(px(x + cell_size / 2, y - cell_size / 2 - 5), "FREE", fill=text_color, font=font(16), anchor="ms")
+                continue
+            word = str(card[word_idx])
+            if not word:
+                continue
+
+            # ข้อความในช่อง (ตรงกับ BingoEngine._draw_card): Layout จาก core.text_layout ชุดเดียวกับ PDF
+            lines, font_size = fit_text(word, font_name, cell_size - CELL_PADDING, CELL_MAX_FONT_SIZE, CELL_MIN_FONT_SIZE)
+            line_spacing = font_size + 2
+            text_y = y - cell_size / 2 + len(lines) * line_spacing / 2 - font_size
+            for line in lines:
+                draw.text(px(x + cell_size / 2, text_y), line, fill=text_color, font=font(font_size), anchor="ms")
+                text_y -= line_spacing
+
+    draw.text(px(width - CARD_MARGIN - 50, height - 55), f"Card {card_number}", fill=text_color, font=font(12), anchor="ls")
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+def card_preview_png(engine: BingoEngine, card: Sequence[str], title: str, grid_size: int, bg_color: str, text_color: str,
+                     free_space_color: str, logo_bytes: Optional[bytes] = None, card_number: int = 1,
+                     scale: float = PREVIEW_SCALE) -> bytes:
+    """ภาพ PNG ของการ์ด 1 ใบ (แคชตามข้อมูลทั้งหมดที่ใช้วาด)"""
+    hits = _card_preview_png.cache_info().hits
+    with metrics.span("preview.card"):
+        png = _card_preview_png(engine.font_path, engine.font_name, tuple(card), card_number, title, grid_size,
+                                bg_color.upper(), text_color.upper(), free_space_color.upper(), logo_bytes or None, scale)
+    metrics.incr("preview.cache_hits" if _card_preview_png.cache_info().hits > hits else "preview.cache_misses")
+    return png
+
+
+def cards_preview_png(engine: BingoEngine, cards_data: Sequence[Sequence[str]], title: str, grid_size: int, bg_color: str,
+                      text_color: str, free_space_color: str, logo_bytes: Optional[bytes] = None, count: int = PREVIEW_CARDS,
+                      scale: float = PREVIEW_SCALE) -> List[bytes]:
+    """ภาพ PNG ของการ์ด count ใบแรก"""
+    return [card_preview_png(engine, card, title, grid_size, bg_color, text_color, free_space_color, logo_bytes, number, scale)
+            for number, card in enumerate(cards_data[:count], start=1)]
+
+
+def clear_preview_cache() -> None:
+    """ล้างแคชภาพตัวอย่าง (เช่น วัดเวลาแบบไม่มีแคชใน Benchmark)"""
+    _card_preview_png.cache_clear()
@@ -0,0 +1,48 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+# 💡 Process Pool เดียวทั้ง Process (เรนเดอร์ PDF, จำลองเกม, CLI) สร้างครั้งแรกที่ใช้แล้วใช้ซ้ำ
+# ไม่ต้องจ่ายค่าเปิด Interpreter + import numpy/reportlab + โหลดฟอนต์ทุกครั้งที่กด Generate
+# และงานหลายงานพร้อมกัน (คิวงานเบื้องหลัง) แบ่ง Worker ชุดเดียวกัน ไม่แย่ง CPU กันเกินจำนวนที่มี
+
+
+def available_cpu_count() -> int:
+    """จำนวน CPU ที่ Process นี้ใช้ได้จริง (เคารพ CPU Affinity ของ Container)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def default_worker_count() -> int:
+    """จำนวน Worker เริ่มต้น: ใช้ค่า BINGO_RENDER_WORKERS ถ้ามี ไม่เช่นนั้นใช้จำนวน CPU (1 CPU = ทำแบบ Serial)"""
+    env_value = os.environ.get("BINGO_RENDER_WORKERS")
+    if env_value and env_value.isdigit() and int(env_value) > 0:
+        return int(env_value)
+    return available_cpu_count()
+
+
+_DEFAULT_POOL: Optional[ProcessPoolExecutor] = None
+_DEFAULT_POOL_WORKERS = 0
+_DEFAULT_POOL_LOCK = threading.Lock()
+
+
+def get_default_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Process Pool ระดับ Process: ขนาดกำหนดครั้งเดียวตอนสร้าง (max_workers ของการเรียกครั้งแรก หรือ default_worker_count)
+    ใช้ spawn เพื่อไม่ fork Process ของ Streamlit ที่มีหลาย Thread อยู่ และสร้างใหม่อัตโนมัติถ้า Worker ตายจน Pool ใช้ไม่ได้
+    """
+    global _DEFAULT_POOL, _DEFAULT_POOL_WORKERS
+    with _DEFAULT_POOL_LOCK:
+        if _DEFAULT_POOL is None or getattr(_DEFAULT_POOL, "_broken", False):
+            _DEFAULT_POOL_WORKERS = max(1, max_workers or default_worker_count())
+            _DEFAULT_POOL = ProcessPoolExecutor(max_workers=_DEFAULT_POOL_WORKERS,
+                                                mp_context=multiprocessing.get_context("spawn"))
+        return _DEFAULT_POOL
+
+
+def default_pool_workers() -> int:
+    """จำนวน Worker ของ Pool ที่ใช้ร่วมกัน (ก่อนสร้าง Pool คือ default_worker_count)"""
+    return _DEFAULT_POOL_WORKERS or default_worker_count()
@@ -0,0 +1,113 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+import unicodedata
+from typing import List, Optional
+
+from core import metrics
+
+# 💡 CONFIG: ที่เก็บแคชและขีดจำกัด (ปรับผ่าน Environment Variable ได้)
+DEFAULT_CACHE_PATH = os.environ.get("BINGO_QA_CACHE_PATH", ".cache/qa_cache.sqlite3")
+DEFAULT_TTL_SECONDS = int(os.environ.get("BINGO_QA_CACHE_TTL", 7 * 24 * 60 * 60)) # 7 วัน
+DEFAULT_MAX_ENTRIES = int(os.environ.get("BINGO_QA_CACHE_MAX_ENTRIES", 500))
+
+
+def normalize_topic(topic: str) -> str:
+    """ทำหัวข้อให้อยู่ในรูปมาตรฐาน (NFC, ตัวพิมพ์เล็ก, ช่องว่างเดี่ยว) เพื่อใช้เป็น Key ของแคช"""
+    topic = unicodedata.normalize("NFC", topic)
+    return " ".join(topic.casefold().split())
+
+
+class QACache:
+    """
+    แคชผลลัพธ์ Q&A จาก AI บนดิสก์ (SQLite) แยกตามหัวข้อและจำนวนคู่
+    มีอายุข้อมูล (TTL) และลบรายการที่ไม่ได้ใช้นานที่สุดเมื่อเกินจำนวนสูงสุด (LRU)
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: int = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        # Streamlit เรียกจากหลาย Thread จึงใช้ Connection เดียวที่คุมด้วย Lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS qa_cache ("
+                " topic TEXT NOT NULL,"
+                " count INTEGER NOT NULL,"
+                " pairs TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (topic, count))"
+            )
+
+    def get(self, topic: str, count: int) -> Optional[List[str]]:
+        """คืนรายการ Q&A ที่เคยสร้างไว้ (None ถ้าไม่มีหรือหมดอายุแล้ว)"""
+        key = normalize_topic(topic)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT pairs, created_at FROM qa_cache WHERE topic = ? AND count = ?", (key, count)
+            ).fetchone()
+            if row is None:
+                metrics.incr("qa_cache.misses")
+                return None
+
+            pairs_json, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM qa_cache WHERE topic = ? AND count = ?", (key, count))
+                metrics.incr("qa_cache.misses")
+                return None
+
+            self._conn.execute("UPDATE qa_cache SET last_used = ? WHERE topic = ? AND count = ?", (now, key, count))
+        metrics.incr("qa_cache.hits")
+        return json.loads(pairs_json)
+
+    def put(self, topic: str, count: int, pairs: List[str]) -> None:
+        """บันทึกรายการ Q&A ที่ผ่านการตรวจสอบแล้ว และลบรายการเก่าที่เกินขนาดแคช"""
+        key = normalize_topic(topic)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO qa_cache (topic, count, pairs, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, count, json.dumps(pairs, ensure_ascii=False), now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """ลบรายการที่หมดอายุ แล้วลบรายการที่ใช้ล่าสุดนานที่สุดจนเหลือไม่เกิน max_entries"""
+        self._conn.execute("DELETE FROM qa_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        self._conn.execute(
+            "DELETE FROM qa_cache WHERE rowid IN ("
+            " SELECT rowid FROM qa_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self) -> None:
+        """ล้างแคชทั้งหมด"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM qa_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM qa_cache").fetchone()[0]
+
+
+_DEFAULT_CACHE: Optional[QACache] = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_default_cache() -> QACache:
+    """แคช Q&A ระดับ Process ที่ใช้ร่วมกันทุก AIAssistant"""
+    global _DEFAULT_CACHE
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = QACache()
+        return _DEFAULT_CACHE
@@ -0,0 +1,83 @@
+import re
+from typing import Iterator, List, Optional
+
+from core import metrics
+from core.models import QAPair, Deck
+
+# 💡 PERF: คอมไพล์ Regex ทั้งหมดครั้งเดียวตอน import (เดิมคอมไพล์/สแกนข้อความทั้งก้อนใหม่ ~10 รอบต่อคำตอบ)
+_AI_RECORD_REGEX = re.compile(r"[^,\n]+")   # ข้อความจาก AI: คั่นคู่ด้วยคอมม่าหรือขึ้นบรรทัดใหม่
+_LINE_RECORD_REGEX = re.compile(r"[^\n]+")  # Text Area: 1 คู่ต่อบรรทัด (คอมม่าในคำถาม/คำตอบใช้ได้)
+
+# อักขระที่อนุญาต: ไทย/อังกฤษ/ตัวเลข/ช่องว่าง/เครื่องหมายที่จำเป็น (อักขระอื่นเช่น Emoji, Markdown ถูกตัดทิ้ง)
+_DISALLOWED_CHARS_REGEX = re.compile(r"[^ก-๙a-zA-Z0-9\s:?,.'\"-]")
+_NUMBERING_REGEX = re.compile(r"\d+\.\s*")
+
+
+def _split_record(record: str, clean: bool) -> Optional[QAPair]:
+    """แยกข้อความ 1 คู่ (ที่กรองอักขระแล้ว) ที่ ':' ตัวแรก แล้วตรวจสอบความถูกต้อง"""
+    question, separator, answer = record.partition(":")
+    if not separator:
+        return None
+
+    if clean:
+        # " ".join(str.split()) ยุบช่องว่างทุกชนิด (\t, \xa0, \u3000 ฯลฯ) ได้เร็วกว่า re.sub
+        question = " ".join(question.split())
+        answer = " ".join(answer.split())
+        if question[:1].isdigit():
+            numbering = _NUMBERING_REGEX.match(question)
+            if numbering:
+                question = question[numbering.end():]
+        if not (question and answer):
+            return None
+        return QAPair(question, answer)
+
+    question = question.strip()
+    answer = answer.strip()
+    if not (question or answer):
+        return None
+    return QAPair(question, answer)
+
+
+def parse_record(record: str, clean: bool = True) -> Optional[QAPair]:
+    """
+    แปลงข้อความ 1 คู่เป็น QAPair โดยแยกที่ ':' ตัวแรก (คำตอบที่มี ':' จึงไม่ถูกตัด)
+    clean=True (ข้อความจาก AI): กรองอักขระแปลกปลอม ลบเลขลำดับนำหน้า และต้องมีทั้งคำถามและคำตอบ
+    clean=False (ผู้ใช้ป้อนเอง): ตัดเฉพาะช่องว่างหัวท้าย ยอมให้คำถามหรือคำตอบว่างได้
+    """
+    if clean:
+        record = _DISALLOWED_CHARS_REGEX.sub("", record)
+    return _split_record(record, clean)
+
+
+def iter_ai_records(text: str) -> Iterator[QAPair]:
+    """กรองอักขระทั้งข้อความครั้งเดียว แล้วสแกนแยกคู่รอบเดียว yield แต่ละคู่ที่ถูกต้อง"""
+    for match in _AI_RECORD_REGEX.finditer(_DISALLOWED_CHARS_REGEX.sub("", text)):
+        record = _split_record(match.group(), clean=True)
+        if record is not None:
+            yield record
+
+
+def parse_ai_response(text: str, limit: Optional[int] = None) -> List[QAPair]:
+    """แปลงข้อความดิบจาก AI เป็นรายการ QAPair ไม่เกิน limit คู่"""
+    records = []
+    for record in iter_ai_records(text):
+        records.append(record)
+        if limit is not None and len(records) >= limit:
+            break
+    return records
+
+
+def parse_qa_lines(text: str) -> List[QAPair]:
+    """แปลงข้อความจาก Text Area (1 คู่ต่อบรรทัด คั่นด้วย ':') เป็นรายการ QAPair"""
+    records = []
+    for match in _LINE_RECORD_REGEX.finditer(text):
+        record = _split_record(match.group(), clean=False)
+        if record is not None:
+            records.append(record)
+    return records
+
+
+def parse_deck(text: str) -> Deck:
+    """แปลงข้อความจาก Text Area เป็น Deck ครั้งเดียวตอนรับ Input"""
+    with metrics.span("parse.deck"):
+        return Deck(parse_qa_lines(text))
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from core import metrics
+
+# 💡 จำกัดอัตราเรียก LLM ฝั่งเราเอง (Token Bucket) ไม่ให้ชนขีดจำกัดของผู้ให้บริการ (คำขอ/นาที และ Token/นาที)
+# ค่าเริ่มต้นตามแผนฟรีของ Groq สำหรับ llama-3.1-8b-instant ปรับได้ด้วย Environment Variable
+DEFAULT_REQUESTS_PER_MINUTE = float(os.environ.get("BINGO_LLM_RPM", 30))
+DEFAULT_TOKENS_PER_MINUTE = float(os.environ.get("BINGO_LLM_TPM", 6000))
+
+# Backoff เมื่อผู้ให้บริการไม่บอก retry-after: 1, 2, 4, ... วินาที (สูงสุด MAX_BACKOFF_SECONDS) คูณ Jitter 0.5-1
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+
+
+class TokenBucket:
+    """เติม rate หน่วยต่อวินาที เก็บได้สูงสุด capacity หน่วย (ติดลบได้เมื่อใช้จริงเกินที่ประมาณไว้ คำขอถัดไปจะรอนานขึ้นเอง)"""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """วินาทีที่ต้องรอจนมี amount หน่วย (0 = ใช้ได้ทันที) คำขอที่ใหญ่กว่าถังรอแค่จนถังเต็ม"""
+        self._refill()
+        return max(0.0, (min(amount, self.capacity) - self._tokens) / self.rate)
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self._tokens -= amount
+
+
+class RateLimiter:
+    """
+    จำกัดทั้งจำนวนคำขอและจำนวน Token ต่อนาที ใช้ร่วมกันได้หลาย Event Loop/Thread
+    เมื่อผู้ให้บริการตอบว่าเกินขีดจำกัด ให้เรียก pause() เพื่อหยุดทุกคำขอที่รออยู่พร้อมกัน (ไม่ใช่แค่คำขอที่โดน)
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE, clock: Callable[[], float] = time.monotonic):
+        self.requests = TokenBucket(requests_per_minute / 60, max(1.0, requests_per_minute), clock)
+        self.tokens = TokenBucket(tokens_per_minute / 60, max(1.0, tokens_per_minute), clock)
+        self._clock = clock
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def delay_for(self, tokens: float) -> float:
+        with self._lock:
+            return self._delay_for(tokens)
+
+    def _delay_for(self, tokens: float) -> float:
+        return max(self._paused_until - self._clock(), self.requests.delay_for(1), self.tokens.delay_for(tokens))
+
+    async def acquire(self, tokens: float) -> float:
+        """รอจนส่งคำขอที่คาดว่าใช้ tokens Token ได้ แล้วหักโควตา คืนเวลาที่รอ (วินาที)"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                delay = self._delay_for(tokens)
+                if delay <= 0:
+                    self.requests.consume(1)
+                    self.tokens.consume(tokens)
+                    break
+            await asyncio.sleep(delay)
+            waited += delay
+        if waited:
+            metrics.record_span("llm.rate_limit_wait", waited)
+        return waited
+
+    def record_usage(self, estimated_tokens: float, actual_tokens: float) -> None:
+        """ปรับโควตา Token ตามที่ใช้จริง (จาก usage ของคำตอบ) แทนค่าที่ประมาณไว้ตอน acquire"""
+        with self._lock:
+            self.tokens.consume(actual_tokens - estimated_tokens)
+
+    def pause(self, seconds: float) -> None:
+        """หยุดส่งคำขอใหม่ทั้งหมด seconds วินาที (เช่น ตาม retry-after)"""
+        metrics.incr("llm.rate_limited")
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+def retry_after_seconds(error: Any) -> Optional[float]:
+    """เวลาที่ผู้ให้บริการขอให้รอก่อนลองใหม่ จาก Header retry-after ของ Error (None ถ้าไม่มี)"""
+    value = getattr(error, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        value = headers.get("retry-after") if headers is not None else None
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None  # retry-after แบบวันที่ (HTTP-date) ใช้ Backoff ปกติแทน
+
+
+def is_rate_limited(error: Any) -> bool:
+    """Error เป็น HTTP 429 (Too Many Requests) หรือไม่"""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429
+
+
+def backoff_seconds(attempt: int, retry_after: Optional[float] = None) -> float:
+    """เวลาพักก่อนลองครั้งที่ attempt + 1 (เริ่มที่ 0): ใช้ retry-after ถ้ามี ไม่เช่นนั้นเพิ่มเป็นเท่าตัวพร้อม Jitter"""
+    if retry_after is not None:
+        return retry_after
+    return min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+_DEFAULT_LIMITER: Optional[RateLimiter] = None
+_DEFAULT_LIMITER_LOCK = threading.Lock()
+
+
+def get_default_rate_limiter() -> RateLimiter:
+    """RateLimiter ระดับ Process (ทุก AIAssistant ใช้ API Key เดียวกัน จึงแชร์โควตาเดียวกัน)"""
+    global _DEFAULT_LIMITER
+    with _DEFAULT_LIMITER_LOCK:
+        if _DEFAULT_LIMITER is None:
+            _DEFAULT_LIMITER = RateLimiter()
+        return _DEFAULT_LIMITER
@@ -0,0 +1,234 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core import metrics
+from core.card_generator import FREE_TEXT
+from core.models import Deck, QAPair
+from core.process_pool import get_default_process_pool
+
+# 💡 ค่าเวลาของช่องที่ไม่มีวันถูกเรียก (ช่องว่าง/คำตอบที่ไม่อยู่ในลำดับการเรียก)
+NEVER_CALLED = np.iinfo(np.int16).max
+
+# งบหน่วยความจำต่อ Chunk (จำนวนช่องใน Rank Tensor เกม x การ์ด x ช่อง)
+CHUNK_CELL_BUDGET = 8_000_000
+
+# ต่ำกว่านี้จำลองใน Process เดียวเร็วกว่า (ค่าเริ่มต้น Process Pool ไม่คุ้ม)
+PARALLEL_MIN_GAMES = 50_000
+
+# รหัสพิเศษใน CardSet.card_ids: ช่อง FREE (ขีดแล้วตั้งแต่เริ่ม) และช่องว่าง (ไม่มีวันถูกขีด)
+FREE_CELL_ID = -1
+BLANK_CELL_ID = -2
+
+
+def winning_line_masks(grid_size: int) -> List[int]:
+    """Bitmask ของทุกเส้นที่ชนะได้: แถว, คอลัมน์ และเส้นทแยง 2 เส้น (bit ที่ i = ช่องที่ i ของการ์ด)"""
+    masks = []
+    for row in range(grid_size):
+        masks.append(sum(1 << (row * grid_size + col) for col in range(grid_size)))
+    for col in range(grid_size):
+        masks.append(sum(1 << (row * grid_size + col) for row in range(grid_size)))
+    masks.append(sum(1 << (i * grid_size + i) for i in range(grid_size)))
+    masks.append(sum(1 << (i * grid_size + grid_size - 1 - i) for i in range(grid_size)))
+    return masks
+
+
+class SimulationResult(NamedTuple):
+    """ผลการจำลองหลายเกม (1 ค่าต่อเกม): ลำดับการเรียกที่มีผู้ชนะเส้นแรก, จำนวนผู้ชนะพร้อมกัน, ลำดับที่มีผู้ชนะเต็มใบ"""
+    first_line_calls: np.ndarray
+    first_line_winners: np.ndarray
+    first_full_calls: np.ndarray
+
+    def summary(self) -> Dict[str, float]:
+        """สรุปการกระจายของจำนวนข้อที่เรียกจนมีผู้ชนะคนแรก (ไม่นับเกมที่ไม่มีผู้ชนะเลย)"""
+        finished = self.first_line_calls[self.first_line_calls != NEVER_CALLED]
+        if len(finished) == 0:
+            return {"games": len(self.first_line_calls), "finished": 0}
+        p10, median, p90 = np.percentile(finished, [10, 50, 90])
+        return {
+            "games": len(self.first_line_calls),
+            "finished": len(finished),
+            "mean_first_line": float(finished.mean()),
+            "p10_first_line": float(p10),
+            "median_first_line": float(median),
+            "p90_first_line": float(p90),
+            "multi_winner_rate": float((self.first_line_winners[self.first_line_calls != NEVER_CALLED] > 1).mean()),
+            "median_first_full": float(np.median(self.first_full_calls)),
+        }
+
+
+class CardSet:
+    """
+    การ์ดทั้งชุดในรูปที่จำลองเกมได้เร็ว: ข้อความแต่ละช่องถูกแปลงเป็นรหัสคำตอบ (int)
+    และมี Bitmask ต่อคำตอบ/ต่อการ์ด สำหรับตรวจเส้นชนะด้วยการ AND กับ Line Mask
+    """
+
+    def __init__(self, cards_data: Sequence[Sequence[str]], qa_pairs: Union[Deck, Sequence[Union[str, QAPair]]], grid_size: int):
+        deck = Deck.coerce(qa_pairs)
+        self.grid_size = grid_size
+        self.num_pairs = len(deck)
+
+        # คำตอบที่ข้อความเหมือนกันถือเป็นคำตอบเดียว (เรียกคู่ไหนก็ขีดช่องเดียวกัน)
+        text_ids: Dict[str, int] = {}
+        self.pair_text_ids = np.array([text_ids.setdefault(text, len(text_ids)) for text in deck.card_texts], dtype=np.int32)
+        self.num_texts = len(text_ids)
+
+        center_index = grid_size * grid_size // 2 if grid_size % 2 != 0 else None
+        card_ids = np.empty((len(cards_data), grid_size * grid_size), dtype=np.int32)
+        for card_index, card in enumerate(cards_data):
+            for cell_index, text in enumerate(card):
+                if cell_index == center_index and text == FREE_TEXT:
+                    card_ids[card_index, cell_index] = FREE_CELL_ID
+                else:
+                    card_ids[card_index, cell_index] = text_ids.get(text, BLANK_CELL_ID) if text else BLANK_CELL_ID
+        self.card_ids = card_ids
+
+        self.line_masks = np.array(winning_line_masks(grid_size), dtype=np.uint32)
+        self.free_masks = ((card_ids == FREE_CELL_ID).astype(np.uint32) << np.arange(card_ids.shape[1], dtype=np.uint32)).sum(axis=1, dtype=np.uint32)
+
+        self._text_masks: Optional[np.ndarray] = None
+
+    @property
+    def text_masks(self) -> np.ndarray:
+        """
+        text_masks[t, n] = ช่องบนการ์ด n ที่แสดงคำตอบ t (สร้างเมื่อใช้ครั้งแรกใน play เท่านั้น
+        เพราะมีขนาด คำตอบ x การ์ด ซึ่งใหญ่มากเมื่อคลังคำเป็นหลักพันคู่)
+        """
+        if self._text_masks is None:
+            card_ids = self.card_ids
+            text_masks = np.zeros((self.num_texts, len(card_ids)), dtype=np.uint32)
+            cards, cells = np.nonzero(card_ids >= 0)
+            np.bitwise_or.at(text_masks, (card_ids[cards, cells], cards), np.uint32(1) << cells.astype(np.uint32))
+            self._text_masks = text_masks
+        return self._text_masks
+
+    def __len__(self) -> int:
+        return len(self.card_ids)
+
+    def on_card_pairs(self) -> np.ndarray:
+        """ดัชนีคู่ใน Deck ที่คำตอบอยู่บนการ์ดอย่างน้อย 1 ใบ (เรียงจากน้อยไปมาก)"""
+        used = np.zeros(self.num_texts, dtype=bool)
+        used[self.card_ids[self.card_ids >= 0]] = True
+        return np.flatnonzero(used[self.pair_text_ids])
+
+    def _orders_to_ranks(self, call_orders: np.ndarray) -> np.ndarray:
+        """แปลงลำดับการเรียก (ดัชนีคู่ Q&A) เป็นเวลาที่แต่ละคู่ถูกเรียก (1 = ข้อแรก)"""
+        call_orders = np.atleast_2d(np.asarray(call_orders, dtype=np.int64))
+        ranks = np.full((len(call_orders), self.num_pairs), NEVER_CALLED, dtype=np.int16)
+        rows = np.arange(len(call_orders))[:, None]
+        ranks[rows, call_orders] = np.arange(1, call_orders.shape[1] + 1, dtype=np.int16)
+        return ranks
+
+    def _text_times(self, pair_ranks: np.ndarray) -> np.ndarray:
+        """
+        เวลาที่แต่ละคำตอบถูกขีด (คำตอบซ้ำกันใช้คู่ที่ถูกเรียกก่อน) ต่อท้ายด้วยเวลาของช่อง FREE (0) และช่องว่าง (ไม่มีวัน)
+        """
+        games = len(pair_ranks)
+        times = np.empty((games, self.num_texts + 2), dtype=np.int16)
+        if self.num_texts == self.num_pairs:
+            times[:, :self.num_texts] = pair_ranks
+        else:
+            times[:, :self.num_texts] = NEVER_CALLED
+            np.minimum.at(times, (slice(None), self.pair_text_ids), pair_ranks)
+        times[:, FREE_CELL_ID] = 0
+        times[:, BLANK_CELL_ID] = NEVER_CALLED
+        return times
+
+    def _evaluate_ranks(self, pair_ranks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rank Tensor: เวลาที่ขีดแต่ละช่องของทุกการ์ดในทุกเกม แล้วเส้นชนะ = max ของช่องในเส้น
+        คืน (ลำดับที่ชนะเส้นแรก, ลำดับที่ชนะเต็มใบ) ขนาด (เกม, การ์ด)
+        """
+        size = self.grid_size
+        text_times = self._text_times(pair_ranks)
+        # FREE (-1) และช่องว่าง (-2) ชี้ไปคอลัมน์ท้ายตาราง text_times ด้วย Negative Index
+        cell_times = text_times[:, self.card_ids]
+        grid = cell_times.reshape(len(pair_ranks), len(self.card_ids), size, size)
+
+        first_line = np.minimum(grid.max(axis=3).min(axis=2), grid.max(axis=2).min(axis=2))
+        diagonal = np.arange(size)
+        first_line = np.minimum(first_line, grid[:, :, diagonal, diagonal].max(axis=2))
+        first_line = np.minimum(first_line, grid[:, :, diagonal, size - 1 - diagonal].max(axis=2))
+        full_card = cell_times.max(axis=2)
+        return first_line, full_card
+
+    def win_calls(self, call_order: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        สำหรับลำดับการเรียก 1 ชุด (ดัชนีคู่ใน Deck): คืนลำดับที่การ์ดแต่ละใบชนะเส้นแรกและชนะเต็มใบ
+        (NEVER_CALLED = ไม่ชนะภายในลำดับนี้)
+        """
+        first_line, full_card = self._evaluate_ranks(self._orders_to_ranks(call_order))
+        return first_line[0], full_card[0]
+
+    def evaluate_orders(self, call_orders: np.ndarray) -> np.ndarray:
+        """ประเมินลำดับการเรียกหลายชุดพร้อมกัน (แถวละ 1 ลำดับ): คืนลำดับที่การ์ดแต่ละใบชนะเส้นแรก ขนาด (ลำดับ, การ์ด)"""
+        return self._evaluate_ranks(self._orders_to_ranks(call_orders))[0]
+
+    def play(self, call_order: Sequence[int]) -> List[Tuple[int, List[int]]]:
+        """
+        เดินเกมทีละข้อด้วย Bitmask: ขีดช่องด้วย OR แล้วตรวจเส้นด้วย AND กับ Line Mask
+        คืน [(ลำดับการเรียก, [การ์ดที่เพิ่งชนะเส้นแรก]), ...] เฉพาะข้อที่มีผู้ชนะใหม่
+        """
+        marked = self.free_masks.copy()
+        has_won = np.zeros(len(self.card_ids), dtype=bool)
+        events = []
+        for call_number, pair_index in enumerate(call_order, start=1):
+            marked |= self.text_masks[self.pair_text_ids[pair_index]]
+            wins = ((marked[:, None] & self.line_masks) == self.line_masks).any(axis=1)
+            new_winners = np.flatnonzero(wins & ~has_won)
+            if len(new_winners):
+                has_won[new_winners] = True
+                events.append((call_number, new_winners.tolist()))
+        return events
+
+
+def _games_per_chunk(card_set: CardSet) -> int:
+    return max(1, CHUNK_CELL_BUDGET // max(1, card_set.card_ids.size))
+
+
+def _simulate_chunk(job: tuple) -> SimulationResult:
+    """จำลอง games เกมด้วยลำดับการเรียกแบบสุ่ม (ทำงานได้ทั้งใน Process หลักและ Worker)"""
+    card_set, games, seed_sequence = job
+    rng = np.random.default_rng(seed_sequence)
+    batch = _games_per_chunk(card_set)
+    first_line_calls, first_line_winners, first_full_calls = [], [], []
+    for start in range(0, games, batch):
+        size = min(batch, games - start)
+        # Permutation แบบสุ่มของ 1..N ใช้เป็น "เวลาที่แต่ละคู่ถูกเรียก" ได้ตรง ๆ (Inverse ของ Permutation สุ่มก็สุ่มเช่นกัน)
+        pair_ranks = (np.argsort(rng.random((size, card_set.num_pairs)), axis=1) + 1).astype(np.int16)
+        first_line, full_card = card_set._evaluate_ranks(pair_ranks)
+        earliest = first_line.min(axis=1)
+        first_line_calls.append(earliest)
+        first_line_winners.append((first_line == earliest[:, None]).sum(axis=1))
+        first_full_calls.append(full_card.min(axis=1))
+    return SimulationResult(np.concatenate(first_line_calls), np.concatenate(first_line_winners), np.concatenate(first_full_calls))
+
+
+def simulate_games(card_set: CardSet, num_games: int = 100_000, seed: Optional[int] = None, workers: int = 1) -> SimulationResult:
+    """
+    Monte-Carlo: จำลอง num_games เกม แต่ละเกมเรียกทุกคู่ใน Deck ตามลำดับสุ่ม
+    workers > 1 แบ่งเกมให้หลาย Process (แต่ละ Process ได้ Seed ย่อยของตัวเอง ผลจึงทำซ้ำได้เมื่อกำหนด seed)
+    """
+    metrics.incr("simulate.games", num_games)
+    if workers <= 1 or num_games < PARALLEL_MIN_GAMES:
+        with metrics.span("simulate.run"):
+            return _simulate_chunk((card_set, num_games, np.random.SeedSequence(seed)))
+
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    games_per_worker = [num_games // workers + (1 if i < num_games % workers else 0) for i in range(workers)]
+    jobs = [(card_set, games, seed_sequence) for games, seed_sequence in zip(games_per_worker, seeds) if games]
+    # แบ่งเป็น workers ส่วนเสมอ (ผลทำซ้ำได้ไม่ว่า Pool ที่ใช้ร่วมกันจะมีกี่ Worker)
+    with metrics.span("simulate.run"):
+        results = list(get_default_process_pool().map(_simulate_chunk, jobs))
+    return SimulationResult(*(np.concatenate(parts) for parts in zip(*results)))
+
+
+def sweep_deck_sizes(engine, qa_pairs: Union[Deck, Sequence[Union[str, QAPair]]], grid_size: int, deck_sizes: Sequence[int],
+                     num_games: int = 20_000, seed: Optional[int] = None) -> Dict[int, Dict[str, float]]:
+    """จำลองหลายขนาดชุดการ์ด (จำนวนใบ) เพื่อเลือกจำนวนใบที่ทำให้เกมจบในจำนวนข้อที่ต้องการ"""
+    deck = Deck.coerce(qa_pairs)
+    results = {}
+    for num_cards in deck_sizes:
+        cards_data = engine.generate_cards_data(deck, num_cards, grid_size, seed=seed)
+        results[num_cards] = simulate_games(CardSet(cards_data, deck, grid_size), num_games, seed=seed).summary()
+    return results
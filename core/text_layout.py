@@ -0,0 +1,205 @@
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Tuple
+
+from reportlab.pdfbase import pdfmetrics
+
+# 💡 Layout ข้อความ (ตัดบรรทัด + เลือกขนาดฟอนต์) ที่ใช้ร่วมกันทั้งช่องบนการ์ดและ Caller Sheet
+# ความกว้างของข้อความคำนวณครั้งเดียวต่อข้อความ (Prefix Sum ของความกว้างตัวอักษรที่ขนาด 1pt)
+# แล้วใช้ได้ทุกขนาดฟอนต์ เพราะความกว้างแปรผันตรงกับขนาดฟอนต์
+
+LAYOUT_CACHE_SIZE = 4096
+
+# จำนวนบรรทัดสูงสุดในช่องบิงโก (เกินนี้จะลดขนาดฟอนต์ลง)
+MAX_CELL_LINES = 4
+
+# --- กฎตัดคำภาษาไทยแบบไม่ใช้พจนานุกรม ---
+# สระหน้า: ขึ้นต้นพยางค์เสมอ ห้ามตัดบรรทัดหลังตัวนี้
+THAI_LEADING_VOWELS = frozenset("เแโใไ")
+# สระบน/ล่าง วรรณยุกต์ การันต์ และสระหลังที่ต้องติดกับตัวหน้า: ห้ามขึ้นบรรทัดใหม่ด้วยตัวนี้
+THAI_NO_BREAK_BEFORE = frozenset("ัิีึืฺุู็่้๊๋์ํ๎" "ะาำๅๆฯ")
+# ตัวที่มักปิดท้ายพยางค์ (ตัดหลังตัวนี้ได้ค่อนข้างปลอดภัย)
+THAI_SYLLABLE_ENDINGS = frozenset("ะำๆฯ")
+# คำควบกล้ำ (กร, ปล, ขว ...): พยัญชนะตัวแรกที่ควบได้ และตัวที่สอง
+THAI_CLUSTER_FIRSTS = frozenset("กขคปพตผบดฟทจศส")
+THAI_CLUSTER_SECONDS = frozenset("รลว")
+_THANTHAKHAT = "์"
+_OPENING_PUNCTUATION = frozenset("([{\"'“‘")
+
+# ลำดับความสำคัญของจุดตัด: ช่องว่าง > ต้นพยางค์ > ระหว่างตัวอักษรไทย (Fallback)
+BREAK_SPACE = 0
+BREAK_SYLLABLE = 1
+BREAK_CHARACTER = 2
+
+
+def _is_thai(char: str) -> bool:
+    return "฀" <= char <= "๿"
+
+
+def _is_thai_consonant(char: str) -> bool:
+    return "ก" <= char <= "ฮ"
+
+
+def _has_vowel_mark(text: str, i: int) -> bool:
+    """พยัญชนะที่ i ตามด้วยสระบน/ล่าง/หลัง หรือวรรณยุกต์ (ไม่นับการันต์)"""
+    following = text[i + 1:i + 2]
+    return bool(following) and following in THAI_NO_BREAK_BEFORE and following != _THANTHAKHAT
+
+
+def _starts_syllable(text: str, i: int) -> bool:
+    """เดาว่า text[i] เป็นต้นพยางค์: สระหน้า หรือพยัญชนะที่มีสระ/วรรณยุกต์ตาม (คำควบกล้ำนับต้นพยางค์ที่ตัวแรก)"""
+    char = text[i]
+    if char in THAI_LEADING_VOWELS:
+        return True
+    if not _is_thai_consonant(char):
+        return False
+    if _has_vowel_mark(text, i):
+        return not (char in THAI_CLUSTER_SECONDS and text[i - 1] in THAI_CLUSTER_FIRSTS)
+    return char in THAI_CLUSTER_FIRSTS and text[i + 1:i + 2] in THAI_CLUSTER_SECONDS and _has_vowel_mark(text, i + 1)
+
+
+class _CharWidths(dict):
+    """ความกว้างตัวอักษรที่ขนาด 1pt ของฟอนต์หนึ่ง (วัดครั้งแรกที่เจอตัวอักษรนั้น แล้วจำไว้)"""
+
+    def __init__(self, font_name: str):
+        super().__init__()
+        self._font = pdfmetrics.getFont(font_name)
+
+    def __missing__(self, char: str) -> float:
+        width = self[char] = self._font.stringWidth(char, 1)
+        return width
+
+
+@lru_cache(maxsize=None)
+def _char_widths(font_name: str) -> _CharWidths:
+    return _CharWidths(font_name)
+
+
+def glyph_prefix_widths(text: str, font_name: str) -> Tuple[float, ...]:
+    """Prefix Sum ของความกว้างตัวอักษรที่ขนาด 1pt: ความกว้างของ text[i:j] = (p[j] - p[i]) * ขนาดฟอนต์"""
+    return tuple(accumulate(map(_char_widths(font_name).__getitem__, text), initial=0.0))
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _word_break_points(word: str) -> Tuple[Tuple[int, int], ...]:
+    """จุดตัดภายในคำ 1 คำ (ไม่มีช่องว่าง) แคชตามคำ เพราะคำเดิมวนมาซ้ำในหลายข้อความ (เช่น เลขข้อที่เปลี่ยนแต่คำถามเดิม)"""
+    points = []
+    # ตรวจว่าเป็นอักษรไทยครั้งเดียวต่อตัวอักษร (ลูปนี้เป็นส่วนที่ช้าที่สุดตอนแคชยังว่าง)
+    is_thai = [_is_thai(char) for char in word]
+    for i in range(1, len(word)):
+        prev_char, char = word[i - 1], word[i]
+        if char in THAI_NO_BREAK_BEFORE or prev_char in THAI_LEADING_VOWELS:
+            continue
+        prev_thai, thai = is_thai[i - 1], is_thai[i]
+        # ไม่ขึ้นบรรทัดใหม่ด้วยเครื่องหมายวรรคตอน (":", ",", ")") และไม่ตัดหลังวงเล็บ/อัญประกาศเปิด
+        if (not thai and not char.isalnum()) or prev_char in _OPENING_PUNCTUATION:
+            continue
+        # พยัญชนะที่ตามด้วยการันต์ (เช่น "ศ์") หรือเป็นตัวสุดท้ายของคำ (เช่น "ศ" ใน "อากาศ") เป็นตัวสะกดของพยางค์ก่อนหน้า
+        following = word[i + 1:i + 3]
+        if following[:1] == _THANTHAKHAT or (following[1:] == _THANTHAKHAT and following[0] in THAI_NO_BREAK_BEFORE):
+            continue
+        if prev_thai and _is_thai_consonant(char) and (i + 1 == len(word) or not is_thai[i + 1]):
+            continue
+
+        if prev_thai != thai or prev_char in THAI_SYLLABLE_ENDINGS or (thai and _starts_syllable(word, i)):
+            points.append((i, BREAK_SYLLABLE))
+        elif prev_thai and thai:
+            points.append((i, BREAK_CHARACTER))
+    return tuple(points)
+
+
+def break_points(text: str) -> Tuple[Tuple[int, int], ...]:
+    """
+    จุดที่ตัดบรรทัดได้ [(i, ระดับ)] คือตัดระหว่าง text[:i] และ text[i:] (ถ้า text[i] เป็นช่องว่าง ช่องว่างนั้นถูกตัดทิ้ง)
+    ภาษาไทยไม่มีช่องว่างระหว่างคำ จึงเดาขอบพยางค์จากสระหน้า พยัญชนะที่มีสระตาม และสระที่ปิดพยางค์
+    โดยไม่แยกสระหรือวรรณยุกต์ออกจากพยัญชนะ
+    """
+    points = []
+    offset = 0
+    for word in text.split(" "):
+        if offset:
+            points.append((offset - 1, BREAK_SPACE))
+        points.extend((offset + i, level) for i, level in _word_break_points(word))
+        offset += len(word) + 1
+    return tuple(points)
+
+
+def _choose_break(text: str, breaks: Tuple[Tuple[int, int], ...], prefix: Tuple[float, ...], start: int, end: int, limit: float) -> int:
+    """เลือกจุดตัดของบรรทัดที่เริ่มที่ start และยาวได้ถึง end (ไม่รวม)"""
+    candidates = breaks[bisect_right(breaks, (start, BREAK_CHARACTER)):bisect_right(breaks, (end, BREAK_CHARACTER))]
+    preferred = [i for i, level in candidates if level <= BREAK_SYLLABLE]
+    # ตัดที่ช่องว่าง/ต้นพยางค์ถ้าบรรทัดเต็มเกินครึ่ง ไม่เช่นนั้นยอมตัดกลางคำไทย เพื่อไม่ให้บรรทัดสั้นเกินไป
+    if preferred and prefix[preferred[-1]] - prefix[start] >= limit / 2:
+        return preferred[-1]
+    characters = [i for i, level in candidates if level == BREAK_CHARACTER]
+    if characters:
+        return characters[-1]
+    if preferred:
+        return preferred[-1]
+
+    # ไม่มีจุดตัดเลย (คำยาวคำเดียว): ตัดที่ตัวอักษรสุดท้ายที่พอดี โดยไม่แยกสระ/วรรณยุกต์ออกจากพยัญชนะ
+    cut = max(end, start + 1)
+    while cut > start + 1 and cut < len(text) and text[cut] in THAI_NO_BREAK_BEFORE:
+        cut -= 1
+    return cut
+
+
+def _wrap(text: str, prefix: Tuple[float, ...], breaks: Tuple[Tuple[int, int], ...], font_size: float,
+          max_width: float) -> Tuple[str, ...]:
+    limit = max_width / font_size
+
+    lines = []
+    start = 0
+    while start < len(text):
+        # ตำแหน่งไกลสุดที่ยังกว้างไม่เกิน limit (ค้นหาแบบ Binary Search บน Prefix Sum)
+        end = bisect_right(prefix, prefix[start] + limit) - 1
+        if end >= len(text):
+            lines.append(text[start:])
+            break
+
+        cut = _choose_break(text, breaks, prefix, start, end, limit)
+        lines.append(text[start:cut])
+        # cut อาจเท่ากับ len(text) เมื่อกล่องแคบกว่าตัวอักษรตัวเดียว (บรรทัดละ 1 ตัวอักษร)
+        start = cut + 1 if cut < len(text) and text[cut] == " " else cut
+    return tuple(lines)
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def wrap_lines(text: str, font_name: str, font_size: float, max_width: float) -> Tuple[str, ...]:
+    """ตัดข้อความเป็นบรรทัดที่กว้างไม่เกิน max_width ที่ขนาด font_size (ผลลัพธ์ถูกแคช)"""
+    text = " ".join(text.split())
+    return _wrap(text, glyph_prefix_widths(text, font_name), break_points(text), font_size, max_width)
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def fit_text(text: str, font_name: str, max_width: float, max_font_size: int, min_font_size: int,
+             max_lines: int = MAX_CELL_LINES) -> Tuple[Tuple[str, ...], int]:
+    """
+    หาขนาดฟอนต์ (จำนวนเต็ม) ที่ใหญ่ที่สุดใน [min_font_size, max_font_size] ที่ตัดแล้วไม่เกิน max_lines บรรทัด (Binary Search)
+    คืน (บรรทัด, ขนาดฟอนต์) ถ้าไม่มีขนาดไหนพอดีจะใช้ขนาดเล็กสุด
+    """
+    # ความกว้างและจุดตัดคำนวณครั้งเดียว แล้วใช้ซ้ำทุกขนาดที่ลอง
+    text = " ".join(text.split())
+    prefix, breaks = glyph_prefix_widths(text, font_name), break_points(text)
+    lines = _wrap(text, prefix, breaks, max_font_size, max_width)
+    if len(lines) <= max_lines or max_font_size <= min_font_size:
+        return lines, max_font_size
+
+    best = (_wrap(text, prefix, breaks, min_font_size, max_width), min_font_size)
+    low, high = min_font_size, max_font_size - 1
+    while low <= high:
+        size = (low + high) // 2
+        lines = _wrap(text, prefix, breaks, size, max_width)
+        if len(lines) <= max_lines:
+            best = (lines, size)
+            low = size + 1
+        else:
+            high = size - 1
+    return best
+
+
+def clear_layout_caches() -> None:
+    """ล้างแคช Layout ทั้งหมด (เช่น วัดเวลาแบบไม่มีแคชใน Benchmark)"""
+    for cached in (_char_widths, _word_break_points, wrap_lines, fit_text):
+        cached.cache_clear()
@@ -0,0 +1,123 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from core import metrics, rate_limit
+from core.ai_assistant import AIAssistant
+from core.qa_cache import QACache
+from core.rate_limit import RateLimiter
+
+
+class RateLimitError(Exception):
+    """เหมือน groq.RateLimitError: HTTP 429 พร้อม Header retry-after"""
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__("429 Too Many Requests")
+        self.response = SimpleNamespace(status_code=429, headers={"retry-after": str(retry_after)})
+
+
+class FakeAsyncClient:
+    """
+    AsyncGroq ปลอม: responses[topic] คือรายการผลของแต่ละคำขอตามลำดับ (Exception = โยน, int = จำนวนคู่ที่ตอบ)
+    คำขอที่เกินรายการตอบด้วยผลสุดท้ายซ้ำ
+    """
+
+    def __init__(self, responses=None, default=35):
+        self.responses = responses or {}
+        self.default = default
+        self.calls = []
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(self, messages, model, temperature):
+        topic = messages[1]["content"].split("topic: ")[1].split(". Output")[0]
+        attempt = sum(1 for called, _ in self.calls if called == topic)
+        self.calls.append((topic, time.monotonic()))
+        plan = self.responses.get(topic, [self.default])
+        outcome = plan[min(attempt, len(plan) - 1)]
+        if isinstance(outcome, Exception):
+            raise outcome
+        await asyncio.sleep(0)
+        offset = attempt * 10  # คำขอถัดไปของหัวข้อเดิมซ้ำกับคำขอก่อนบางส่วน
+        pairs = [f"{topic} q{i + offset}:{topic} a{i + offset}" for i in range(outcome)]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=", ".join(pairs)))],
+                               usage=SimpleNamespace(total_tokens=500))
+
+
+class RecordingLimiter(RateLimiter):
+    def __init__(self):
+        super().__init__(requests_per_minute=6000, tokens_per_minute=1e9)
+        self.pauses = []
+
+    def pause(self, seconds):
+        self.pauses.append(seconds)
+        super().pause(seconds)
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(rate_limit, "BASE_BACKOFF_SECONDS", 0.001)
+
+
+def run_batch(client, topics, count=35, cache=None, limiter=None, concurrency=4):
+    assistant = AIAssistant(async_client=client, cache=cache if cache is not None else QACache(":memory:"))
+    return assistant.generate_batch(topics, count, limiter=limiter or RecordingLimiter(), concurrency=concurrency)
+
+
+def test_merge_unique_pairs_skips_repeated_questions_and_answers():
+    merged, seen = [], set()
+    AIAssistant._merge_unique_pairs(merged, seen, ["Q1:A1", "Q2:A2"], 5)
+    AIAssistant._merge_unique_pairs(merged, seen, [" q1 :other", "new:a2 ", "Q3:A3", "Q4:A4", "Q5:A5", "Q6:A6"], 4)
+
+    assert merged == ["Q1:A1", "Q2:A2", "Q3:A3", "Q4:A4"]
+
+
+def test_short_responses_are_merged_across_requests_without_duplicates():
+    client = FakeAsyncClient({"history": [20, 20]})  # คำขอที่ 2 ซ้ำกับคำขอแรก 10 คู่
+    (result,) = run_batch(client, ["history"])
+
+    assert result.error is None
+    assert result.requests == 2
+    assert len(result.pairs) == 30 == len(set(result.pairs))
+
+
+def test_duplicate_topics_are_generated_once():
+    client = FakeAsyncClient()
+    results = run_batch(client, ["Space", " space ", "SPACE", "Oceans", "  "])
+
+    assert [result.topic for result in results] == ["Space", "Oceans"]
+    assert sorted(topic for topic, _ in client.calls) == ["Oceans", "Space"]
+
+
+def test_rate_limit_pauses_all_requests_for_retry_after():
+    client = FakeAsyncClient({"a": [RateLimitError(0.2), 35]})
+    limiter = RecordingLimiter()
+    with metrics.capture() as captured:
+        results = run_batch(client, ["a", "b", "c"], limiter=limiter, concurrency=1)
+
+    assert limiter.pauses == [0.2]
+    assert captured.snapshot()["counters"]["llm.rate_limited"] == 1
+    assert [result.error for result in results] == [None, None, None]
+    # คำขอที่โดน 429 ไม่นับเป็นความพยายามที่ล้มเหลว และทุกหัวข้อรอจนครบ retry-after
+    assert results[0].requests == 2 and results[0].rate_limit_wait >= 0.19
+    first_call = client.calls[0][1]
+    assert all(called - first_call >= 0.19 for _, called in client.calls[1:])
+
+
+def test_failures_are_reported_per_topic_and_not_cached():
+    client = FakeAsyncClient({"broken": [RuntimeError("boom")], "short": [5]})
+    cache = QACache(":memory:")
+    results = run_batch(client, ["ok", "broken", "short"], cache=cache)
+    by_topic = {result.topic: result for result in results}
+
+    assert by_topic["ok"].error is None and len(by_topic["ok"].pairs) == 35
+    assert by_topic["broken"].error == "boom" and by_topic["broken"].pairs == []
+    assert by_topic["broken"].requests == AIAssistant.MAX_REQUESTS
+    assert "15/35" in by_topic["short"].error  # 3 คำขอ x 5 คู่ ไม่ซ้ำกัน
+    assert cache.get("ok", 35) is not None
+    assert cache.get("broken", 35) is None and cache.get("short", 35) is None
+
+    rerun = run_batch(client, ["ok", "broken"], cache=cache)
+    assert [result.cached for result in rerun] == [True, False]
@@ -0,0 +1,85 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from core import metrics
+from core.ai_assistant import AIAssistant
+from core.qa_cache import QACache
+
+
+class DelayedAsyncClient:
+    """
+    AsyncGroq ปลอมที่ควบคุมเวลาได้: plan คือ (หน่วงกี่วินาที, ผลลัพธ์) ของแต่ละคำขอตามลำดับ
+    (ผลลัพธ์เป็น Exception = โยนหลังหน่วง, int = จำนวนคู่ที่ตอบ) และบันทึกเวลาเริ่ม/คำขอที่ถูกยกเลิก
+    """
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.started = []
+        self.cancelled = []
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(self, messages, model, temperature):
+        request = len(self.started)
+        self.started.append(time.monotonic())
+        delay, outcome = self.plan[request]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(request)
+            raise
+        if isinstance(outcome, Exception):
+            raise outcome
+        pairs = [f"q{request}-{i}:a{request}-{i}" for i in range(outcome)]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=", ".join(pairs)))])
+
+
+def generate(client, count=30, **kwargs):
+    assistant = AIAssistant(async_client=client, cache=QACache(":memory:"))
+    return asyncio.run(assistant.agenerate_bingo_qa_pairs("hedging", count, **kwargs))
+
+
+def test_backup_request_fires_after_hedge_delay_and_wins():
+    client = DelayedAsyncClient([(5.0, 30), (0.01, 30)])
+
+    started = time.monotonic()
+    with metrics.capture() as captured:
+        pairs = generate(client, hedge_after=0.05, max_requests=2)
+
+    # คำขอสำรองเริ่มหลังครบเวลา Hedge ไม่ใช่พร้อมคำขอแรก และตอบก่อนคำขอแรกที่ช้า
+    assert client.started[1] - client.started[0] >= 0.05
+    assert time.monotonic() - started < 1.0
+    assert pairs == [f"q1-{i}:a1-{i}" for i in range(30)]
+    counters = captured.snapshot()["counters"]
+    assert counters["llm.requests"] == 2 and counters["llm.hedged_requests"] == 1
+
+
+def test_slow_request_is_cancelled_once_backup_fills_the_count():
+    client = DelayedAsyncClient([(5.0, 30), (0.01, 30)])
+
+    generate(client, hedge_after=0.05, max_requests=2)
+
+    assert client.cancelled == [0]
+
+
+def test_no_hedge_when_first_response_is_fast():
+    client = DelayedAsyncClient([(0.01, 30), (0.01, 30)])
+
+    with metrics.capture() as captured:
+        generate(client, hedge_after=0.5, max_requests=2)
+
+    assert len(client.started) == 1
+    assert "llm.hedged_requests" not in captured.snapshot()["counters"]
+
+
+def test_both_requests_failing_returns_empty_and_logs(caplog):
+    client = DelayedAsyncClient([(0.1, RuntimeError("slow boom")), (0.01, RuntimeError("fast boom"))])
+
+    with metrics.capture() as captured:
+        pairs = generate(client, hedge_after=0.02, max_requests=2)
+
+    assert pairs == []
+    assert client.cancelled == []
+    assert captured.snapshot()["counters"]["llm.errors"] == 2
+    warnings = [record.getMessage() for record in caplog.records if record.levelname == "WARNING"]
+    assert any("fast boom" in message for message in warnings) and any("slow boom" in message for message in warnings)
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+from core.ai_assistant import AIAssistant
+from core.qa_cache import QACache
+
+
+class FakeStreamingClient:
+    """Groq Client ปลอมแบบ Stream: ส่ง text ทีละ chunk_size ตัวอักษร และบันทึกจำนวน Chunk ที่ถูกอ่าน/การปิด Stream"""
+
+    def __init__(self, texts, chunk_size=4):
+        self.texts = list(texts)
+        self.chunk_size = chunk_size
+        self.sent = 0
+        self.closed = 0
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, messages, model, temperature, stream):
+        assert stream
+        text = self.texts.pop(0)
+        client = self
+
+        class Stream:
+            def __iter__(self):
+                yield SimpleNamespace(choices=[])  # Chunk ที่ไม่มี choices (เช่น usage) ต้องถูกข้าม
+                for i in range(0, len(text), client.chunk_size):
+                    client.sent += 1
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text[i:i + client.chunk_size]))])
+
+            def close(self):
+                client.closed += 1
+
+        return Stream()
+
+
+def pairs_text(start, stop):
+    return ", ".join(f"q{i}:a{i}" for i in range(start, stop))
+
+
+def make_assistant(client):
+    return AIAssistant(client=client, cache=QACache(":memory:"))
+
+
+def test_pairs_split_across_chunks_are_parsed_and_incomplete_tail_is_dropped():
+    # คู่สุดท้ายถูกตัดกลางคัน (ยังไม่มีคำตอบ) เมื่อ Stream จบ
+    client = FakeStreamingClient([pairs_text(0, 26) + "\nq26:"])
+    assistant = make_assistant(client)
+
+    pairs = list(assistant.stream_bingo_qa_pairs("chunks", 30))
+
+    assert pairs == [f"q{i}:a{i}" for i in range(26)]
+    assert client.closed == 1
+    # ได้ถึงขั้นต่ำแล้ว: เก็บลงแคช (ไม่มีคู่ที่ไม่ครบ)
+    assert assistant.cache.get("chunks", 30) == pairs
+
+
+def test_trailing_pair_without_separator_is_kept():
+    client = FakeStreamingClient([pairs_text(0, 26)])
+
+    pairs = list(make_assistant(client).stream_bingo_qa_pairs("tail", 30))
+
+    assert pairs[-1] == "q25:a25" and len(pairs) == 26
+
+
+def test_pairs_are_yielded_before_the_stream_ends_and_stream_closes_at_count():
+    client = FakeStreamingClient([pairs_text(0, 60)])
+    stream = make_assistant(client).stream_bingo_qa_pairs("early", 30)
+
+    assert next(stream) == "q0:a0"
+    assert client.sent < 5  # คู่แรกออกมาก่อนอ่าน Stream หมด
+
+    assert list(stream) == [f"q{i}:a{i}" for i in range(1, 30)]
+    assert client.closed == 1
+    assert client.sent < len(pairs_text(0, 60)) // client.chunk_size
@@ -0,0 +1,37 @@
+import numpy as np
+
+from core.call_order import optimize_call_order
+from core.card_generator import AnswerIndex, cards_to_text, generate_card_indices
+from core.models import CARD_POOL_SIZE, Deck
+from core.simulator import CardSet
+
+
+def make_card_set(num_pairs: int, num_cards: int, grid_size: int, seed: int):
+    """การ์ดจากคลังคำ CARD_POOL_SIZE คู่แรก (คู่ที่เหลือใน Deck เป็นคำถามสำรองที่ไม่อยู่บนการ์ดใบไหน)"""
+    deck = Deck([(f"q{i}", f"a{i}") for i in range(num_pairs)])
+    answers = deck.card_pool(CARD_POOL_SIZE)
+    card_indices = generate_card_indices(answers, num_cards, grid_size, seed=seed)
+    cards = cards_to_text(card_indices, answers)
+    return AnswerIndex(card_indices, len(answers)), CardSet(cards, deck, grid_size)
+
+
+def test_optimized_order_calls_on_card_pairs_first():
+    index, card_set = make_card_set(35, 10, 5, seed=1)
+    result = optimize_call_order(card_set, (8, 12), candidates=512, seed=1)
+
+    on_cards = set(card_set.on_card_pairs().tolist())
+    assert result.main_count == index.num_used() == len(on_cards)
+    assert set(result.order[:result.main_count]) == on_cards
+    # คำถามสำรองอยู่ท้ายทั้งหมด และทุกคู่ใน Deck ถูกเรียกครั้งเดียว
+    assert sorted(result.order) == list(range(35))
+
+
+def test_reported_first_winner_matches_replay():
+    _, card_set = make_card_set(35, 10, 5, seed=1)
+    result = optimize_call_order(card_set, (8, 12), candidates=512, seed=1)
+
+    first_line, _ = card_set.win_calls(result.order)
+    assert int(first_line.min()) == result.first_line_call
+    assert int(np.count_nonzero(first_line == result.first_line_call)) == result.first_line_winners
+    # ผู้ชนะคนแรกเกิดภายในส่วนหลักของลำดับ (คำถามสำรองไม่ช่วยให้ใครชนะ)
+    assert result.first_line_call <= result.main_count
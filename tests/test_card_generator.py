@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from core.card_generator import FREE_INDEX, FREE_TEXT, AnswerIndex, cards_to_text, generate_card_indices, matching_call_order
+
+TEXTS = [f"คำตอบ {i}" for i in range(25)]
+
+
+def test_cards_have_free_centre_and_no_repeated_cells():
+    cards = generate_card_indices(TEXTS, 200, 5, seed=1)
+
+    assert cards.shape == (200, 25)
+    assert (cards[:, 12] == FREE_INDEX).all()
+    assert all(len(set(row)) == 25 for row in cards.tolist())
+    assert ((cards == FREE_INDEX) | ((cards >= 0) & (cards < len(TEXTS)))).all()
+
+
+def test_same_seed_gives_same_cards():
+    assert np.array_equal(generate_card_indices(TEXTS, 50, 5, seed=7), generate_card_indices(TEXTS, 50, 5, seed=7))
+
+
+def test_short_pool_fills_blank_cells():
+    cards = cards_to_text(generate_card_indices(TEXTS[:10], 5, 4, seed=3), TEXTS[:10])
+
+    assert all(len(card) == 16 and card.count("") == 6 for card in cards)
+    assert FREE_TEXT not in cards[0]  # ตารางขนาดคู่ไม่มีช่อง FREE
+
+
+def test_unique_cards_when_pool_is_nearly_exhausted():
+    # 3 คำตอบ + ช่องว่าง 1 ช่อง บนตาราง 2x2 สร้างการ์ดต่างกันได้ 4!/1! = 24 แบบ
+    cards = generate_card_indices(["x", "y", "z"], 20, 2, seed=1, unique=True)
+
+    assert len({tuple(row) for row in cards.tolist()}) == 20
+
+
+def test_unique_treats_repeated_answers_as_the_same_text():
+    texts = ["x", "x", "y", "z"]
+    cards = cards_to_text(generate_card_indices(texts, 10, 2, seed=2, unique=True), texts)
+
+    assert len({tuple(card) for card in cards}) == 10  # ข้อความต่างกันได้เพียง 4!/2! = 12 แบบ
+
+
+def test_unique_rejects_more_cards_than_possible():
+    with pytest.raises(ValueError):
+        generate_card_indices(["x", "y", "z"], 25, 2, seed=1, unique=True)
+
+
+@pytest.mark.parametrize("pool_size, num_cards", [(250, 3000), (1001, 2000), (1337, 777)])
+def test_large_pool_spreads_answers_evenly(pool_size, num_cards):
+    cards = generate_card_indices([f"a{i}" for i in range(pool_size)], num_cards, 5, seed=4)
+    counts = AnswerIndex(cards, pool_size).counts()
+
+    assert all(len(set(row)) == 25 for row in cards.tolist())  # ใบที่คร่อมรอยต่อ Permutation ถูกซ่อมแล้ว
+    assert counts.max() - counts.min() <= 1
+
+
+def test_answer_index_matches_brute_force():
+    cards = generate_card_indices(TEXTS[:20], 40, 5, seed=5)
+    index = AnswerIndex(cards, 20)
+
+    for answer in range(20):
+        assert index.cards_with(answer).tolist() == [i for i, row in enumerate(cards.tolist()) if answer in row]
+
+
+def test_call_order_puts_answers_on_cards_first():
+    texts = [f"a{i}" for i in range(200)]
+    cards = generate_card_indices(texts, 3, 5, seed=6)
+    index = AnswerIndex(cards, len(texts))
+    order = matching_call_order(index, 210, seed=6)
+
+    assert sorted(order) == list(range(210))
+    assert set(order[:index.num_used()]) == set(np.flatnonzero(index.counts()).tolist())
@@ -0,0 +1,72 @@
+import io
+import json
+import re
+import zipfile
+
+from pypdf import PdfReader
+
+from core import cli
+from core.export import CALLER_PDF_NAME, PLAYER_PDF_NAME
+
+QA = "\n".join(f"q{i}:a{i}" for i in range(30))
+
+
+def write_manifest(tmp_path, rows):
+    path = tmp_path / "manifest.jsonl"
+    path.write_text("\n".join(row if isinstance(row, str) else json.dumps(row, ensure_ascii=False) for row in rows), encoding="utf-8")
+    return str(path)
+
+
+def test_invalid_rows_are_reported_per_set(tmp_path):
+    manifest = write_manifest(tmp_path, [
+        {"title": "ok", "qa": QA, "num_cards": 3},
+        {"title": "zero cards", "qa": QA, "num_cards": 0},
+        {"title": "not a number", "qa": QA, "num_cards": "many"},
+        "{broken json",
+        {"title": "short deck", "qa": "q:a"},
+        {"qa": QA},
+        {"title": "missing file", "qa_file": "nope.txt"},
+        {"title": "also ok", "qa": QA, "grid_size": "4", "pool_size": "all"},
+    ])
+
+    jobs, invalid = cli.load_manifest(manifest)
+
+    assert [(job["number"], job["title"]) for job in jobs] == [(1, "ok"), (8, "also ok")]
+    assert jobs[1]["grid_size"] == 4 and jobs[1]["pool_size"] is None
+    assert [job["number"] for job, _ in invalid] == [2, 3, 4, 5, 6, 7]
+    assert "num_cards" in invalid[0][1] and "num_cards" in invalid[1][1]
+
+
+def test_main_renders_valid_sets_and_exits_with_failure(tmp_path, capsys):
+    manifest = write_manifest(tmp_path, [
+        {"title": "ok", "qa": QA, "num_cards": 2},
+        {"title": "bad", "qa": QA, "num_cards": -1},
+    ])
+    output_dir = tmp_path / "out"
+
+    assert cli.main([manifest, "--output-dir", str(output_dir), "--workers", "1"]) == 1
+    assert [path.name for path in output_dir.iterdir()] == ["ok_Bingo_Set.zip"]
+    assert "ชุดที่ 2 bad: num_cards" in capsys.readouterr().err
+
+
+def pdf_text(data: bytes) -> str:
+    return "\n".join(page.extract_text() for page in PdfReader(io.BytesIO(data)).pages)
+
+
+def test_optimized_caller_sheet_splits_main_and_spare_by_cards(tmp_path):
+    # คลังคำทั้ง Deck + การ์ดน้อยใบ: คำตอบที่ไม่อยู่บนการ์ดกระจายอยู่ทั่ว Deck (ไม่ได้อยู่ท้าย Deck)
+    qa = "\n".join(f"q{i}:a{i}" for i in range(35))
+    manifest = write_manifest(tmp_path, [{"title": "opt", "qa": qa, "num_cards": 3, "grid_size": 3, "pool_size": "all", "seed": 1}])
+    output_dir = tmp_path / "out"
+
+    assert cli.main([manifest, "--output-dir", str(output_dir), "--workers", "1", "--first-winner-window", "2-4"]) == 0
+    with zipfile.ZipFile(output_dir / "opt_Bingo_Set.zip") as zip_file:
+        on_cards = set(re.findall(r"\b(a\d+)\b", pdf_text(zip_file.read(PLAYER_PDF_NAME.format(num_cards=3)))))
+        caller_text = pdf_text(zip_file.read(CALLER_PDF_NAME))
+
+    answers = re.findall(r"คำตอบ: (a\d+)", caller_text)
+    assert len(answers) == 35 and 0 < len(on_cards) < 35
+    main_count = len(on_cards)
+    assert f"รายการที่ 1-{main_count} คือคำถามหลัก" in caller_text
+    assert set(answers[:main_count]) == on_cards
+    assert not on_cards & set(answers[main_count:])
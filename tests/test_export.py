@@ -0,0 +1,61 @@
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.artifact_cache import ArtifactCache
+from core.bingo_engine import BingoEngine
+from core.export import CALLER_PDF_NAME, PLAYER_PDF_NAME, cached_bingo_set_zip
+from core.models import Deck
+
+DECK = Deck([(f"q{i}", f"a{i}") for i in range(30)])
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return BingoEngine()
+
+
+def build(cache, engine, bg_color="#FFFFFF", progress=None):
+    cards = engine.generate_cards_data(DECK, 4, 5, seed=1)
+    return cached_bingo_set_zip(cache, engine, cards, DECK, "Test", 5, bg_color, "#000000", "#F0F8FF",
+                                call_order=list(range(len(DECK))), workers=1, progress=progress)
+
+
+def test_zip_is_the_only_cached_file_and_is_reused(tmp_path, engine):
+    cache = ArtifactCache(str(tmp_path))
+    messages = []
+    path = build(cache, engine, progress=messages.append)
+
+    with zipfile.ZipFile(path) as zip_file:
+        assert zip_file.namelist() == [PLAYER_PDF_NAME.format(num_cards=4), CALLER_PDF_NAME]
+        assert all(zip_file.read(name).startswith(b"%PDF") for name in zip_file.namelist())
+    assert [entry.name for entry in tmp_path.iterdir()] == [path.rsplit("/", 1)[-1]]
+    assert len(messages) == 2
+
+    messages.clear()
+    assert build(cache, engine, progress=messages.append) == path
+    assert messages == []
+
+
+def test_cancelled_build_leaves_nothing_in_cache(tmp_path, engine):
+    cache = ArtifactCache(str(tmp_path))
+
+    def cancel_on_caller_sheet(message):
+        if "Caller" in message:
+            raise RuntimeError("cancelled")
+
+    with pytest.raises(RuntimeError):
+        build(cache, engine, progress=cancel_on_caller_sheet)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_concurrent_builds_survive_eviction_from_a_tiny_cache(tmp_path, engine):
+    # ทุกการเขียน Evict ไฟล์อื่นทั้งหมด: ชุดที่กำลังเขียนต้องไม่พังเพราะงานอื่น Evict
+    cache = ArtifactCache(str(tmp_path), max_bytes=1)
+    colors = [f"#FF{i:02X}00" for i in range(8)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        paths = list(executor.map(lambda color: build(cache, engine, color), colors))
+
+    assert len(set(paths)) == len(colors)
+    assert len(list(tmp_path.iterdir())) <= 1
@@ -0,0 +1,62 @@
+import os
+
+from reportlab.pdfbase import pdfmetrics
+
+from core import metrics
+from core.bingo_engine import register_font_once
+from core.fonts import DEFAULT_FONT, FONT_CATALOG, _SubsetCache, deck_glyphs, install_subset_cache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class CountingSubsetter:
+    """makeSubset ปลอม: คืน bytes ใหม่ทุกครั้งที่ถูกเรียก และบันทึกชุดตัวอักษรที่ถูกสร้างจริง"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, subset):
+        self.calls.append(tuple(subset))
+        return bytes(subset) + b"-%d" % len(self.calls)
+
+
+def test_same_glyph_set_returns_cached_bytes():
+    make_subset = CountingSubsetter()
+    cache = _SubsetCache(make_subset)
+
+    with metrics.capture() as captured:
+        first = cache([1, 2, 3])
+        second = cache([1, 2, 3])
+
+    assert second is first
+    assert make_subset.calls == [(1, 2, 3)]
+    assert captured.snapshot()["counters"]["font.subset_cache_hits"] == 1
+    assert cache([1, 2, 4]) != first and len(make_subset.calls) == 2
+
+
+def test_lru_limit_evicts_least_recently_used_subset():
+    make_subset = CountingSubsetter()
+    cache = _SubsetCache(make_subset, max_entries=2)
+
+    cache([1])
+    cache([2])
+    cache([1])  # [1] ถูกใช้ล่าสุด: [2] กลายเป็นรายการเก่าสุด
+    cache([3])
+    assert make_subset.calls == [(1,), (2,), (3,)]
+
+    cache([1])
+    cache([3])
+    assert len(make_subset.calls) == 3
+    cache([2])  # ถูกลบไปแล้ว ต้องสร้างใหม่
+    assert make_subset.calls[-1] == (2,) and len(make_subset.calls) == 4
+
+
+def test_installed_cache_is_shared_by_the_registered_font():
+    font_name = register_font_once(os.path.join(ROOT, FONT_CATALOG[DEFAULT_FONT]))
+    face = pdfmetrics.getFont(font_name).face
+    install_subset_cache(pdfmetrics.getFont(font_name))
+    install_subset_cache(pdfmetrics.getFont(font_name))  # ติดตั้งซ้ำไม่ห่อแคชซ้อน
+
+    assert isinstance(face.makeSubset, _SubsetCache)
+    assert not isinstance(face.makeSubset._make_subset, _SubsetCache)
+    assert deck_glyphs(["ab", "กข", "ขค"]) == "กขค"
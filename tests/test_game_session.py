@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from core import game_session
+from core.card_generator import cards_to_text, generate_card_indices
+from core.game_session import GameSession, create_session, get_session
+from core.models import Deck
+from core.simulator import winning_line_masks
+
+
+def make_deck(num_pairs: int, duplicate_answers: bool = False) -> Deck:
+    return Deck([(f"q{i}", f"a{i % 8 if duplicate_answers else i}") for i in range(num_pairs)])
+
+
+def recount(cards, deck: Deck, grid_size: int, called):
+    """นับใหม่ทั้งหมดจากข้อที่เรียกแล้ว: ช่องที่ขีด, จำนวนช่องที่ขีดต่อเส้น, ได้บิงโก, เต็มใบ"""
+    called_texts = {deck.card_texts[i] for i in called}
+    center = grid_size * grid_size // 2 if grid_size % 2 else None
+    marks = np.array([[(i == center and text == "FREE") or (bool(text) and text in called_texts)
+                       for i, text in enumerate(card)] for card in cards])
+    lines = np.array([[mask >> cell & 1 for cell in range(grid_size * grid_size)] for mask in winning_line_masks(grid_size)])
+    line_counts = marks.astype(int) @ lines.T
+    has_line = (line_counts == grid_size).any(axis=1)
+    full = np.array([all(card) for card in cards]) & marks.all(axis=1)
+    return marks, line_counts, has_line, full
+
+
+@pytest.mark.parametrize("num_pairs, grid_size, duplicate_answers", [(30, 5, False), (18, 5, False), (24, 4, True)])
+def test_incremental_counters_match_brute_force_recount(num_pairs, grid_size, duplicate_answers):
+    deck = make_deck(num_pairs, duplicate_answers)
+    cards = cards_to_text(generate_card_indices(deck.card_texts, 40, grid_size, seed=5), deck.card_texts)
+    call_order = np.random.default_rng(8).permutation(num_pairs).tolist()
+    session = GameSession(cards, deck, grid_size, call_order)
+
+    had_line = np.zeros(len(cards), dtype=bool)
+    had_full = np.zeros(len(cards), dtype=bool)
+    for call_number, pair_index in enumerate(call_order, start=1):
+        result = session.call_next()
+        marks, line_counts, has_line, full = recount(cards, deck, grid_size, call_order[:call_number])
+
+        assert result.call_number == call_number and result.pair == deck[pair_index]
+        assert [session.card_marks(i) for i in range(len(cards))] == marks.tolist()
+        assert np.array_equal(session._line_counts[:, :-1], line_counts)
+        assert result.line_winners == np.flatnonzero(has_line & ~had_line).tolist()
+        assert result.full_card_winners == np.flatnonzero(full & ~had_full).tolist()
+        assert [session.has_bingo(i) for i in range(len(cards))] == has_line.tolist()
+        had_line, had_full = has_line, full
+
+    assert session.call_next() is None
+    assert [winner.call_number for winner in session.line_winners] == sorted({winner.call_number for winner in session.line_winners})
+
+
+def test_calling_a_repeated_answer_marks_nothing_new():
+    deck = make_deck(16, duplicate_answers=True)  # คู่ที่ 0 และ 8 มีคำตอบ "a0" เหมือนกัน
+    cards = cards_to_text(generate_card_indices(deck.card_texts, 10, 3, seed=1), deck.card_texts)
+    session = GameSession(cards, deck, 3)
+
+    session.call(0)
+    marks = [session.card_marks(i) for i in range(len(cards))]
+    result = session.call(8)
+
+    assert result.line_winners == result.full_card_winners == []
+    assert [session.card_marks(i) for i in range(len(cards))] == marks
+    assert session.next_pair_index == 1
+
+
+def test_session_store_keeps_most_recent_games(monkeypatch):
+    monkeypatch.setattr(game_session, "MAX_SESSIONS", 2)
+    monkeypatch.setattr(game_session, "_SESSIONS", {})
+    deck = make_deck(25)
+    cards = cards_to_text(generate_card_indices(deck.card_texts, 2, 5, seed=1), deck.card_texts)
+    sessions = [create_session(cards, deck, 5) for _ in range(3)]
+
+    assert get_session(sessions[0].session_id) is None
+    assert get_session(sessions[2].session_id) is sessions[2]
@@ -0,0 +1,73 @@
+import io
+
+import pytest
+from pypdf import PdfReader
+from reportlab.lib.pagesizes import A4
+
+from core.bingo_engine import BingoEngine
+from core.imposition import CARDS_PER_PAGE_OPTIONS, PAGE_SIZES, SHEET_MARGIN, plan_slots
+from core.models import Deck
+
+CARD_BOX = (A4[0], A4[1] * 0.8)
+
+
+@pytest.mark.parametrize("page_size", list(PAGE_SIZES))
+@pytest.mark.parametrize("cards_per_page", CARDS_PER_PAGE_OPTIONS)
+def test_slots_fit_on_sheet_without_overlap(cards_per_page, page_size):
+    slots = plan_slots(CARD_BOX, cards_per_page, page_size)
+    page_width, page_height = PAGE_SIZES[page_size]
+
+    assert len(slots) == cards_per_page
+    assert len({slot.scale for slot in slots}) == 1
+    for slot in slots:
+        assert slot.width / slot.height == pytest.approx(CARD_BOX[0] / CARD_BOX[1])
+        # เผื่อความคลาดเคลื่อนของทศนิยม (การ์ดที่ชิดขอบพอดี)
+        assert SHEET_MARGIN - 1e-6 <= slot.x and slot.x + slot.width <= page_width - SHEET_MARGIN + 1e-6
+        assert SHEET_MARGIN - 1e-6 <= slot.y and slot.y + slot.height <= page_height - SHEET_MARGIN + 1e-6
+    for i, a in enumerate(slots):
+        for b in slots[i + 1:]:
+            assert (a.x + a.width <= b.x + 1e-6 or b.x + b.width <= a.x + 1e-6 or
+                    a.y + a.height <= b.y + 1e-6 or b.y + b.height <= a.y + 1e-6)
+
+
+def test_invalid_layout_is_rejected():
+    with pytest.raises(ValueError):
+        plan_slots(CARD_BOX, 3)
+    with pytest.raises(ValueError):
+        plan_slots(CARD_BOX, 4, "B5")
+
+
+def card_label_positions(page):
+    """ตำแหน่งจริงบนแผ่นของข้อความ "Card N" (รวม Transform ที่ย่อการ์ดลงช่อง)"""
+    found = []
+
+    def visit(text, cm, tm, font_dict, font_size):
+        if text.startswith("Card"):
+            x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+            y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+            found.append((text.strip(), x, y))
+
+    page.extract_text(visitor_text=visit)
+    return found
+
+
+def test_partial_last_sheet_fills_slots_in_reading_order():
+    engine = BingoEngine()
+    deck = Deck([(f"q{i}", f"a{i}") for i in range(30)])
+    cards = engine.generate_cards_data(deck, 7, 5, seed=1)
+    buffer = io.BytesIO()
+    engine.write_pdf(buffer, cards, "Test", 5, "#FFFFFF", "#000000", "#F0F8FF", cards_per_page=4)
+
+    pages = PdfReader(io.BytesIO(buffer.getvalue())).pages
+    assert len(pages) == 2
+
+    # แผ่นสุดท้ายมี 3 ใบ: วางในช่องตามลำดับ ซ้ายบน -> ขวาล่าง
+    labels = [card_label_positions(page) for page in pages]
+    assert [name for name, _, _ in labels[0]] == ["Card 1", "Card 2", "Card 3", "Card 4"]
+    assert [name for name, _, _ in labels[1]] == ["Card 5", "Card 6", "Card 7"]
+    for first, last in zip(labels[0], labels[1]):
+        # ช่องเดียวกันบนแผ่นแรกและแผ่นสุดท้ายวางการ์ดที่ตำแหน่งเดียวกัน (ช่องที่ 4 ของแผ่นสุดท้ายว่าง)
+        assert first[1:] == pytest.approx(last[1:])
+    (x1, y1), (x2, y2), (x3, y3) = [position[1:] for position in labels[1]]
+    assert x1 < x2 and y1 == pytest.approx(y2)
+    assert x3 == pytest.approx(x1) and y3 < y1
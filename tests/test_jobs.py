@@ -0,0 +1,70 @@
+import logging
+import threading
+
+import pytest
+
+from core.jobs import CANCELLED, DONE, FAILED, QUEUED, RUNNING, JobQueue, JobRejected
+
+
+@pytest.fixture
+def queue():
+    queue = JobQueue(max_workers=1, max_active=2)
+    yield queue
+    queue.shutdown()
+
+
+def blocking_job(job, started, release, result="ok"):
+    """งานที่หยุดรอ release (ให้ Test ตรวจสถานะระหว่างรันได้)"""
+    started.set()
+    release.wait(5)
+    job.report("กำลังทำงาน", 0.5)
+    return result
+
+
+def test_job_moves_from_queued_to_running_to_done(queue):
+    first_started, second_started, release = threading.Event(), threading.Event(), threading.Event()
+    first = queue.submit("first", blocking_job, first_started, release)
+    assert first_started.wait(5)
+    # Worker มีตัวเดียว: งานที่สองรอคิวจนงานแรกเสร็จ
+    second = queue.submit("second", blocking_job, second_started, release, result=42)
+
+    assert first.state == RUNNING and second.state == QUEUED
+    assert queue.queue_position(second) == 0 and queue.active_count() == 2
+
+    release.set()
+    assert first.wait(5) and second.wait(5)
+    assert (first.state, first.result) == (DONE, "ok")
+    assert (second.state, second.result) == (DONE, 42)
+    assert first.error is None and first.last_event.message == "กำลังทำงาน"
+    assert queue.active_count() == 0
+
+
+def test_failed_job_stores_error_and_logs_traceback(queue, caplog):
+    def broken(job):
+        raise ValueError("bad deck")
+
+    with caplog.at_level(logging.ERROR, logger="core.jobs"):
+        job = queue.submit("broken", broken)
+        assert job.wait(5)
+
+    assert job.state == FAILED and job.result is None
+    assert isinstance(job.error, ValueError) and str(job.error) == "bad deck"
+    (record,) = [record for record in caplog.records if record.name == "core.jobs"]
+    assert record.levelno == logging.ERROR
+    assert record.getMessage() == f"Job broken ({job.job_id}) failed"
+    assert record.exc_info is not None and record.exc_info[0] is ValueError
+
+
+def test_queued_job_cancels_immediately_and_full_queue_rejects(queue):
+    started, release = threading.Event(), threading.Event()
+    running = queue.submit("running", blocking_job, started, release)
+    assert started.wait(5)
+    waiting = queue.submit("waiting", blocking_job, threading.Event(), release)
+
+    with pytest.raises(JobRejected):
+        queue.submit("third", blocking_job, threading.Event(), release)
+
+    waiting.cancel()
+    assert waiting.wait(0) and waiting.state == CANCELLED
+    release.set()
+    assert running.wait(5) and running.state == DONE
@@ -0,0 +1,90 @@
+import json
+import logging
+import time
+
+import pytest
+
+from core import metrics
+from core.bingo_engine import BingoEngine
+
+
+def test_span_records_count_total_max_and_last():
+    recorder = metrics.Metrics()
+    for seconds in (0.2, 0.5, 0.1):
+        recorder.record_span("stage", seconds)
+
+    stats = recorder.snapshot()["spans"]["stage"]
+    assert stats["count"] == 3
+    assert stats["total_seconds"] == pytest.approx(0.8)
+    assert stats["max_seconds"] == 0.5 and stats["last_seconds"] == 0.1
+
+
+def test_span_context_times_block_even_when_it_raises():
+    with metrics.capture() as captured:
+        with metrics.span("sleepy"):
+            time.sleep(0.01)
+        with pytest.raises(ValueError):
+            with metrics.span("broken"):
+                raise ValueError("boom")
+
+    spans = captured.snapshot()["spans"]
+    assert spans["sleepy"]["count"] == 1 and spans["sleepy"]["total_seconds"] >= 0.01
+    assert spans["broken"]["count"] == 1
+
+
+def test_counters_go_to_process_totals_and_nested_captures():
+    before = metrics.METRICS.snapshot()["counters"].get("test.events", 0)
+    with metrics.capture() as outer:
+        metrics.incr("test.events")
+        with metrics.capture() as inner:
+            metrics.incr("test.events", 2)
+    metrics.incr("test.events")
+
+    assert outer.snapshot()["counters"] == {"test.events": 3}
+    assert inner.snapshot()["counters"] == {"test.events": 2}
+    assert metrics.METRICS.snapshot()["counters"]["test.events"] == before + 4
+
+
+def test_reset_clears_spans_and_counters():
+    recorder = metrics.Metrics()
+    recorder.record_span("stage", 1.0)
+    recorder.incr("events")
+    recorder.reset()
+
+    assert recorder.snapshot() == {"spans": {}, "counters": {}}
+
+
+def test_json_export_round_trips_snapshot():
+    recorder = metrics.Metrics()
+    recorder.record_span("pdf.page", 0.25)
+    recorder.incr("zip.bytes", 1024)
+
+    assert json.loads(recorder.to_json()) == recorder.snapshot()
+    assert json.loads(recorder.to_json())["counters"] == {"zip.bytes": 1024}
+
+
+def test_prometheus_export_format():
+    recorder = metrics.Metrics()
+    recorder.record_span("pdf.page", 0.25)
+    recorder.record_span("pdf.page", 0.5)
+    recorder.incr('odd "name"', 3)
+
+    lines = recorder.to_prometheus(prefix="test").splitlines()
+
+    assert lines[:2] == ["# HELP test_span_seconds Time spent in each pipeline stage.", "# TYPE test_span_seconds summary"]
+    assert 'test_span_seconds_count{span="pdf.page"} 2' in lines
+    assert 'test_span_seconds_sum{span="pdf.page"} 0.750000000' in lines
+    assert "# TYPE test_span_max_seconds gauge" in lines
+    assert 'test_span_max_seconds{span="pdf.page"} 0.500000000' in lines
+    assert "# TYPE test_events_total counter" in lines
+    # เครื่องหมายคำพูดใน Label ต้อง Escape
+    assert 'test_events_total{name="odd \\"name\\""} 3' in lines
+    assert recorder.to_prometheus().endswith("\n")
+
+
+def test_unreadable_logo_is_logged_not_printed(caplog, capsys):
+    with caplog.at_level(logging.WARNING, logger="core.bingo_engine"):
+        assert BingoEngine()._load_logo(b"not an image") is None
+
+    assert capsys.readouterr().out == ""
+    assert any("Error drawing logo" in record.getMessage() for record in caplog.records if record.name == "core.bingo_engine")
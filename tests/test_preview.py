@@ -0,0 +1,58 @@
+import io
+import logging
+
+import pytest
+from PIL import Image
+from reportlab.lib.pagesizes import A4
+
+from core.bingo_engine import CARD_GRID_TOP, CARD_MARGIN, BingoEngine
+from core.models import Deck
+from core.preview import PREVIEW_SCALE, card_preview_png, cards_preview_png, clear_preview_cache
+
+DECK = Deck([(f"q{i}", f"a{i}") for i in range(30)])
+COLORS = ("#FFFFFF", "#000000", "#F0F8FF")
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return BingoEngine()
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_preview_cache()
+    yield
+    clear_preview_cache()
+
+
+def png_logo(color="red"):
+    buffer = io.BytesIO()
+    Image.new("RGB", (20, 20), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("grid_size", [3, 4, 5])
+def test_preview_size_matches_card_area(engine, grid_size):
+    card = engine.generate_cards_data(DECK, 1, grid_size, seed=1)[0]
+
+    image = Image.open(io.BytesIO(card_preview_png(engine, card, "Test", grid_size, *COLORS, logo_bytes=png_logo())))
+
+    # กว้างเท่า A4 และสูงถึงขอบล่างของตาราง (+ ขอบ) ที่ PREVIEW_SCALE พิกเซลต่อ 1pt
+    cell_size = (A4[0] - CARD_MARGIN * 2) / grid_size
+    assert image.format == "PNG"
+    assert image.size == (round(A4[0] * PREVIEW_SCALE), round((CARD_GRID_TOP + cell_size * grid_size + CARD_MARGIN) * PREVIEW_SCALE))
+
+
+def test_corrupt_logo_still_renders_and_logs_warning(engine, caplog):
+    cards = engine.generate_cards_data(DECK, 2, 5, seed=1)
+
+    with caplog.at_level(logging.WARNING, logger="core.preview"):
+        previews = cards_preview_png(engine, cards, "Test", 5, *COLORS, logo_bytes=b"not an image")
+
+    assert len(previews) == 2
+    assert all(Image.open(io.BytesIO(png)).size == Image.open(io.BytesIO(previews[0])).size for png in previews)
+    warnings = [record for record in caplog.records if record.name == "core.preview"]
+    assert warnings and all(record.levelno == logging.WARNING for record in warnings)
+    assert "Cannot draw logo in preview" in warnings[0].getMessage()
+    # ภาพเหมือนกับกรณีไม่มีโลโก้ (ข้ามโลโก้ไปเฉย ๆ)
+    assert previews[0] == card_preview_png(engine, cards[0], "Test", 5, *COLORS)
@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+import pytest
+
+from core import qa_cache
+from core.ai_assistant import AIAssistant
+from core.qa_cache import QACache, normalize_topic
+
+PAIRS = [f"คำถาม {i}:คำตอบ {i}" for i in range(30)]
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeClient:
+    """Client ปลอมที่มี chat.completions.create เหมือน Groq (นับจำนวนครั้งที่ถูกเรียก)"""
+
+    def __init__(self, pairs):
+        self.pairs = pairs
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        content = ", ".join(self.pairs)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(qa_cache.time, "time", clock)
+    return clock
+
+
+def test_normalize_topic_ignores_case_and_spacing():
+    assert normalize_topic("  Thai   HISTORY ") == "thai history"
+    # ตัวอักษรแบบแยกเครื่องหมาย (NFD) ได้ Key เดียวกับรูป NFC
+    assert normalize_topic("Cafe\u0301") == normalize_topic("Caf\u00e9")
+
+
+def test_get_returns_stored_pairs_until_ttl_expires(clock):
+    cache = QACache(":memory:", ttl_seconds=60)
+    cache.put("Science", 35, PAIRS)
+
+    clock.now += 59
+    assert cache.get("science", 35) == PAIRS
+    assert cache.get("science", 25) is None  # แยกตามจำนวนคู่
+
+    clock.now += 2
+    assert cache.get("Science", 35) is None
+    assert len(cache) == 0  # รายการหมดอายุถูกลบตอนอ่าน
+
+
+def test_put_evicts_least_recently_used(clock):
+    cache = QACache(":memory:", ttl_seconds=3600, max_entries=2)
+    cache.put("a", 35, PAIRS)
+    clock.now += 1
+    cache.put("b", 35, PAIRS)
+    clock.now += 1
+    assert cache.get("a", 35) == PAIRS  # "a" ถูกใช้ล่าสุด "b" จึงเก่าสุด
+    clock.now += 1
+    cache.put("c", 35, PAIRS)
+
+    assert len(cache) == 2
+    assert cache.get("b", 35) is None
+    assert cache.get("a", 35) == PAIRS
+    assert cache.get("c", 35) == PAIRS
+
+
+def test_assistant_hits_cache_for_normalized_topic():
+    client = FakeClient(PAIRS)
+    assistant = AIAssistant(client=client, cache=QACache(":memory:"))
+
+    first = assistant.generate_bingo_qa_pairs("Thai History", 35)
+    second = assistant.generate_bingo_qa_pairs("  thai   history ", 35)
+
+    assert first == second == PAIRS
+    assert client.calls == 1
+
+
+def test_force_refresh_bypasses_and_overwrites_cache():
+    client = FakeClient(PAIRS)
+    cache = QACache(":memory:")
+    assistant = AIAssistant(client=client, cache=cache)
+    assistant.generate_bingo_qa_pairs("Space", 35)
+
+    client.pairs = [pair.replace("คำตอบ", "ใหม่") for pair in PAIRS]
+    refreshed = assistant.generate_bingo_qa_pairs("Space", 35, force_refresh=True)
+
+    assert client.calls == 2
+    assert refreshed == client.pairs
+    assert cache.get("space", 35) == client.pairs
+
+
+def test_too_few_pairs_are_not_cached():
+    client = FakeClient(PAIRS[:10])
+    cache = QACache(":memory:")
+    assistant = AIAssistant(client=client, cache=cache)
+
+    assert len(assistant.generate_bingo_qa_pairs("Tiny", 35)) == 10
+    assert cache.get("tiny", 35) is None
@@ -0,0 +1,39 @@
+from core.models import Deck, QAPair
+from core.qa_parser import parse_ai_response, parse_deck, parse_qa_lines, parse_record
+
+
+def test_ai_response_splits_on_commas_and_newlines():
+    text = "เมืองหลวงของไทย?:กรุงเทพ, 2x2?:4\nสีของท้องฟ้า?:ฟ้า"
+    assert parse_ai_response(text) == [
+        QAPair("เมืองหลวงของไทย?", "กรุงเทพ"),
+        QAPair("2x2?", "4"),
+        QAPair("สีของท้องฟ้า?", "ฟ้า"),
+    ]
+
+
+def test_ai_response_cleans_numbering_markdown_and_whitespace():
+    text = "1. **Largest   planet?**:Jupiter 🪐,\n2.\tRed planet?: Mars"
+    assert parse_ai_response(text) == [QAPair("Largest planet?", "Jupiter"), QAPair("Red planet?", "Mars")]
+
+
+def test_ai_response_drops_incomplete_records_and_respects_limit():
+    text = "Here are your pairs, Q1:A1, no separator, :missing question, Q2:, Q3:A3, Q4:A4"
+    assert parse_ai_response(text) == [QAPair("Q1", "A1"), QAPair("Q3", "A3"), QAPair("Q4", "A4")]
+    assert parse_ai_response(text, limit=2) == [QAPair("Q1", "A1"), QAPair("Q3", "A3")]
+
+
+def test_record_splits_on_first_colon_only():
+    assert parse_record("เวลา?:10:30") == QAPair("เวลา?", "10:30")
+    assert parse_record("no separator") is None
+
+
+def test_text_area_lines_keep_commas_and_allow_empty_sides():
+    text = "a:b, c\n\n  x : \n:y\nnone\n:\n"
+    assert parse_qa_lines(text) == [QAPair("a", "b, c"), QAPair("x", ""), QAPair("", "y")]
+
+
+def test_parse_deck_round_trips_through_text():
+    deck = parse_deck("Q1:A1\nQ2:A2, with comma")
+    assert isinstance(deck, Deck)
+    assert deck.card_texts == ("A1", "A2, with comma")
+    assert parse_deck(deck.to_text()).pairs == deck.pairs
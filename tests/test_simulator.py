@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from core.card_generator import cards_to_text, generate_card_indices
+from core.models import Deck
+from core.simulator import NEVER_CALLED, CardSet, simulate_games
+
+
+def make_game(num_pairs: int, num_cards: int, grid_size: int, seed: int, duplicate_answers: bool = False):
+    answers = [f"a{i % 10 if duplicate_answers else i}" for i in range(num_pairs)]
+    deck = Deck([(f"q{i}", answer) for i, answer in enumerate(answers)])
+    cards = cards_to_text(generate_card_indices(deck.card_texts, num_cards, grid_size, seed=seed), deck.card_texts)
+    return deck, cards, CardSet(cards, deck, grid_size)
+
+
+def brute_force_wins(cards, deck: Deck, size: int, call_order):
+    """ขีดทีละข้อแล้วตรวจทุกเส้นตรง ๆ: คืน (ลำดับที่ชนะเส้นแรก, ลำดับที่ชนะเต็มใบ) ต่อการ์ด"""
+    lines = [[r * size + c for c in range(size)] for r in range(size)]
+    lines += [[r * size + c for r in range(size)] for c in range(size)]
+    lines += [[i * size + i for i in range(size)], [i * size + size - 1 - i for i in range(size)]]
+    first_line, full = [], []
+    for card in cards:
+        marked = {i for i, text in enumerate(card) if text == "FREE" and i == size * size // 2 and size % 2}
+        line_at = full_at = NEVER_CALLED
+        for call_number, pair_index in enumerate(call_order, start=1):
+            marked |= {i for i, text in enumerate(card) if text and text == deck.card_texts[pair_index]}
+            if line_at == NEVER_CALLED and any(all(i in marked for i in line) for line in lines):
+                line_at = call_number
+            if full_at == NEVER_CALLED and len(marked) == size * size:
+                full_at = call_number
+        first_line.append(line_at)
+        full.append(full_at)
+    return first_line, full
+
+
+@pytest.mark.parametrize("num_pairs, grid_size, duplicate_answers", [(30, 5, False), (20, 5, False), (40, 4, True)])
+def test_win_calls_and_play_match_brute_force(num_pairs, grid_size, duplicate_answers):
+    deck, cards, card_set = make_game(num_pairs, 30, grid_size, seed=11, duplicate_answers=duplicate_answers)
+    call_order = np.random.default_rng(3).permutation(num_pairs).tolist()
+
+    first_line, full = card_set.win_calls(call_order)
+    expected_line, expected_full = brute_force_wins(cards, deck, grid_size, call_order)
+    assert first_line.tolist() == expected_line
+    assert full.tolist() == expected_full
+
+    played = {card: call for call, winners in card_set.play(call_order) for card in winners}
+    assert played == {card: call for card, call in enumerate(expected_line) if call != NEVER_CALLED}
+
+
+def test_simulation_is_reproducible_and_consistent():
+    _, _, card_set = make_game(30, 50, 5, seed=1)
+    result = simulate_games(card_set, 500, seed=9)
+
+    assert all(np.array_equal(a, b) for a, b in zip(result, simulate_games(card_set, 500, seed=9)))
+    assert len(result.first_line_calls) == 500
+    assert (result.first_line_calls >= 4).all()  # ต้องเรียกอย่างน้อย 4 ข้อ (เส้นผ่าน FREE)
+    assert (result.first_line_calls <= result.first_full_calls).all()
+    assert (result.first_line_winners >= 1).all()
+    summary = result.summary()
+    assert summary["games"] == summary["finished"] == 500
+    assert 4 <= summary["p10_first_line"] <= summary["median_first_line"] <= summary["p90_first_line"] <= 30
+
+
+def test_batched_orders_match_brute_force():
+    deck, cards, card_set = make_game(30, 10, 5, seed=2)
+    orders = np.stack([np.random.default_rng(seed).permutation(30) for seed in range(10)])
+
+    evaluated = card_set.evaluate_orders(orders)
+    for order, row in zip(orders, evaluated):
+        assert row.tolist() == brute_force_wins(cards, deck, 5, order.tolist())[0]
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+from reportlab.pdfbase import pdfmetrics
+
+from core.bingo_engine import register_font_once
+from core.fonts import DEFAULT_FONT, FONT_CATALOG
+from core.text_layout import THAI_LEADING_VOWELS, THAI_NO_BREAK_BEFORE, fit_text, wrap_lines
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+THAI_TEXTS = [
+    "ประเทศไทยมีเมืองหลวงชื่อกรุงเทพมหานคร",
+    "สัตว์เลี้ยงลูกด้วยนมที่ใหญ่ที่สุดในโลกคือวาฬสีน้ำเงิน",
+    "ปรากฏการณ์เรือนกระจกทำให้อุณหภูมิโลกสูงขึ้น",
+    "พระอาทิตย์ขึ้นทางทิศตะวันออก",
+]
+
+
+@pytest.fixture(scope="module")
+def thai_font():
+    return register_font_once(os.path.join(ROOT, FONT_CATALOG[DEFAULT_FONT]))
+
+
+def width(text, font_name, size):
+    return pdfmetrics.stringWidth(text, font_name, size)
+
+
+def test_english_wraps_at_spaces_within_width():
+    text = "The quick brown fox jumps over the lazy dog"
+    lines = wrap_lines(text, "Helvetica", 12, 80)
+
+    assert len(lines) > 1
+    assert " ".join(lines) == text
+    assert all(width(line, "Helvetica", 12) <= 80 for line in lines)
+
+
+def test_whitespace_is_collapsed_before_wrapping():
+    assert wrap_lines("  a \t b\n c ", "Helvetica", 12, 500) == ("a b c",)
+
+
+def test_long_word_is_split_when_no_break_exists():
+    lines = wrap_lines("Supercalifragilisticexpialidocious", "Helvetica", 12, 60)
+
+    assert "".join(lines) == "Supercalifragilisticexpialidocious"
+    assert all(width(line, "Helvetica", 12) <= 60 for line in lines)
+
+
+@pytest.mark.parametrize("text", THAI_TEXTS)
+def test_thai_lines_fit_and_never_split_marks_from_consonants(thai_font, text):
+    lines = wrap_lines(text, thai_font, 14, 70)
+
+    assert "".join(lines) == text
+    assert all(width(line, thai_font, 14) <= 70 for line in lines)
+    for previous, line in zip(lines, lines[1:]):
+        assert line[0] not in THAI_NO_BREAK_BEFORE
+        assert previous[-1] not in THAI_LEADING_VOWELS
+
+
+@pytest.mark.parametrize("text", THAI_TEXTS + ["Photosynthesis converts light energy into chemical energy"])
+def test_fit_text_picks_largest_size_within_line_limit(thai_font, text):
+    lines, size = fit_text(text, thai_font, 60, 12, 6, max_lines=3)
+
+    assert lines == wrap_lines(text, thai_font, size, 60)
+    fitting = [s for s in range(6, 13) if len(wrap_lines(text, thai_font, s, 60)) <= 3]
+    assert size == (max(fitting) if fitting else 6)
+
+
+def test_fit_text_keeps_max_size_for_short_text(thai_font):
+    assert fit_text("แมว", thai_font, 60, 12, 8) == (("แมว",), 12)
+
+
+def test_box_narrower_than_one_glyph_puts_one_character_per_line():
+    assert wrap_lines("ab", "Helvetica", 12, 1) == ("a", "b")
+
+
+def test_single_character_wider_than_box_is_kept():
+    assert wrap_lines("W", "Helvetica", 14, 5) == ("W",)